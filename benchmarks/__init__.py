@@ -0,0 +1,15 @@
+"""
+Benchmarks for the Vertify Mapping Spreadsheet Generator.
+
+- `benchmarks.synthetic` - seeded generator of synthetic Vertify exports
+- `benchmarks.run` - timed and memory-tracked benchmarks with baseline comparison
+- `benchmarks.compression` - save time versus file size per ZIP compression level
+"""
+
+import sys
+from pathlib import Path
+
+# Make the application modules importable (same layout as src/app.py)
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
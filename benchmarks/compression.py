@@ -0,0 +1,86 @@
+"""
+Save time versus file size for each ZIP compression level.
+
+Generates the workbook of a synthetic export at every compression level and
+reports the best generation time and the resulting file size, so the level
+used by the CLI and the UI can be chosen per deployment. The native engine
+compresses each tab as it is written, so the whole generation is timed
+rather than only the final save.
+
+Usage:
+    python -m benchmarks.compression
+    python -m benchmarks.compression --scales large --engines native write-only
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.run import ENGINES, SCALES
+from benchmarks.synthetic import generate_export
+
+from generator import MappingSpreadsheetGenerator
+from xlsx_writer import COMPRESSION_LEVELS
+
+
+def measure_level(export, engine, compression_level, repeat):
+    """
+    Generates the workbook at one compression level.
+
+    Returns:
+        dict: seconds (best of `repeat` runs) and size in bytes
+    """
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        generator = MappingSpreadsheetGenerator(
+            export, engine=engine, compression_level=compression_level
+        )
+        started = time.perf_counter()
+        with generator.process(spool=True)["excel_file"] as excel_file:
+            best = min(best, time.perf_counter() - started)
+            size = excel_file.size
+    return {"seconds": best, "size": size}
+
+
+def parse_args(argv=None):
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark ZIP compression levels.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["medium", "large"])
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=["native"])
+    parser.add_argument(
+        "--levels", nargs="+", type=int, choices=COMPRESSION_LEVELS, default=[0, 1, 3, 6, 9],
+        metavar="{0-9}", help="Compression levels to compare (default: 0 1 3 6 9)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per level")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic export seed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the compression benchmark."""
+    args = parse_args(argv)
+
+    print(f"{'export':<32} {'level':>5} {'seconds':>10} {'vs 6':>8} {'size KB':>10} {'vs 6':>8}")
+    for scale in args.scales:
+        export = generate_export(seed=args.seed, **SCALES[scale])
+        for engine in args.engines:
+            results = {
+                level: measure_level(export, engine, level, args.repeat)
+                for level in args.levels
+            }
+            reference = results.get(6)
+            for level, result in results.items():
+                seconds_change = size_change = "      -"
+                if reference:
+                    seconds_change = f"{(result['seconds'] / reference['seconds'] - 1) * 100:+6.1f}%"
+                    size_change = f"{(result['size'] / reference['size'] - 1) * 100:+6.1f}%"
+                print(
+                    f"{f'{engine}@{scale}':<32} {level:>5} {result['seconds']:>10.4f} "
+                    f"{seconds_change} {result['size'] / 1024:>10.1f} {size_change}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
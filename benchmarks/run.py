@@ -0,0 +1,276 @@
+"""
+Timed and memory-tracked benchmarks of the spreadsheet generator.
+
+Runs each benchmark on synthetic exports at several scales, reports the best
+wall time and the tracemalloc peak, and compares them against a stored
+baseline. Timings are machine specific: save the baseline on the machine
+used for comparisons.
+
+Usage:
+    python -m benchmarks.run                              # compare with baseline
+    python -m benchmarks.run --save-baseline              # store a new baseline
+    python -m benchmarks.run --scales small --filter section
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.synthetic import generate_export
+
+from generator import MappingSpreadsheetGenerator
+from models import ObjectMap, parse_object_maps
+from styles import ExcelStyles
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+
+# Absolute differences below these floors are treated as noise
+NOISE_FLOOR = {"seconds": 0.005, "peak_mb": 0.5}
+
+SCALES = {
+    "small": {"objectmaps": 10, "properties": 20, "filters": 2, "merge_fields": 1},
+    "medium": {"objectmaps": 100, "properties": 50, "filters": 3, "merge_fields": 2},
+    "large": {"objectmaps": 500, "properties": 100, "filters": 5, "merge_fields": 3},
+    # Per-tab fixed overhead dominates
+    "many-small": {"objectmaps": 1000, "properties": 3, "filters": 1, "merge_fields": 1},
+}
+
+SECTIONS = (
+    "_add_api_request_section",
+    "_add_merge_section",
+    "_add_filter_section",
+    "_add_field_mapping_section",
+)
+
+ENGINES = ("openpyxl", "write-only", "native")
+
+
+def bench_generate_to_bytes(engine):
+    """Full generation with the given engine."""
+    def run(export):
+        MappingSpreadsheetGenerator(export, engine=engine).generate_to_bytes()
+    return run
+
+
+def bench_get_statistics(export):
+    """Statistics pass over the export."""
+    MappingSpreadsheetGenerator(export).get_statistics()
+
+
+def bench_parse_object_maps(export):
+    """Conversion of every ObjectMap into compact records, all kept alive."""
+    return list(parse_object_maps(export["ObjectsMap"]))
+
+
+def bench_section(method_name, engine):
+    """One section builder applied to every ObjectMap, each in a new tab."""
+    # Records are parsed once per export so only the section itself is timed
+    parsed = {}
+
+    def run(export):
+        if parsed.get("export") is not export:
+            parsed["export"] = export
+            parsed["records"] = list(parse_object_maps(export["ObjectsMap"]))
+        generator = MappingSpreadsheetGenerator({}, engine=engine)
+        method = getattr(generator, method_name)
+        for idx, obj_map in enumerate(parsed["records"], 1):
+            method(generator.engine.create_sheet(f"Bench {idx}"), obj_map, 1)
+    return run
+
+
+def apply_style_per_cell(cell, text, fill_color=None, font=None, alignment=None):
+    """Header styling without named styles: fill, font and alignment assigned one by one."""
+    cell.value = text
+    if fill_color:
+        cell.fill = fill_color
+    if font:
+        cell.font = font
+    if alignment:
+        cell.alignment = alignment
+
+
+def styled_header_cells():
+    """
+    Styled cells of a detail tab without properties or filters.
+
+    Returns:
+        list: (row, column, value, fill, font, alignment) of every styled cell
+    """
+    generator = MappingSpreadsheetGenerator({}, engine="native")
+    buffer = generator.build_object_map_sheet(1, ObjectMap(name="Header layout"))
+    return [
+        (row_idx, col_idx, cell.value, cell.fill, cell.font, cell.alignment)
+        for row_idx, row in enumerate(buffer.iter_rows(), 1)
+        for col_idx, cell in enumerate(row, 1)
+        if cell is not None and cell.has_style
+    ]
+
+
+def bench_header_styles(named):
+    """
+    The header cells of every detail tab styled in an openpyxl workbook, with
+    named styles or with fill, font and alignment assigned one by one.
+    """
+    cells = styled_header_cells()
+    apply = ExcelStyles.apply_header_style if named else apply_style_per_cell
+
+    def run(export):
+        generator = MappingSpreadsheetGenerator({}, engine="openpyxl")
+        for idx in range(1, len(export["ObjectsMap"]) + 1):
+            ws = generator.engine.create_sheet(f"Bench {idx}")
+            for row, column, value, fill, font, alignment in cells:
+                apply(ws.cell(row=row, column=column), value, fill, font, alignment)
+    return run
+
+
+def build_benchmarks():
+    """
+    Builds the benchmark registry.
+
+    Returns:
+        dict: Benchmark name -> callable receiving the export
+    """
+    benchmarks = {}
+    for engine in ENGINES:
+        benchmarks[f"generate_to_bytes[{engine}]"] = bench_generate_to_bytes(engine)
+    benchmarks["get_statistics"] = bench_get_statistics
+    benchmarks["parse_object_maps"] = bench_parse_object_maps
+    benchmarks["header_styles[per-cell]"] = bench_header_styles(named=False)
+    benchmarks["header_styles[named]"] = bench_header_styles(named=True)
+    # openpyxl worksheets vs. the SheetBuffer used by the write-only/native engines
+    for section in SECTIONS:
+        for engine in ("openpyxl", "native"):
+            benchmarks[f"{section.strip('_')}[{engine}]"] = bench_section(section, engine)
+    return benchmarks
+
+
+def measure(function, export, repeat):
+    """
+    Measures a benchmark.
+
+    The wall time is the best of `repeat` runs; the memory peak comes from
+    one additional run under tracemalloc, which would distort timings.
+
+    Returns:
+        dict: seconds and peak_mb
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(export)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        function(export)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_mb": peak / (1024 * 1024)}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results against the baseline.
+
+    Returns:
+        list: (key, metric, baseline value, current value) of regressions
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, floor in NOISE_FLOOR.items():
+            if (current[metric] > previous[metric] * (1 + tolerance)
+                    and current[metric] - previous[metric] > floor):
+                regressions.append((key, metric, previous[metric], current[metric]))
+    return regressions
+
+
+def format_change(current, previous):
+    """Formats the relative change against the baseline."""
+    if previous is None or not previous:
+        return "      -"
+    return f"{(current / previous - 1) * 100:+6.1f}%"
+
+
+def parse_args(argv=None):
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run generator benchmarks.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic export seed")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="Store the results as the new baseline (merged with existing entries)"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown/memory growth before flagging a regression (0.25 = 25%%)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks.
+
+    Returns:
+        int: Exit code (1 if a regression was flagged)
+    """
+    args = parse_args(argv)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = {name: fn for name, fn in benchmarks.items() if args.filter in name}
+
+    results = {}
+    print(f"{'benchmark':<52} {'seconds':>10} {'vs base':>8} {'peak MB':>9} {'vs base':>8}")
+    for scale in args.scales:
+        export = generate_export(seed=args.seed, **SCALES[scale])
+        for name, function in benchmarks.items():
+            key = f"{name}@{scale}"
+            result = results[key] = measure(function, export, args.repeat)
+            previous = baseline.get(key, {})
+            print(
+                f"{key:<52} {result['seconds']:>10.4f} "
+                f"{format_change(result['seconds'], previous.get('seconds'))} "
+                f"{result['peak_mb']:>9.2f} "
+                f"{format_change(result['peak_mb'], previous.get('peak_mb'))}"
+            )
+
+    if args.save_baseline:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for key, metric, previous, current in regressions:
+            print(f"  {key} {metric}: {previous:.4f} -> {current:.4f}")
+        return 1
+
+    print(f"\nNo regressions (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Seeded generator of synthetic Vertify mapping exports.
+
+The same seed and parameters always produce the same export, so benchmark
+runs are comparable across changes.
+
+Usage:
+    python -m benchmarks.synthetic --objectmaps 500 --properties 100 -o export.json
+"""
+
+import argparse
+import json
+import random
+
+RULE_TYPES = ("Value", "Convert", "Condition", "Date", "Map")
+MOVE_ACTIONS = ("", "OnAdd", "OnUpdate", "OnAddUpdate", None)
+FILTER_OPERATORS = ("Equals", "NotEquals", "Contains", "GreaterThan", "IsNull")
+SYSTEMS = ("Salesforce", "NetSuite", "HubSpot", "Dynamics", "SAP", "Marketo", "Zendesk")
+OBJECTS = ("Account", "Contact", "Lead", "Opportunity", "Invoice", "Order", "Product", "Case")
+FIELDS = (
+    "Id", "Name", "Email", "Phone", "Street", "City", "State", "PostalCode", "Country",
+    "OwnerId", "Status", "Amount", "CloseDate", "Description", "Industry", "Website",
+)
+
+
+def _field(rng, obj):
+    return f"{obj}.{rng.choice(FIELDS)}{rng.randint(1, 50)}"
+
+
+def generate_transformation(rng, source_obj, rule_types):
+    """Generates one PropertiesMapTransformation entry."""
+    return {
+        "SourcePropertyName": _field(rng, source_obj),
+        "RuleType": rng.choice(rule_types),
+        "Value": f"value-{rng.randint(1, 1000)}",
+        "ProjectConvertListName": f"ConvertList{rng.randint(1, 20)}",
+        "DateFormat": rng.choice(("yyyy-MM-dd", "MM/dd/yyyy", "dd.MM.yyyy")),
+        "SortOrder": 0,
+    }
+
+
+def generate_object_map(rng, idx, properties, filters, merge_fields, rule_types, extra_fields):
+    """
+    Generates one ObjectMap.
+
+    Args:
+        rng: random.Random instance
+        idx: ObjectMap index
+        properties: Number of PropertiesMap entries
+        filters: Number of ObjectsMapFilter entries
+        merge_fields: Number of ObjectsMapMergeField entries
+        rule_types: Transformation rule types to choose from
+        extra_fields: Number of unused fields added to each entry
+
+    Returns:
+        dict: ObjectMap
+    """
+    source_system, target_system = rng.sample(SYSTEMS, 2)
+    source_obj = rng.choice(OBJECTS)
+    target_obj = rng.choice(OBJECTS)
+
+    properties_map = []
+    for _ in range(properties):
+        prop = {
+            "MoveAction": rng.choice(MOVE_ACTIONS),
+            "Type": "Map",
+            "TargetPropertyName": _field(rng, target_obj),
+            "PropertiesMapTransformation": (
+                [generate_transformation(rng, source_obj, rule_types)]
+                if rng.random() < 0.9 else []
+            ),
+        }
+        for extra in range(extra_fields):
+            prop[f"Unused{extra}"] = rng.randint(0, 10 ** 6)
+        properties_map.append(prop)
+
+    obj_map = {
+        "Name": f"{idx} {source_system} {source_obj} >> {target_system} {target_obj}",
+        "SourceSystemName": source_system,
+        "TargetSystemName": target_system,
+        "MergeRecord": merge_fields > 0,
+        "ObjectsMapMergeField": [
+            {
+                "MergeField": rng.choice(FIELDS),
+                "SourcePropertyName": _field(rng, source_obj),
+                "TargetPropertyName": _field(rng, target_obj),
+            }
+            for _ in range(merge_fields)
+        ],
+        "ObjectsMapFilter": [
+            {
+                "SourcePropertyName": _field(rng, source_obj),
+                "FilterOperator": rng.choice(FILTER_OPERATORS),
+                "Value": f"filter-{rng.randint(1, 100)}",
+            }
+            for _ in range(filters)
+        ],
+        "PropertiesMap": properties_map,
+    }
+    for extra in range(extra_fields):
+        obj_map[f"Unused{extra}"] = f"unused-{rng.randint(0, 10 ** 6)}"
+    return obj_map
+
+
+def generate_export(
+    objectmaps=50,
+    properties=30,
+    filters=2,
+    merge_fields=1,
+    rule_types=RULE_TYPES,
+    extra_fields=3,
+    seed=0,
+):
+    """
+    Generates a synthetic Vertify export.
+
+    Args:
+        objectmaps: Number of ObjectMaps
+        properties: PropertiesMap entries per ObjectMap
+        filters: ObjectsMapFilter entries per ObjectMap
+        merge_fields: ObjectsMapMergeField entries per ObjectMap
+        rule_types: Transformation rule types to choose from
+        extra_fields: Unused fields per entry (exports carry many of them)
+        seed: Random seed
+
+    Returns:
+        dict: Export in the same shape as the Vertify JSON
+    """
+    rng = random.Random(seed)
+    return {
+        "ProjectName": f"Synthetic export (seed {seed})",
+        "ObjectsMap": [
+            generate_object_map(
+                rng, idx, properties, filters, merge_fields, rule_types, extra_fields
+            )
+            for idx in range(1, objectmaps + 1)
+        ],
+    }
+
+
+def main(argv=None):
+    """Writes a synthetic export to a JSON file."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Vertify export.")
+    parser.add_argument("--objectmaps", type=int, default=50)
+    parser.add_argument("--properties", type=int, default=30)
+    parser.add_argument("--filters", type=int, default=2)
+    parser.add_argument("--merge-fields", type=int, default=1)
+    parser.add_argument("--rule-types", nargs="+", default=list(RULE_TYPES))
+    parser.add_argument("--extra-fields", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args(argv)
+
+    export = generate_export(
+        objectmaps=args.objectmaps,
+        properties=args.properties,
+        filters=args.filters,
+        merge_fields=args.merge_fields,
+        rule_types=tuple(args.rule_types),
+        extra_fields=args.extra_fields,
+        seed=args.seed,
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(export, file)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,5 +4,5 @@ Vertify Mapping Spreadsheet Generator
 Módulo para conversão de JSONs de mapeamento Vertify em planilhas Excel formatadas.
 """
 
-__version__ = "2.0.0"
+__version__ = "2.1.0"
 __author__ = "Vinícius Olimpio"
@@ -6,14 +6,42 @@ Business logic is separated into specific modules.
 """
 
 import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 import streamlit as st
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from generator import MappingSpreadsheetGenerator
+from cache import ResultCache, hash_file
+from generator import GENERATOR_VERSION
+from jobs import GenerationJob
+from preview import PREVIEW_COLUMNS
+from scheduler import DEFAULT_MAX_JOBS, DEFAULT_MEMORY_BUDGET, GenerationScheduler
+from validation import LENIENT, STRICT, ExportValidationError
+from xlsx_writer import COMPRESSION_LEVELS
+
+# zlib's default deflate level, what zipfile uses when none is given
+DEFAULT_COMPRESSION_LEVEL = 6
+
+COMPRESSION_LABELS = {0: "Store", 1: "Fastest", DEFAULT_COMPRESSION_LEVEL: "Default", 9: "Smallest"}
+
+# Small exports finish within this wait and render without a progress bar
+GENERATION_FAST_PATH_SECONDS = 0.5
+
+# Refresh interval of the progress bar while a generation runs
+PROGRESS_POLL_SECONDS = 0.5
+
+# Field names suggested when a field lookup finds nothing
+FIELD_SUGGESTIONS = 10
+
+# Rows per preview page offered to the user
+PREVIEW_PAGE_SIZES = (25, 50, 100, 250)
+
+# Rendered ObjectMap tabs shared by the generation workers
+FRAGMENT_CACHE_DIR = Path(tempfile.gettempdir()) / "vertify-fragments"
 
 
 def configure_page():
@@ -25,6 +53,74 @@ def configure_page():
     )
 
 
+@st.cache_resource
+def get_result_cache():
+    """
+    Returns the server-wide result cache shared by all sessions.
+    
+    Returns:
+        ResultCache: LRU cache of generation results
+    """
+    return ResultCache()
+
+
+@st.cache_resource
+def get_scheduler():
+    """
+    Returns the server-wide generation scheduler shared by all sessions.
+    
+    Generations run in a bounded process pool with a memory limit per job.
+    VERTIFY_MAX_JOBS sets the number of concurrent generations and
+    VERTIFY_JOB_MEMORY_MB the memory budget of each one.
+    
+    Returns:
+        GenerationScheduler: Scheduler using the fragment cache in the temp directory
+    """
+    memory_budget_mb = os.environ.get("VERTIFY_JOB_MEMORY_MB")
+    return GenerationScheduler(
+        max_jobs=int(os.environ.get("VERTIFY_MAX_JOBS", DEFAULT_MAX_JOBS)),
+        memory_budget=int(memory_budget_mb) * 1024 * 1024 if memory_budget_mb else DEFAULT_MEMORY_BUDGET,
+        fragment_cache_dir=FRAGMENT_CACHE_DIR,
+    )
+
+
+def get_upload_key(uploaded_file):
+    """
+    Returns the content-hash cache key of an uploaded file.
+    
+    The key is memoized per upload in the session state, so reruns on the
+    same upload don't re-hash the file.
+    
+    Args:
+        uploaded_file: File uploaded by the user
+    
+    Returns:
+        str: Cache key
+    """
+    upload_keys = st.session_state.setdefault("upload_keys", {})
+    key = upload_keys.get(uploaded_file.file_id)
+    if key is None:
+        key = hash_file(uploaded_file, GENERATOR_VERSION)
+        upload_keys[uploaded_file.file_id] = key
+    return key
+
+
+def get_uploads_key(uploaded_files):
+    """
+    Returns the cache key of one or more uploaded exports.
+    
+    The upload order is part of the key: it sets the ObjectMap IDs and the
+    tab order of a merged workbook.
+    
+    Args:
+        uploaded_files: Files uploaded by the user
+    
+    Returns:
+        str: Cache key
+    """
+    return "+".join(get_upload_key(uploaded_file) for uploaded_file in uploaded_files)
+
+
 def render_header():
     """Renders the application header."""
     st.title("📊 Vertify Mapping Spreadsheet Generator")
@@ -36,16 +132,144 @@ def render_file_uploader():
     """
     Renders the file upload component.
     
+    Several exports are merged into a single spreadsheet.
+    
     Returns:
-        UploadedFile or None: Uploaded file or None
+        list: Uploaded files (empty if none)
     """
     return st.file_uploader(
-        "📁 Upload mapping JSON file",
+        "📁 Upload mapping JSON files",
         type=["json"],
-        help="Select the JSON file exported from Vertify"
+        accept_multiple_files=True,
+        help="Select one or more JSON files exported from Vertify; "
+             "several exports are merged into one spreadsheet"
+    )
+
+
+def render_previous_workbook_uploader():
+    """
+    Renders the upload of a previously generated spreadsheet.
+    
+    Returns:
+        UploadedFile or None: Previous spreadsheet or None
+    """
+    return st.file_uploader(
+        "📝 Previous spreadsheet (optional)",
+        type=["xlsx"],
+        help="Upload the edited spreadsheet of an earlier generation to keep the values "
+             "filled in by hand (Trigger Type, Sandbox, Credentials, Notes, request/response examples...)"
     )
 
 
+def render_manual_fields_report(manual_fields, previous_workbook):
+    """
+    Renders how many ObjectMaps kept their manually filled values.
+    
+    Args:
+        manual_fields: Manual fields statistics (see ManualFields.get_statistics)
+        previous_workbook: Previous spreadsheet uploaded by the user
+    """
+    st.info(
+        f"📝 Kept the manually filled values of {manual_fields['preserved']} ObjectMaps "
+        f"from {previous_workbook.name}"
+    )
+    if manual_fields["unmatched"]:
+        st.warning(
+            f"{manual_fields['unmatched']} ObjectMaps with manual values in {previous_workbook.name} "
+            "are no longer in the export (renamed or removed); their values were not carried over"
+        )
+
+
+def validation_issue_rows(issues, uploaded_files):
+    """
+    Converts validation issues into table rows.
+    
+    Args:
+        issues: SchemaIssue list (see ValidationReport)
+        uploaded_files: Uploaded files, to name the export of each issue
+    
+    Returns:
+        list: One dict per issue
+    """
+    rows = []
+    for issue in issues:
+        # A malformed Name may be any JSON value
+        object_map = None if issue.object_map is None else str(issue.object_map)
+        row = {"Path": issue.path, "ObjectMap": object_map, "Problem": issue.message}
+        if len(uploaded_files) > 1:
+            row = {"File": uploaded_files[issue.export or 0].name, **row}
+        rows.append(row)
+    return rows
+
+
+def render_validation_errors(error, uploaded_files):
+    """
+    Renders the problems that stopped a generation at validation.
+    
+    Args:
+        error: ExportValidationError raised before the workbook was built
+        uploaded_files: Uploaded files
+    """
+    report = error.report
+    st.error(
+        f"❌ The export failed {report.mode} validation with {report.error_count} errors; "
+        "no spreadsheet was generated"
+    )
+    if len(report.issues) < report.error_count + report.warning_count:
+        st.caption(f"Showing the first {len(report.issues)} problems")
+    st.dataframe(
+        validation_issue_rows(report.issues, uploaded_files),
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def render_validation_warnings(report, uploaded_files):
+    """
+    Renders the fields written with default values (lenient validation).
+    
+    Args:
+        report: ValidationReport of the generation
+        uploaded_files: Uploaded files
+    """
+    if not report.warning_count:
+        return
+    with st.expander(f"⚠️ {report.warning_count} validation warnings: fields written with defaults"):
+        st.dataframe(
+            validation_issue_rows(report.warnings, uploaded_files),
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+def render_merge_report(merge, uploaded_files):
+    """
+    Renders how the uploaded exports were merged.
+    
+    Args:
+        merge: Merge report of the generation (see MappingSpreadsheetGenerator.merge_report)
+        uploaded_files: Uploaded files, in the order they were merged
+    """
+    read = sum(export["object_maps"] for export in merge["exports"])
+    st.info(
+        f"🧩 Merged {len(uploaded_files)} exports: {read} ObjectMaps read, "
+        f"{merge['duplicates']} duplicates rendered once"
+    )
+    with st.expander("Exports"):
+        st.dataframe(
+            [
+                {
+                    "File": uploaded_file.name,
+                    "ObjectMaps": export["object_maps"],
+                    "Duplicates": export["duplicates"],
+                }
+                for uploaded_file, export in zip(uploaded_files, merge["exports"])
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+
 def render_statistics(stats):
     """
     Renders the processed JSON statistics.
@@ -63,65 +287,212 @@ def render_statistics(stats):
     
     with col3:
         st.metric("🔍 Total Filters", stats["total_filters"])
+    
+    with st.expander("📈 Mapping details"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("⚠️ Targets without source field", stats["unmapped_targets"])
+            st.caption("Rule types")
+            st.bar_chart(stats["rule_types"])
+        
+        with col2:
+            st.caption("Fields per system pair")
+            st.dataframe(stats["system_pairs"], use_container_width=True, hide_index=True)
+
 
+def reset_preview_page():
+    """Returns the preview to its first page (the search or sorting changed)."""
+    st.session_state["preview_page"] = 1
 
-def render_preview_table(objects_map):
+
+@st.fragment
+def render_preview_table(preview):
     """
-    Renders the ObjectMaps preview table.
+    Renders one page of the ObjectMaps preview table.
+    
+    Searching, sorting and paging run on the server against the prebuilt
+    PreviewIndex; only the visible page is materialized and sent to the
+    browser. As a fragment, paging does not rerun the rest of the page.
     
     Args:
-        objects_map: List of ObjectMaps from JSON
+        preview: PreviewIndex produced by the generation pipeline
     """
     with st.expander("👀 ObjectMaps Preview", expanded=True):
-        if objects_map:
-            preview_data = []
-            for idx, obj in enumerate(objects_map, 1):
-                preview_data.append({
-                    "ID": idx,
-                    "Name": obj.get("Name", "N/A"),
-                    "Source": obj.get("SourceSystemName", "N/A"),
-                    "Target": obj.get("TargetSystemName", "N/A"),
-                    "Properties": len(obj.get("PropertiesMap", [])),
-                    "Filters": len(obj.get("ObjectsMapFilter", [])),
-                })
-            
-            st.dataframe(preview_data, use_container_width=True)
-        else:
+        if not len(preview):
             st.warning("No ObjectMap found in JSON")
+            return
+        
+        col1, col2, col3, col4 = st.columns([4, 2, 1, 1], vertical_alignment="bottom")
+        with col1:
+            query = st.text_input(
+                "🔎 Search", key="preview_query", on_change=reset_preview_page,
+                placeholder="Name, source or target system"
+            )
+        with col2:
+            sort_by = st.selectbox(
+                "Sort by", PREVIEW_COLUMNS, key="preview_sort", on_change=reset_preview_page
+            )
+        with col3:
+            descending = st.checkbox("Descending", key="preview_descending", on_change=reset_preview_page)
+        with col4:
+            page_size = st.selectbox(
+                "Rows", PREVIEW_PAGE_SIZES, index=1, key="preview_page_size",
+                on_change=reset_preview_page
+            )
+        
+        page = st.session_state.get("preview_page", 1)
+        rows, total = preview.page(query, sort_by, descending, page, page_size)
+        pages = max(1, -(-total // page_size))
+        if page > pages:
+            # A new upload with fewer matches than the page kept in the session
+            page = st.session_state["preview_page"] = 1
+            rows, total = preview.page(query, sort_by, descending, page, page_size)
+        
+        if not total:
+            st.info("No ObjectMap matches the search")
+            return
+        
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+        
+        col1, col2 = st.columns([1, 4], vertical_alignment="center")
+        with col1:
+            st.number_input("Page", min_value=1, max_value=pages, key="preview_page")
+        with col2:
+            first = (page - 1) * page_size + 1
+            st.caption(f"{first}-{first + len(rows) - 1} of {total} ObjectMaps · page {page} of {pages}")
 
 
-def generate_and_download(json_data, uploaded_file):
+@st.fragment
+def render_field_lookup(field_index):
     """
-    Generates the spreadsheet and provides automatic download.
+    Renders the field lookup: which ObjectMaps read or write a field.
+    
+    Each lookup is a single dictionary access in the prebuilt FieldIndex;
+    as a fragment, typing a field reruns only this panel.
     
     Args:
-        json_data: Loaded JSON data
-        uploaded_file: Uploaded file
+        field_index: FieldIndex produced by the generation pipeline
     """
-    with st.spinner("Generating spreadsheet... Please wait..."):
-        try:
-            # Generate spreadsheet
-            generator = MappingSpreadsheetGenerator(json_data)
-            excel_bytes = generator.generate_to_bytes()
-            
-            # Output filename
-            output_filename = uploaded_file.name.replace('.json', '_MAPPINGS.xlsx')
-            
-            st.success("✅ Spreadsheet generated successfully!")
-            
-            # Download button
-            st.download_button(
-                label="⬇️ Download Excel Spreadsheet",
-                data=excel_bytes,
-                file_name=output_filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
+    with st.expander("🔗 Field lookup"):
+        field = st.text_input(
+            "Which ObjectMaps touch this field?", key="field_lookup",
+            placeholder="Exact field name, e.g. Email",
+            help=f"{len(field_index)} distinct fields in Field Mapping, Filter and Merge sections"
+        )
+        if not field.strip():
+            return
+        
+        uses = field_index.lookup(field)
+        if uses:
+            object_maps = len({use["ID"] for use in uses})
+            st.caption(f"Used {len(uses)} times in {object_maps} ObjectMaps")
+            st.dataframe(uses, use_container_width=True, hide_index=True)
+            return
+        
+        # Only a miss scans the field names, to suggest close spellings
+        term = field.strip().casefold()
+        suggestions = [name for name in field_index.fields() if term in str(name).casefold()]
+        st.info(f"No ObjectMap uses the field '{field.strip()}'")
+        if suggestions:
+            st.caption("Fields containing this text: " + ", ".join(map(str, suggestions[:FIELD_SUGGESTIONS])))
+
+
+def get_generation_job(source, job_key, cache_key, options, previous_workbook=None):
+    """
+    Returns the session's generation job for an upload, starting it if needed.
+    
+    The job waits for its turn in the server-wide scheduler and runs in its
+    process pool. A job started for another upload (or other options) is
+    superseded: it leaves the queue, or stops before its next ObjectMap tab.
+    
+    Args:
+        source: File uploaded by the user, or a list of files to merge
+        job_key: Identifies the upload and the generation options
+        cache_key: Result cache key the finished result is stored under
+        options: Workbook options plus profiling and track_allocations
+        previous_workbook: Previous spreadsheet whose manual values are kept
+    
+    Returns:
+        GenerationJob: Queued, running or finished job
+    """
+    job = st.session_state.get("generation_job")
+    if job is not None and job.key != job_key:
+        job.cancel()
+        job = None
+    
+    if job is None:
+        # Streamlit resources are resolved here: the job thread has no script context
+        cache = get_result_cache()
+        scheduler = get_scheduler()
+        
+        def run(progress, cancel_event, queued):
+            # Statistics, preview and workbook come from a single pass in a worker process
+            result = scheduler.run(
+                source, options, progress, cancel_event, queued, previous_workbook
             )
-            
-        except Exception as e:
-            st.error(f"❌ Error generating spreadsheet: {str(e)}")
-            with st.expander("Error details"):
-                st.exception(e)
+            cache.put(cache_key, result)
+            return result
+        
+        job = st.session_state["generation_job"] = GenerationJob(job_key, run).start()
+    return job
+
+
+def cancel_generation_job():
+    """Cancels the session's generation job, if any (e.g. the upload was removed)."""
+    job = st.session_state.pop("generation_job", None)
+    if job is not None:
+        job.cancel()
+
+
+@st.fragment(run_every=PROGRESS_POLL_SECONDS)
+def render_generation_progress(job):
+    """
+    Renders the progress of a running generation job.
+    
+    The fragment refreshes itself and reruns the whole page once the job
+    finishes, so the result is rendered as soon as it is ready.
+    
+    Args:
+        job: Running GenerationJob
+    """
+    if job.finished:
+        st.rerun()
+    
+    if job.queue_position is not None:
+        st.info(f"⏳ Waiting for a free generation slot: position {job.queue_position} in the queue")
+        return
+    
+    text = f"Generating spreadsheet... {job.tabs_written} ObjectMap tabs written"
+    st.progress(job.fraction or 0.0, text=text)
+
+
+def render_download(excel_file, uploaded_files):
+    """
+    Provides the generated spreadsheet for download.
+    
+    The workbook stays in its spooled file; its bytes are only read to hand
+    them to the download button, which keeps the one in-memory copy.
+    
+    Args:
+        excel_file: SpooledWorkbook with the generated XLSX
+        uploaded_files: Uploaded files
+    """
+    # Output filename
+    output_filename = uploaded_files[0].name.replace('.json', '_MAPPINGS.xlsx')
+    if len(uploaded_files) > 1:
+        output_filename = uploaded_files[0].name.replace('.json', f'_+{len(uploaded_files) - 1}_MERGED_MAPPINGS.xlsx')
+    
+    st.success("✅ Spreadsheet generated successfully!")
+    
+    # Download button
+    st.download_button(
+        label="⬇️ Download Excel Spreadsheet",
+        data=excel_file.read(),
+        file_name=output_filename,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        use_container_width=True
+    )
 
 
 def render_instructions():
@@ -133,7 +504,7 @@ def render_instructions():
         ### Step by step:
         
         1. **Export** the Vertify mapping JSON file
-        2. **Upload** the file using the field above
+        2. **Upload** the file using the field above (several exports are merged into one spreadsheet)
         3. **Review** the displayed information
         4. The spreadsheet will be **generated automatically**
         5. **Download** the generated XLSX file
@@ -170,9 +541,143 @@ def render_instructions():
         - **Notes** → Empty
         
         **Note:** These fields must be filled in manually in the generated Excel spreadsheet based on your specific requirements.
+        Upload the edited spreadsheet as **Previous spreadsheet** when regenerating to keep the values already filled in.
         """)
 
 
+def render_cache_status(cache):
+    """
+    Renders the result cache counters in the sidebar.
+    
+    Args:
+        cache: ResultCache instance
+    """
+    stats = cache.get_statistics()
+    st.sidebar.caption(
+        f"Cache: {stats['entries']} entries · "
+        f"{stats['size_bytes'] / (1024 * 1024):.1f} MB · "
+        f"{stats['hits']} hits · {stats['misses']} misses"
+    )
+
+
+def render_scheduler_status(scheduler):
+    """
+    Renders the generation queue metrics in the sidebar.
+    
+    Args:
+        scheduler: GenerationScheduler instance
+    """
+    stats = scheduler.get_statistics()
+    finished = stats["completed"] + stats["failed"] + stats["cancelled"]
+    average_wait = stats["wait_seconds_total"] / finished if finished else 0.0
+    average_run = stats["run_seconds_total"] / finished if finished else 0.0
+    st.sidebar.caption(
+        f"Jobs: {stats['running']}/{stats['max_jobs']} running · "
+        f"{stats['queue_depth']} queued · "
+        f"avg wait {average_wait:.1f}s · avg run {average_run:.1f}s"
+    )
+
+
+def render_profiling_options():
+    """
+    Renders the opt-in profiling controls in the sidebar.
+    
+    Returns:
+        tuple: (profiling enabled, allocation tracking enabled)
+    """
+    profiling = st.sidebar.checkbox(
+        "Profile generation",
+        help="Measure time, CPU, rows and memory per stage and per ObjectMap"
+    )
+    track_allocations = profiling and st.sidebar.checkbox(
+        "Track allocations (slower)",
+        help="Measure memory allocated per stage with tracemalloc"
+    )
+    return profiling, track_allocations
+
+
+def render_workbook_options():
+    """
+    Renders the workbook output controls in the sidebar.
+    
+    Returns:
+        dict: compression_level (0 = store, 9 = smallest file),
+            field_index_sheet and validation ("strict" or "lenient")
+    """
+    compression_level = st.sidebar.select_slider(
+        "Workbook compression",
+        options=list(COMPRESSION_LEVELS),
+        value=DEFAULT_COMPRESSION_LEVEL,
+        format_func=lambda level: COMPRESSION_LABELS.get(level, str(level)),
+        help="Lower levels save faster but produce larger files; "
+             "0 stores the workbook parts uncompressed"
+    )
+    field_index_sheet = st.sidebar.checkbox(
+        "Add Field Index sheet",
+        help="Append a sheet listing the ObjectMaps that read or write each field"
+    )
+    strict_validation = st.sidebar.checkbox(
+        "Strict validation",
+        help="Refuse exports with missing or mistyped fields instead of filling them "
+             "with defaults (N/A, empty); malformed exports are always refused"
+    )
+    return {
+        "compression_level": compression_level,
+        "field_index_sheet": field_index_sheet,
+        "validation": STRICT if strict_validation else LENIENT,
+    }
+
+
+def workbook_options_key(workbook_options):
+    """
+    Returns the cache key suffix of the workbook options.
+    
+    The options change the workbook bytes (or whether it is generated at
+    all), so they are part of the result key.
+    """
+    return (
+        f"zip{workbook_options['compression_level']}"
+        f":fields{int(workbook_options['field_index_sheet'])}"
+        f":{workbook_options['validation']}"
+    )
+
+
+def render_profile_panel(profile):
+    """
+    Renders the generation profile in the sidebar.
+    
+    Args:
+        profile: Report returned by Profiler.report
+    """
+    st.sidebar.subheader("⏱️ Profile")
+    stages = [
+        {
+            "Stage": name,
+            "Calls": totals["calls"],
+            "Wall (s)": round(totals["wall_seconds"], 4),
+            "CPU (s)": round(totals["cpu_seconds"], 4),
+            "Rows": totals["rows"],
+            "Alloc (KB)": round(totals["allocated_bytes"] / 1024, 1),
+        }
+        for name, totals in sorted(
+            profile["stages"].items(), key=lambda item: item[1]["wall_seconds"], reverse=True
+        )
+    ]
+    st.sidebar.dataframe(stages, use_container_width=True, hide_index=True)
+    
+    st.sidebar.caption(f"Slowest ObjectMaps ({profile['object_maps']} measured)")
+    slowest = [
+        {
+            "ID": record["object_map_index"],
+            "Name": record["object_map_name"],
+            "Wall (s)": round(record["wall_seconds"], 4),
+            "Rows": record["rows"],
+        }
+        for record in profile["slowest_object_maps"]
+    ]
+    st.sidebar.dataframe(slowest, use_container_width=True, hide_index=True)
+
+
 def render_footer():
     """Renders the application footer."""
     st.divider()
@@ -182,34 +687,82 @@ def render_footer():
     )
 
 
-def process_uploaded_file(uploaded_file):
+def process_uploaded_files(uploaded_files, workbook_options, profiling=False, track_allocations=False,
+                           previous_workbook=None):
     """
-    Processes the uploaded JSON file and renders appropriate content.
+    Processes the uploaded JSON files and renders appropriate content.
     
     Args:
-        uploaded_file: File uploaded by the user
+        uploaded_files: Files uploaded by the user, merged into one spreadsheet
+        workbook_options: Output options (see render_workbook_options)
+        profiling: Measure the generation and show the profile in the sidebar
+        track_allocations: Also measure memory allocations (slower)
+        previous_workbook: Previous spreadsheet whose manual values are kept
     """
     try:
-        # Read and parse JSON
-        json_data = json.load(uploaded_file)
+        # Reruns on the same content are served from the result cache
+        cache = get_result_cache()
+        cache_key = f"{get_uploads_key(uploaded_files)}:{workbook_options_key(workbook_options)}"
+        if previous_workbook is not None:
+            cache_key += f":previous{get_upload_key(previous_workbook)}"
+        result = cache.get(cache_key)
+        
+        # A cached result without a profile is regenerated when profiling
+        if result is None or (profiling and result["profile"] is None):
+            job_key = f"{cache_key}:profile{int(profiling)}{int(track_allocations)}"
+            options = {
+                **workbook_options,
+                "profiling": profiling,
+                "track_allocations": track_allocations,
+            }
+            # A single export is read as is; several are merged (see MultiExportReader)
+            source = uploaded_files[0] if len(uploaded_files) == 1 else list(uploaded_files)
+            job = get_generation_job(source, job_key, cache_key, options, previous_workbook)
+            
+            if not job.wait(GENERATION_FAST_PATH_SECONDS):
+                render_generation_progress(job)
+                return
+            
+            if job.status == GenerationJob.FAILED:
+                raise job.error
+            if job.status == GenerationJob.CANCELLED:
+                st.warning("Generation was cancelled. Upload the files again to restart it.")
+                return
+            
+            # The result is now in the cache; the finished job is not kept
+            result = job.result
+            st.session_state.pop("generation_job", None)
         
-        # Create generator to get statistics
-        generator = MappingSpreadsheetGenerator(json_data)
-        stats = generator.get_statistics()
+        if profiling:
+            render_profile_panel(result["profile"])
+        
+        if result["merge"] is not None:
+            render_merge_report(result["merge"], uploaded_files)
+        
+        if result["validation"] is not None:
+            render_validation_warnings(result["validation"], uploaded_files)
+        
+        if result["manual_fields"] is not None:
+            render_manual_fields_report(result["manual_fields"], previous_workbook)
         
         # Render statistics
-        render_statistics(stats)
+        render_statistics(result["statistics"])
         
         st.divider()
         
         # ObjectMaps preview
-        objects_map = json_data.get("ObjectsMap", [])
-        render_preview_table(objects_map)
+        render_preview_table(result["preview"])
+        
+        # "Which ObjectMaps touch this field?"
+        render_field_lookup(result["field_index"])
         
         st.divider()
         
-        # Auto-generate and provide download
-        generate_and_download(json_data, uploaded_file)
+        # Provide download
+        render_download(result["excel_file"], uploaded_files)
+    
+    except ExportValidationError as e:
+        render_validation_errors(e, uploaded_files)
     
     except json.JSONDecodeError as e:
         st.error("❌ Error reading JSON: Invalid file")
@@ -228,13 +781,22 @@ def main():
     render_header()
     
     # File upload
-    uploaded_file = render_file_uploader()
+    uploaded_files = render_file_uploader()
+    previous_workbook = render_previous_workbook_uploader()
+    workbook_options = render_workbook_options()
+    profiling, track_allocations = render_profiling_options()
     
-    if uploaded_file is not None:
-        process_uploaded_file(uploaded_file)
+    if uploaded_files:
+        process_uploaded_files(
+            uploaded_files, workbook_options, profiling, track_allocations, previous_workbook
+        )
     else:
+        cancel_generation_job()
         render_instructions()
     
+    render_cache_status(get_result_cache())
+    render_scheduler_status(get_scheduler())
+    
     render_footer()
 
 
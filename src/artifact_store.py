@@ -0,0 +1,216 @@
+"""
+Armazém em disco de planilhas geradas, endereçado pelo conteúdo.
+
+Cada planilha é gravada sob uma chave SHA-256 do export, da versão do
+gerador e das opções de geração (ver artifact_key). Com a saída
+determinística (ver xlsx_writer.DeterministicZipFile), uma chave corresponde
+sempre aos mesmos bytes: uma conversão repetida vira uma leitura de disco e a
+chave pode ser usada como ETag. Metadados opcionais da geração (ex.: número
+de ObjectMaps, avisos de validação) ficam em um JSON ao lado da planilha.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from cache import HASH_CHUNK_SIZE
+from fragment_cache import write_atomic
+from output import SpooledWorkbook
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+_ARTIFACT_SUFFIX = ".xlsx"
+_METADATA_SUFFIX = ".json"
+
+
+def _hash_source(source):
+    """Digest SHA-256 de um caminho ou arquivo binário, lido em blocos."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            return _hash_source(file)
+
+    digest = hashlib.sha256()
+    source.seek(0)
+    while True:
+        chunk = source.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    source.seek(0)
+    return digest.digest()
+
+
+def artifact_key(sources, version, options):
+    """
+    Calcula a chave da planilha gerada a partir de um ou mais exports.
+
+    Args:
+        sources: Lista de caminhos ou arquivos binários (com seek), na ordem
+            em que os exports são unidos
+        version: Versão do gerador (GENERATOR_VERSION)
+        options: Dicionário serializável com as opções que alteram a
+            planilha (ex.: motor, nível de compressão, aba Field Index)
+
+    Returns:
+        str: Digest SHA-256 em hexadecimal
+    """
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(f"{version}\0{canonical}\0".encode())
+    for source in sources:
+        digest.update(_hash_source(source))
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """
+    Armazém LRU em disco de planilhas, limitado pelo tamanho total.
+
+    Como no FragmentCache, a recência é registrada no mtime dos arquivos e
+    as gravações são atômicas, então o diretório pode ser compartilhado
+    entre execuções e processos.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa o armazém.
+
+        Args:
+            directory: Diretório onde as planilhas são gravadas
+            max_bytes: Tamanho máximo somado das planilhas
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._size_bytes = sum(size for _, _, size in self._iter_artifacts())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _ARTIFACT_SUFFIX)
+
+    def _metadata_path(self, key):
+        return os.path.join(self.directory, key + _METADATA_SUFFIX)
+
+    def _iter_artifacts(self):
+        """Percorre as planilhas gravadas como (caminho, mtime, tamanho)."""
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(_ARTIFACT_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, key):
+        """
+        Abre a planilha de uma chave, sem copiá-la.
+
+        Args:
+            key: Chave da planilha (ver artifact_key)
+
+        Returns:
+            SpooledWorkbook sobre o arquivo em disco, ou None se a chave não
+            estiver no armazém. Uma planilha removida depois de aberta
+            continua legível até o close().
+        """
+        path = self._path(key)
+        try:
+            file = open(path, "rb")
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return SpooledWorkbook(file)
+
+    def get_metadata(self, key):
+        """
+        Lê os metadados gravados com a planilha de uma chave.
+
+        Args:
+            key: Chave da planilha (ver artifact_key)
+
+        Returns:
+            dict ou None: Metadados (None se a chave não estiver no armazém
+            ou tiver sido gravada sem metadados)
+        """
+        try:
+            with open(self._metadata_path(key), "rb") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key, workbook, metadata=None):
+        """
+        Grava a planilha de uma chave, removendo as menos usadas se necessário.
+
+        Args:
+            key: Chave da planilha (ver artifact_key)
+            workbook: SpooledWorkbook gerado
+            metadata: Dicionário serializável opcional, lido por get_metadata
+        """
+        # Os metadados vão antes: uma planilha visível já tem os seus
+        if metadata is not None:
+            encoded = json.dumps(metadata).encode("utf-8")
+            write_atomic(self._metadata_path(key), lambda file: file.write(encoded))
+
+        path = self._path(key)
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = 0
+        try:
+            size = write_atomic(path, workbook.save)
+        except BaseException:
+            # Sem planilha, os metadados recém-gravados ficariam órfãos
+            if metadata is not None and not previous_size:
+                try:
+                    os.remove(self._metadata_path(key))
+                except FileNotFoundError:
+                    pass
+            raise
+
+        with self._lock:
+            self._size_bytes += size - previous_size
+            if self._size_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove as planilhas menos usadas até caber no limite."""
+        artifacts = sorted(self._iter_artifacts(), key=lambda artifact: artifact[1])
+        self._size_bytes = sum(size for _, _, size in artifacts)
+
+        for path, _, size in artifacts:
+            if self._size_bytes <= self.max_bytes:
+                break
+            for removed in (path, path[:-len(_ARTIFACT_SUFFIX)] + _METADATA_SUFFIX):
+                try:
+                    os.remove(removed)
+                except FileNotFoundError:
+                    pass
+            self._size_bytes -= size
+            self.evictions += 1
+
+    def get_statistics(self):
+        """
+        Retorna os contadores do armazém.
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        with self._lock:
+            return {
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,152 @@
+"""
+Cache de resultados de geração indexado pelo conteúdo do export.
+
+Contém a classe ResultCache, um cache LRU limitado por tamanho em bytes,
+e utilitários para calcular a chave de cache a partir do arquivo enviado
+e da versão do gerador.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Estimativa de memória por linha de preview (colunas e índice de busca)
+_PREVIEW_ROW_BYTES = 512
+
+
+def hash_file(fileobj, version):
+    """
+    Calcula a chave de cache de um arquivo sem copiá-lo inteiro.
+
+    Args:
+        fileobj: Arquivo binário com suporte a seek
+        version: Versão do gerador, para invalidar resultados antigos
+
+    Returns:
+        str: Digest SHA-256 em hexadecimal
+    """
+    digest = hashlib.sha256(f"{version}\0".encode())
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def estimate_result_size(result):
+    """
+    Estima o tamanho em bytes de um resultado do pipeline.
+
+    Args:
+        result: Dicionário retornado por MappingSpreadsheetGenerator.process
+
+    A planilha conta pelo tamanho inteiro, mesmo quando está em um
+    SpooledWorkbook em disco, para limitar também o espaço temporário.
+
+    Returns:
+        int: Tamanho estimado em bytes
+    """
+    if result.get("excel_file") is not None:
+        workbook_size = result["excel_file"].size
+    else:
+        workbook_size = len(result["excel_bytes"])
+    return workbook_size + len(result["preview"]) * _PREVIEW_ROW_BYTES
+
+
+class ResultCache:
+    """
+    Cache LRU de resultados de geração, limitado pelo tamanho total.
+
+    É seguro para uso entre threads, já que o Streamlit atende cada sessão
+    em uma thread própria.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_bytes: Tamanho máximo somado dos resultados armazenados
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Busca um resultado e o marca como usado recentemente.
+
+        Args:
+            key: Chave de cache (ver hash_file)
+
+        Returns:
+            O resultado armazenado ou None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result):
+        """
+        Armazena um resultado, removendo os menos usados se necessário.
+
+        Resultados maiores que o limite total não são armazenados.
+
+        Args:
+            key: Chave de cache (ver hash_file)
+            result: Dicionário retornado por MappingSpreadsheetGenerator.process
+        """
+        size = estimate_result_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+
+            self._entries[key] = (result, size)
+            self._size_bytes += size
+
+            while self._size_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Remove todos os resultados armazenados."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def get_statistics(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
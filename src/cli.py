@@ -0,0 +1,406 @@
+"""
+Command-line interface - Batch conversion of Vertify mapping exports.
+
+Converts many JSON exports concurrently with a process pool and writes the
+spreadsheets to an output directory, skipping outputs that are up to date:
+newer than their input and generated with the same options.
+
+With --merge, all inputs are merged into a single spreadsheet instead, and
+ObjectMaps repeated across the exports get a single tab. With --keep-manual,
+values filled in by hand in an existing output are carried over.
+
+Usage:
+    python src/cli.py exports/ "archive/**/*.json" -o spreadsheets/ --jobs 4
+    python src/cli.py customer/*.json -o spreadsheets/ --merge customer
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from engines import ENGINES
+from fragment_cache import FragmentCache
+from generator import GENERATOR_VERSION, MappingSpreadsheetGenerator
+from manual_fields import ManualFields
+from reader import MultiExportReader, VertifyExportReader
+from validation import LENIENT, VALIDATION_MODES
+from xlsx_writer import COMPRESSION_LEVELS
+
+OUTPUT_SUFFIX = "_MAPPINGS.xlsx"
+
+
+def parse_args(argv=None):
+    """
+    Parses command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Convert Vertify mapping JSON exports into Excel spreadsheets."
+    )
+    parser.add_argument(
+        "inputs", nargs="+",
+        help="JSON files, directories (searched recursively) or glob patterns"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", required=True,
+        help="Directory where the spreadsheets are written"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Number of files converted concurrently (default: CPU count)"
+    )
+    parser.add_argument(
+        "--engine", choices=sorted(ENGINES), default="native",
+        help="Workbook writing engine (default: native)"
+    )
+    parser.add_argument(
+        "--fragment-cache", metavar="DIR",
+        help="Directory of the rendered ObjectMap tab cache (native engine only)"
+    )
+    parser.add_argument(
+        "--compression-level", type=int, choices=COMPRESSION_LEVELS, metavar="{0-9}",
+        help="ZIP compression level: 0 stores parts uncompressed (fastest save, "
+             "largest file), 9 gives the smallest file (default: zipfile default, 6)"
+    )
+    parser.add_argument(
+        "--field-index", action="store_true",
+        help='Append a "Field Index" sheet listing the ObjectMaps that use each field'
+    )
+    parser.add_argument(
+        "--merge", metavar="NAME",
+        help=f"Merge all inputs into one spreadsheet, NAME{OUTPUT_SUFFIX}, "
+             "rendering ObjectMaps repeated across exports once"
+    )
+    parser.add_argument(
+        "--keep-manual", action="store_true",
+        help="Carry the values filled in by hand (Trigger Type, Sandbox, Credentials, "
+             "Notes, request/response examples...) over from the existing output"
+    )
+    parser.add_argument(
+        "--validation", choices=[*VALIDATION_MODES, "off"], default=LENIENT,
+        help="Validate each export before building its workbook: lenient refuses only "
+             "malformed exports, strict also missing or mistyped fields (default: lenient)"
+    )
+    parser.add_argument(
+        "--deterministic", action="store_true",
+        help="Write fixed timestamps in the workbook metadata and ZIP entries, so the "
+             "same input always gives a byte-identical spreadsheet"
+    )
+    parser.add_argument(
+        "-f", "--force", action="store_true",
+        help="Convert even when the output is newer than the input"
+    )
+    return parser.parse_args(argv)
+
+
+def collect_inputs(patterns):
+    """
+    Expands files, directories and glob patterns into JSON files.
+
+    Args:
+        patterns: Input arguments
+
+    Returns:
+        list: Unique input paths, in argument order
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(Path(pattern).rglob("*.json")))
+        elif os.path.isfile(pattern):
+            paths.append(Path(pattern))
+        else:
+            paths.extend(Path(match) for match in sorted(glob.glob(pattern, recursive=True)))
+
+    unique = {}
+    for path in paths:
+        unique.setdefault(path.resolve(), path)
+    return list(unique.values())
+
+
+def output_path_for(input_path, output_dir):
+    """Returns the spreadsheet path for an input JSON file."""
+    return Path(output_dir) / f"{input_path.stem}{OUTPUT_SUFFIX}"
+
+
+def options_fingerprint(input_path, args):
+    """
+    Returns a digest of everything besides the input contents that shapes an output.
+
+    Covers the generator version, the options that change the spreadsheet
+    and, for --merge, the list of merged inputs.
+
+    Args:
+        input_path: JSON export path, or a list of paths to merge
+        args: Parsed arguments
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    options = {
+        "version": GENERATOR_VERSION,
+        "engine": args.engine,
+        "compression_level": args.compression_level,
+        "field_index": args.field_index,
+        "keep_manual": args.keep_manual,
+        "validation": args.validation,
+        "deterministic": args.deterministic,
+    }
+    if isinstance(input_path, list):
+        options["inputs"] = [str(path.resolve()) for path in input_path]
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fingerprint_path_for(output_path):
+    """Returns the file, next to the output, holding the options it was generated with."""
+    return output_path.with_name(f".{output_path.name}.options")
+
+
+def is_up_to_date(input_path, output_path, fingerprint):
+    """
+    Checks whether the output exists, is newer than the input (or every
+    merged input) and was generated with the same options.
+    """
+    input_paths = input_path if isinstance(input_path, list) else [input_path]
+    try:
+        output_mtime = output_path.stat().st_mtime
+        if not all(output_mtime >= path.stat().st_mtime for path in input_paths):
+            return False
+        return fingerprint_path_for(output_path).read_text() == fingerprint
+    except FileNotFoundError:
+        return False
+
+
+def describe_input(input_path):
+    """Returns how an input (or a list of merged inputs) is shown in the report."""
+    if isinstance(input_path, list):
+        return f"{len(input_path)} merged exports"
+    return str(input_path)
+
+
+def convert_file(input_path, output_path, engine, fragment_cache_dir=None,
+                 compression_level=None, field_index_sheet=False, keep_manual=False,
+                 validation=LENIENT, deterministic=False):
+    """
+    Converts one export, streaming it from disk and writing the spreadsheet.
+
+    The spreadsheet is written to a temporary file and renamed, so an
+    interrupted run never leaves a partial output that looks up to date.
+
+    Args:
+        input_path: JSON export path, or a list of paths to merge
+        output_path: Spreadsheet path
+        engine: Workbook writing engine
+        fragment_cache_dir: Optional fragment cache directory
+        compression_level: Optional ZIP compression level (0-9)
+        field_index_sheet: Append the "Field Index" sheet
+        keep_manual: Carry the manually filled values of the existing
+            output over to the new spreadsheet
+        validation: Validation mode ("strict", "lenient" or None to skip)
+        deterministic: Write a byte-identical spreadsheet for the same input
+
+    Returns:
+        dict: Statistics of the converted export
+    """
+    fragment_cache = FragmentCache(fragment_cache_dir) if fragment_cache_dir else None
+    if isinstance(input_path, list):
+        reader = MultiExportReader(input_path)
+    else:
+        reader = VertifyExportReader(input_path)
+    # The previous output is streamed read-only before it is replaced
+    manual_fields = None
+    if keep_manual and output_path.exists():
+        manual_fields = ManualFields.load(output_path)
+    generator = MappingSpreadsheetGenerator(
+        reader, engine=engine, fragment_cache=fragment_cache,
+        compression_level=compression_level, field_index_sheet=field_index_sheet,
+        manual_fields=manual_fields, validation=validation, deterministic=deterministic
+    )
+
+    temp_path = output_path.with_name(f".{output_path.name}.tmp")
+    try:
+        with open(temp_path, "wb") as output:
+            result = generator.process(output)
+        os.replace(temp_path, output_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return result["statistics"]
+
+
+def get_validation_mode(args):
+    """Returns the generator's validation mode (None for --validation off)."""
+    return None if args.validation == "off" else args.validation
+
+
+def count_rows(stats):
+    """Returns the number of data rows written for an export."""
+    return stats["total_objectmaps"] + stats["total_properties"] + stats["total_filters"]
+
+
+def get_peak_rss_mb():
+    """
+    Returns the peak resident set size of this process and its workers.
+
+    Returns:
+        float or None: Peak RSS in MB (None when unavailable)
+    """
+    if resource is None:
+        return None
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_conversions(jobs, args):
+    """
+    Runs the conversions, in-process or in a process pool.
+
+    Args:
+        jobs: List of (input_path, output_path)
+        args: Parsed arguments
+
+    Yields:
+        tuple: (input_path, output_path, stats or None, error or None, seconds)
+    """
+    if args.jobs <= 1:
+        for input_path, output_path in jobs:
+            started = time.perf_counter()
+            try:
+                stats = convert_file(
+                    input_path, output_path, args.engine, args.fragment_cache,
+                    args.compression_level, args.field_index, args.keep_manual,
+                    get_validation_mode(args), args.deterministic
+                )
+                yield input_path, output_path, stats, None, time.perf_counter() - started
+            except Exception as e:
+                yield input_path, output_path, None, e, time.perf_counter() - started
+        return
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(
+                convert_file, input_path, output_path, args.engine, args.fragment_cache,
+                args.compression_level, args.field_index, args.keep_manual,
+                get_validation_mode(args), args.deterministic
+            ): (input_path, output_path, time.perf_counter())
+            for input_path, output_path in jobs
+        }
+        for future in as_completed(futures):
+            input_path, output_path, submitted = futures[future]
+            try:
+                stats = future.result()
+                yield input_path, output_path, stats, None, time.perf_counter() - submitted
+            except Exception as e:
+                yield input_path, output_path, None, e, time.perf_counter() - submitted
+
+
+def main(argv=None):
+    """
+    Main command-line function.
+
+    Returns:
+        int: Exit code (1 if any conversion failed)
+    """
+    args = parse_args(argv)
+    if args.fragment_cache and args.engine != "native":
+        print("error: --fragment-cache requires --engine native", file=sys.stderr)
+        return 2
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("error: no JSON files found", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = []
+    skipped = 0
+    failed = 0
+    claimed_outputs = {}
+    if args.merge:
+        # One job converting every input into a single spreadsheet
+        inputs = [inputs]
+    for input_path in inputs:
+        if args.merge:
+            output_path = Path(args.output_dir) / f"{args.merge}{OUTPUT_SUFFIX}"
+        else:
+            output_path = output_path_for(input_path, args.output_dir)
+        if output_path in claimed_outputs:
+            print(
+                f"failed    {input_path}: output {output_path} "
+                f"already produced by {claimed_outputs[output_path]}",
+                file=sys.stderr
+            )
+            failed += 1
+            continue
+        claimed_outputs[output_path] = input_path
+
+        if not args.force and is_up_to_date(
+            input_path, output_path, options_fingerprint(input_path, args)
+        ):
+            print(f"skipped   {describe_input(input_path)} (up to date)")
+            skipped += 1
+        else:
+            jobs.append((input_path, output_path))
+
+    started = time.perf_counter()
+    converted = 0
+    total_rows = 0
+
+    for input_path, output_path, stats, error, seconds in run_conversions(jobs, args):
+        if error is not None:
+            print(f"failed    {describe_input(input_path)}: {error}", file=sys.stderr)
+            failed += 1
+            continue
+
+        fingerprint_path_for(output_path).write_text(options_fingerprint(input_path, args))
+        converted += 1
+        total_rows += count_rows(stats)
+        print(
+            f"converted {describe_input(input_path)} -> {output_path} "
+            f"({stats['total_objectmaps']} ObjectMaps, {seconds:.2f}s)"
+        )
+
+    elapsed = time.perf_counter() - started
+    files_per_second = converted / elapsed if elapsed else 0.0
+    rows_per_second = total_rows / elapsed if elapsed else 0.0
+    peak_rss = get_peak_rss_mb()
+
+    print(
+        f"\n{converted} converted, {skipped} skipped, {failed} failed in {elapsed:.2f}s | "
+        f"{files_per_second:.2f} files/s | {rows_per_second:,.0f} rows/s | "
+        + (f"peak RSS {peak_rss:.1f} MB" if peak_rss is not None else "peak RSS n/a")
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
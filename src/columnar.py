@@ -0,0 +1,225 @@
+"""
+Representação colunar das linhas de PropertiesMap de todo o export.
+
+Contém a classe PropertyTable: cada linha de PropertiesMap de todos os
+ObjectMaps vira uma posição em colunas de inteiros (strings codificadas em um
+dicionário compartilhado). As estatísticas são calculadas com agrupamentos
+vetorizados do NumPy, sem percorrer as listas aninhadas.
+"""
+
+from array import array
+
+import numpy as np
+
+# Move action exibida quando o PropertiesMap não informa nenhuma
+DEFAULT_MOVE_ACTION = "OnAddUpdate"
+
+# Colunas da tabela, todas com códigos inteiros (exceto object_map, que é o ID)
+COLUMNS = (
+    "object_map",
+    "source_property",
+    "target_property",
+    "rule_type",
+    "move_action",
+    "source_system",
+    "target_system",
+)
+
+# Código das linhas sem transformação na coluna rule_type
+NO_RULE = -1
+
+
+class PropertyTable:
+    """
+    Tabela colunar com todas as linhas de PropertiesMap do export.
+
+    É montada uma vez, com add_object_map durante a passada pelos ObjectMaps,
+    em arrays compactos; as colunas são convertidas em arrays NumPy uma vez,
+    na primeira consulta, para os agrupamentos.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self._codes = {}
+        self._columns = {name: array("i") for name in COLUMNS}
+        self._frozen = None
+
+    def __len__(self):
+        return len(self._columns["object_map"])
+
+    def _encode(self, value):
+        """Retorna o código de um valor no dicionário, registrando-o se for novo."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def code_of(self, value):
+        """Retorna o código de um valor, ou None se ele não aparece na tabela."""
+        return self._codes.get(value)
+
+    def add_object_map(self, idx, obj_map):
+        """
+        Acrescenta as linhas de PropertiesMap de um ObjectMap.
+
+        Os valores são os exibidos na aba de detalhe: source vazio sem
+        transformação e move action padrão quando ausente.
+
+        Args:
+            idx: Índice (ID) do ObjectMap
+            obj_map: ObjectMap
+        """
+        columns = self._columns
+        encode = self._encode
+        source_system = encode(obj_map.source_system_name)
+        target_system = encode(obj_map.target_system_name)
+
+        for prop in obj_map.properties:
+            transform = prop.transformation
+            if transform is None:
+                source_property = encode("")
+                rule_type = NO_RULE
+            else:
+                source_property = encode(transform.source_property_name)
+                rule_type = encode(transform.rule_type)
+
+            columns["object_map"].append(idx)
+            columns["source_property"].append(source_property)
+            columns["target_property"].append(encode(prop.target_property_name))
+            columns["rule_type"].append(rule_type)
+            columns["move_action"].append(encode(prop.move_action or DEFAULT_MOVE_ACTION))
+            columns["source_system"].append(source_system)
+            columns["target_system"].append(target_system)
+
+        self._frozen = None
+
+    @classmethod
+    def from_object_maps(cls, object_maps):
+        """
+        Monta a tabela a partir de um iterável de ObjectMaps.
+
+        Args:
+            object_maps: Iterável de ObjectMap (IDs a partir de 1)
+
+        Returns:
+            PropertyTable
+        """
+        table = cls()
+        for idx, obj_map in enumerate(object_maps, 1):
+            table.add_object_map(idx, obj_map)
+        return table
+
+    def column(self, name):
+        """
+        Retorna uma coluna como array NumPy de int32.
+
+        Args:
+            name: Nome da coluna (ver COLUMNS)
+        """
+        if self._frozen is None:
+            # Cópia: uma visão do buffer impediria novos add_object_map
+            self._frozen = {
+                column: np.array(values, dtype=np.int32)
+                for column, values in self._columns.items()
+            }
+        return self._frozen[name]
+
+    def _histogram(self, name):
+        """Conta as linhas por valor de uma coluna codificada."""
+        codes = self.column(name)
+        codes = codes[codes >= 0]
+        counts = np.bincount(codes, minlength=len(self.strings))
+        return {
+            self.strings[code]: int(counts[code])
+            for code in np.flatnonzero(counts)
+        }
+
+    def rule_type_histogram(self):
+        """
+        Conta as linhas por RuleType da primeira transformação.
+
+        Returns:
+            dict: RuleType -> quantidade (linhas sem transformação ficam de fora)
+        """
+        return self._histogram("rule_type")
+
+    def move_action_histogram(self):
+        """
+        Conta as linhas por move action.
+
+        Returns:
+            dict: Move action -> quantidade
+        """
+        return self._histogram("move_action")
+
+    def fields_per_system_pair(self):
+        """
+        Agrupa as linhas pelo par de sistemas (origem, destino).
+
+        Returns:
+            list: Dicionários Source, Target, Fields (linhas) e Distinct Targets
+                (campos de destino distintos), do par com mais linhas ao com menos
+        """
+        if not len(self):
+            return []
+
+        width = np.int64(len(self.strings))
+        pairs = self.column("source_system").astype(np.int64) * width + self.column("target_system")
+        pair_keys, fields = np.unique(pairs, return_counts=True)
+
+        # Campos de destino distintos: pares (par de sistemas, campo) únicos
+        distinct = np.unique(pairs * width + self.column("target_property"))
+        distinct_keys, distinct_counts = np.unique(distinct // width, return_counts=True)
+        distinct_targets = dict(zip(distinct_keys.tolist(), distinct_counts.tolist()))
+
+        order = np.argsort(-fields, kind="stable")
+        return [
+            {
+                "Source": self.strings[int(pair_keys[i] // width)],
+                "Target": self.strings[int(pair_keys[i] % width)],
+                "Fields": int(fields[i]),
+                "Distinct Targets": distinct_targets[int(pair_keys[i])],
+            }
+            for i in order
+        ]
+
+    def unmapped_mask(self):
+        """
+        Retorna a máscara das linhas sem campo de origem.
+
+        São os campos de destino sem transformação ou cuja transformação não
+        informa SourcePropertyName.
+        """
+        empty_codes = [code for code in (self.code_of(""), self.code_of(None)) if code is not None]
+        return np.isin(self.column("source_property"), empty_codes)
+
+    def unmapped_targets(self):
+        """
+        Lista os campos de destino sem campo de origem.
+
+        Returns:
+            list: Tuplas (ID do ObjectMap, TargetPropertyName)
+        """
+        rows = np.flatnonzero(self.unmapped_mask())
+        object_maps = self.column("object_map")[rows].tolist()
+        targets = self.column("target_property")[rows].tolist()
+        return [
+            (object_map, self.strings[target])
+            for object_map, target in zip(object_maps, targets)
+        ]
+
+    def get_statistics(self):
+        """
+        Calcula as estatísticas detalhadas dos mapeamentos.
+
+        Returns:
+            dict: rule_types, move_actions, system_pairs e unmapped_targets
+                (quantidade de campos de destino sem origem)
+        """
+        return {
+            "rule_types": self.rule_type_histogram(),
+            "move_actions": self.move_action_histogram(),
+            "system_pairs": self.fields_per_system_pair(),
+            "unmapped_targets": int(self.unmapped_mask().sum()),
+        }
@@ -0,0 +1,400 @@
+"""
+Motores de escrita utilizados pelo MappingSpreadsheetGenerator.
+
+O motor "openpyxl" monta cada aba no modelo de objetos padrão do openpyxl,
+mantendo todas as células em memória até o `workbook.save`. O motor
+"write-only" monta cada aba em um SheetBuffer leve e o descarrega em uma
+worksheet write-only assim que a aba termina, de forma que o pico de memória
+fica praticamente constante no número de abas. O motor "native" usa o mesmo
+SheetBuffer, mas escreve o SpreadsheetML diretamente, sem o openpyxl.
+"""
+
+import datetime
+from collections import defaultdict
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+from openpyxl.writer.excel import ExcelWriter
+
+from output import SpooledWorkbook
+from styles import ExcelStyles
+from xlsx_writer import DETERMINISTIC_TIMESTAMP, XlsxPackageWriter, open_zip, zip_compression
+
+
+class BufferedCell:
+    """Célula leve com apenas os atributos que o gerador utiliza."""
+
+    __slots__ = ("value", "fill", "font", "alignment", "_style")
+
+    def __init__(self):
+        self.value = None
+        self.fill = None
+        self.font = None
+        self.alignment = None
+        self._style = None
+
+    @property
+    def style(self):
+        """Nome do estilo de ExcelStyles.CELL_STYLES aplicado (ou None)."""
+        return self._style
+
+    @style.setter
+    def style(self, name):
+        # Como no openpyxl, o estilo nomeado substitui toda a formatação
+        style = ExcelStyles.CELL_STYLES[name]
+        self.fill = style.fill
+        self.font = style.font
+        self.alignment = style.alignment
+        self._style = name
+
+    @property
+    def has_style(self):
+        """Indica se a célula possui alguma formatação aplicada."""
+        return (
+            self.fill is not None
+            or self.font is not None
+            or self.alignment is not None
+        )
+
+
+class BufferedColumnDimension:
+    """Largura de coluna registrada em um SheetBuffer."""
+
+    __slots__ = ("width",)
+
+    def __init__(self):
+        self.width = None
+
+
+class SheetBuffer:
+    """
+    Aba em memória que imita o subconjunto da API de Worksheet do openpyxl
+    usado pelo gerador: `cell`, acesso por coordenada (`ws['A1']`),
+    `merge_cells`, `column_dimensions` e `freeze_panes`.
+    """
+
+    def __init__(self, title, index=None):
+        """
+        Inicializa o buffer.
+
+        Args:
+            title: Nome da aba
+            index: Posição da aba no workbook (None para o final)
+        """
+        self.title = title
+        self.index = index
+        self.merged_ranges = []
+        self.column_dimensions = defaultdict(BufferedColumnDimension)
+        self.freeze_panes = None
+        self._cells = {}
+
+    def cell(self, row, column):
+        """
+        Retorna a célula na posição indicada, criando-a se necessário.
+
+        Args:
+            row: Número da linha (1-based)
+            column: Número da coluna (1-based)
+
+        Returns:
+            BufferedCell
+        """
+        key = (row, column)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = BufferedCell()
+        return cell
+
+    def __getitem__(self, coordinate):
+        column_letter, row = coordinate_from_string(coordinate)
+        return self.cell(row, column_index_from_string(column_letter))
+
+    def __setitem__(self, coordinate, value):
+        self[coordinate].value = value
+
+    def merge_cells(self, range_string):
+        """Registra um intervalo de células mescladas (ex.: 'A1:F1')."""
+        self.merged_ranges.append(range_string)
+
+    def stamp(self, template, start_row):
+        """
+        Insere um SectionTemplate a partir de uma linha.
+
+        As células do template são compartilhadas entre as abas, sem cópia:
+        elas não devem ser alteradas depois de carimbadas.
+
+        Args:
+            template: SectionTemplate
+            start_row: Linha inicial do bloco
+        """
+        cells = self._cells
+        for row_offset, column, cell in template.cells:
+            cells[(start_row + row_offset, column)] = cell
+
+        for first_col, first_row, last_col, last_row in template.merges:
+            self.merged_ranges.append(
+                f"{first_col}{start_row + first_row}:{last_col}{start_row + last_row}"
+            )
+
+    def detach(self, row, column):
+        """
+        Substitui uma célula carimbada por uma cópia própria da aba.
+
+        Necessário antes de alterar uma célula vinda de um template (ver stamp).
+
+        Args:
+            row: Número da linha (1-based)
+            column: Número da coluna (1-based)
+        """
+        cell = self._cells.get((row, column))
+        if cell is None:
+            return
+        copy = self._cells[(row, column)] = BufferedCell()
+        copy.value = cell.value
+        copy.fill = cell.fill
+        copy.font = cell.font
+        copy.alignment = cell.alignment
+        copy._style = cell._style
+
+    def iter_rows(self):
+        """
+        Percorre as linhas da primeira até a última preenchida.
+
+        Yields:
+            list: Células da linha (BufferedCell ou None nas lacunas)
+        """
+        if not self._cells:
+            return
+
+        rows = defaultdict(dict)
+        for (row, column), cell in self._cells.items():
+            rows[row][column] = cell
+
+        for row_idx in range(1, max(rows) + 1):
+            columns = rows.get(row_idx)
+            if not columns:
+                yield []
+                continue
+
+            row = [None] * max(columns)
+            for column, cell in columns.items():
+                row[column - 1] = cell
+            yield row
+
+
+def save_workbook(workbook, fileobj, compression_level=None, deterministic=False):
+    """
+    Salva um workbook do openpyxl com o nível de compressão indicado.
+
+    Reproduz o `openpyxl.writer.excel.save_workbook`, que sempre usa o
+    deflate no nível padrão e grava a data atual nos metadados e no ZIP,
+    abrindo o ZipFile com a compressão escolhida.
+
+    Args:
+        workbook: Workbook do openpyxl
+        fileobj: Caminho ou arquivo binário de destino
+        compression_level: Nível de compressão (ver xlsx_writer.zip_compression)
+        deterministic: Grava datas fixas nos metadados (created/modified) e
+            nas entradas do ZIP (ver xlsx_writer.DeterministicZipFile)
+    """
+    if compression_level is None and not deterministic:
+        workbook.save(fileobj)
+        return
+
+    if workbook.write_only and not workbook.worksheets:
+        workbook.create_sheet()
+    if deterministic:
+        workbook.properties.created = DETERMINISTIC_TIMESTAMP
+        workbook.properties.modified = DETERMINISTIC_TIMESTAMP
+    else:
+        workbook.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+
+    archive = open_zip(fileobj, compression_level, deterministic)
+    ExcelWriter(workbook, archive).save()
+
+
+class OpenpyxlEngine:
+    """Motor padrão: abas montadas diretamente no modelo do openpyxl."""
+
+    name = "openpyxl"
+
+    def __init__(self, compression_level=None, deterministic=False):
+        self.compression_level = compression_level
+        self.deterministic = deterministic
+        self.workbook = Workbook()
+        # Remove a planilha padrão criada pelo openpyxl
+        del self.workbook[self.workbook.active.title]
+        ExcelStyles.register_named_styles(self.workbook)
+
+    def create_sheet(self, title, index=None):
+        """Cria uma aba no workbook e a retorna."""
+        return self.workbook.create_sheet(title, index)
+
+    def close_sheet(self, ws):
+        """Nada a fazer: a aba já faz parte do workbook."""
+
+    def save(self, fileobj):
+        """Salva o workbook no arquivo ou stream informado."""
+        save_workbook(self.workbook, fileobj, self.compression_level, self.deterministic)
+
+    def save_spooled(self):
+        """Salva o workbook em um SpooledWorkbook."""
+        output = SpooledWorkbook()
+        save_workbook(self.workbook, output.file, self.compression_level, self.deterministic)
+        return output
+
+    def discard(self):
+        """Descarta o workbook em andamento (nada a liberar além da memória)."""
+
+
+class WriteOnlyEngine:
+    """
+    Motor de streaming: cada aba é montada em um SheetBuffer e descarregada
+    em uma worksheet write-only do openpyxl ao ser fechada.
+    """
+
+    name = "write-only"
+
+    def __init__(self, compression_level=None, deterministic=False):
+        self.compression_level = compression_level
+        self.deterministic = deterministic
+        self.workbook = Workbook(write_only=True)
+        ExcelStyles.register_named_styles(self.workbook)
+
+    def create_sheet(self, title, index=None):
+        """Cria um SheetBuffer para a aba."""
+        return SheetBuffer(title, index)
+
+    def close_sheet(self, buffer):
+        """
+        Descarrega o SheetBuffer em uma worksheet write-only.
+
+        Larguras de colunas, mesclagens e painéis congelados precisam ser
+        definidos antes da primeira linha ser escrita. A worksheet é fechada
+        em seguida para liberar o estado do escritor XML; o conteúdo fica em
+        um arquivo temporário até o `save`.
+
+        Args:
+            buffer: SheetBuffer com o conteúdo da aba
+        """
+        ws = self.workbook.create_sheet(buffer.title, buffer.index)
+
+        for col_letter, dimension in buffer.column_dimensions.items():
+            ws.column_dimensions[col_letter].width = dimension.width
+
+        for range_string in buffer.merged_ranges:
+            ws.merged_cells.add(range_string)
+
+        if buffer.freeze_panes:
+            ws.freeze_panes = buffer.freeze_panes
+
+        for row in buffer.iter_rows():
+            ws.append([self._to_write_only_cell(ws, cell) for cell in row])
+
+        ws.close()
+
+    @staticmethod
+    def _to_write_only_cell(ws, cell):
+        """Converte uma BufferedCell em valor ou WriteOnlyCell estilizada."""
+        if cell is None:
+            return None
+        if not cell.has_style:
+            return cell.value
+
+        write_only_cell = WriteOnlyCell(ws, value=cell.value)
+        if cell.style is not None:
+            write_only_cell.style = cell.style
+            return write_only_cell
+        if cell.fill is not None:
+            write_only_cell.fill = cell.fill
+        if cell.font is not None:
+            write_only_cell.font = cell.font
+        if cell.alignment is not None:
+            write_only_cell.alignment = cell.alignment
+        return write_only_cell
+
+    def save(self, fileobj):
+        """Salva o workbook no arquivo ou stream informado."""
+        save_workbook(self.workbook, fileobj, self.compression_level, self.deterministic)
+
+    def save_spooled(self):
+        """Salva o workbook em um SpooledWorkbook."""
+        output = SpooledWorkbook()
+        save_workbook(self.workbook, output.file, self.compression_level, self.deterministic)
+        return output
+
+    def discard(self):
+        """Descarta o workbook em andamento (nada a liberar além da memória)."""
+
+
+class NativeEngine:
+    """
+    Motor nativo: cada aba é montada em um SheetBuffer e serializada direto
+    em SpreadsheetML pelo XlsxPackageWriter, sem o modelo do openpyxl.
+    """
+
+    name = "native"
+
+    def __init__(self, compression_level=None, deterministic=False):
+        self.compression_level = compression_level
+        self.deterministic = deterministic
+        self.workbook = None
+        self.writer = XlsxPackageWriter(compression_level, deterministic)
+
+    def create_sheet(self, title, index=None):
+        """Cria um SheetBuffer para a aba."""
+        return SheetBuffer(title, index)
+
+    def close_sheet(self, buffer):
+        """Serializa o SheetBuffer no pacote."""
+        self.writer.add_sheet(buffer)
+
+    def add_sheet_part(self, part):
+        """Incorpora uma aba já serializada (ver xlsx_writer.render_sheet_part)."""
+        self.writer.add_sheet_part(part)
+
+    def save(self, fileobj):
+        """Finaliza o pacote no arquivo ou stream informado."""
+        self.writer.save(fileobj)
+
+    def save_spooled(self):
+        """Finaliza o pacote e entrega o próprio arquivo temporário, sem cópia."""
+        return SpooledWorkbook(self.writer.detach())
+
+    def discard(self):
+        """Descarta o pacote em andamento e seu arquivo temporário."""
+        self.writer.discard()
+
+
+ENGINES = {
+    OpenpyxlEngine.name: OpenpyxlEngine,
+    WriteOnlyEngine.name: WriteOnlyEngine,
+    NativeEngine.name: NativeEngine,
+}
+
+
+def create_engine(name, compression_level=None, deterministic=False):
+    """
+    Instancia o motor de escrita pelo nome.
+
+    Args:
+        name: Nome do motor (chave de ENGINES)
+        compression_level: Nível de compressão do ZIP (None para o padrão,
+            0 para store, 1 a 9 para deflate)
+        deterministic: Grava datas fixas nos metadados e no ZIP
+
+    Returns:
+        Instância do motor
+
+    Raises:
+        ValueError: Se o motor ou o nível de compressão não existirem
+    """
+    try:
+        engine_class = ENGINES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown engine '{name}'. Available engines: {', '.join(ENGINES)}"
+        ) from None
+    zip_compression(compression_level)
+    return engine_class(compression_level, deterministic)
@@ -0,0 +1,142 @@
+"""
+Índice invertido dos campos usados pelos ObjectMaps.
+
+Contém a classe FieldIndex: cada SourcePropertyName e TargetPropertyName de
+PropertiesMap, ObjectsMapFilter e ObjectsMapMergeField aponta para os
+ObjectMaps que o leem ou escrevem. O índice é montado uma vez, durante a
+passada pelos ObjectMaps, e cada consulta é um acesso a dicionário.
+"""
+
+# Seções do ObjectMap onde um campo pode aparecer
+SECTION_FIELD_MAPPING = "Field Mapping"
+SECTION_FILTER = "Filter"
+SECTION_MERGE = "Merge"
+
+# Papel do campo no movimento
+ROLE_SOURCE = "Source"
+ROLE_TARGET = "Target"
+
+# Colunas de cada uso retornado por lookup (e da aba "Field Index")
+FIELD_INDEX_COLUMNS = ("Field", "Role", "Section", "ID", "ObjectMap")
+
+
+def _normalize(field):
+    """Chave de busca de um campo: sem espaços nas pontas e sem diferenciar maiúsculas."""
+    return str(field).strip().casefold()
+
+
+class FieldIndex:
+    """
+    Índice campo -> usos nos ObjectMaps do export.
+
+    Cada uso é a tupla (ID do ObjectMap, seção, papel, nome do campo como
+    escrito no export); usos repetidos dentro de um ObjectMap são contados
+    uma vez.
+    """
+
+    def __init__(self):
+        self.object_map_names = {}
+        self._uses = {}
+
+    def __len__(self):
+        return len(self._uses)
+
+    def __contains__(self, field):
+        return _normalize(field) in self._uses
+
+    def _add(self, seen, idx, section, role, field):
+        """Registra um uso de campo, ignorando nomes vazios e repetições."""
+        if not field:
+            return
+        use = (idx, section, role, field)
+        if use in seen:
+            return
+        seen.add(use)
+
+        key = _normalize(field)
+        uses = self._uses.get(key)
+        if uses is None:
+            uses = self._uses[key] = []
+        uses.append(use)
+
+    def add_object_map(self, idx, obj_map):
+        """
+        Acrescenta os campos de um ObjectMap.
+
+        Args:
+            idx: Índice (ID) do ObjectMap
+            obj_map: ObjectMap
+        """
+        self.object_map_names[idx] = "N/A" if obj_map.name is None else obj_map.name
+        seen = set()
+
+        for prop in obj_map.properties:
+            self._add(seen, idx, SECTION_FIELD_MAPPING, ROLE_TARGET, prop.target_property_name)
+            if prop.transformation is not None:
+                self._add(
+                    seen, idx, SECTION_FIELD_MAPPING, ROLE_SOURCE,
+                    prop.transformation.source_property_name
+                )
+
+        for filter_item in obj_map.filters:
+            self._add(seen, idx, SECTION_FILTER, ROLE_SOURCE, filter_item.source_property_name)
+
+        for merge_field in obj_map.merge_fields:
+            self._add(seen, idx, SECTION_MERGE, ROLE_SOURCE, merge_field.source_property_name)
+            self._add(seen, idx, SECTION_MERGE, ROLE_TARGET, merge_field.target_property_name)
+
+    @classmethod
+    def from_object_maps(cls, object_maps):
+        """
+        Monta o índice a partir de um iterável de ObjectMaps.
+
+        Args:
+            object_maps: Iterável de ObjectMap (IDs a partir de 1)
+
+        Returns:
+            FieldIndex
+        """
+        index = cls()
+        for idx, obj_map in enumerate(object_maps, 1):
+            index.add_object_map(idx, obj_map)
+        return index
+
+    def lookup(self, field):
+        """
+        Lista os ObjectMaps que leem ou escrevem um campo.
+
+        Args:
+            field: Nome do campo (ex.: "Email"); maiúsculas e espaços nas
+                pontas são ignorados
+
+        Returns:
+            list: Dicionários com as colunas de FIELD_INDEX_COLUMNS, na ordem
+                do export (vazia se o campo não é usado)
+        """
+        names = self.object_map_names
+        return [
+            {"Field": name, "Role": role, "Section": section, "ID": idx, "ObjectMap": names[idx]}
+            for idx, section, role, name in self._uses.get(_normalize(field), ())
+        ]
+
+    def fields(self):
+        """
+        Lista os campos indexados.
+
+        Returns:
+            list: Um nome por campo (como escrito no primeiro uso), em ordem
+                alfabética sem diferenciar maiúsculas
+        """
+        return sorted((uses[0][3] for uses in self._uses.values()), key=lambda name: str(name).casefold())
+
+    def iter_rows(self):
+        """
+        Percorre todos os usos, campo a campo em ordem alfabética.
+
+        Yields:
+            tuple: Valores de FIELD_INDEX_COLUMNS
+        """
+        names = self.object_map_names
+        for key in sorted(self._uses):
+            for idx, section, role, name in self._uses[key]:
+                yield name, role, section, idx, names[idx]
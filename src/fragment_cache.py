@@ -0,0 +1,198 @@
+"""
+Cache em disco de abas de ObjectMap já renderizadas.
+
+Cada ObjectMap é identificado por um hash estável do seu conteúdo. A aba
+serializada (SheetPart) fica gravada em disco, de modo que uma nova geração
+só precisa renderizar os ObjectMaps que mudaram.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from xlsx_writer import SheetPart
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_HEADER_SIZE_BYTES = 4
+_FRAGMENT_SUFFIX = ".fragment"
+
+
+def write_atomic(path, write):
+    """
+    Grava um arquivo de forma atômica: outro processo nunca o lê incompleto.
+
+    O conteúdo vai para um temporário no mesmo diretório, movido para path
+    ao final; se a gravação falhar, o temporário é removido e não fica fora
+    da contagem de tamanho dos caches.
+
+    Args:
+        path: Caminho final do arquivo
+        write: Função que recebe o arquivo binário aberto e grava o conteúdo
+
+    Returns:
+        int: Tamanho gravado, em bytes
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+            size = file.tell()
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return size
+
+
+def fingerprint_object_map(obj_map, version, styles_digest):
+    """
+    Calcula um hash estável do conteúdo de um ObjectMap.
+
+    Args:
+        obj_map: Dicionário com dados do ObjectMap
+        version: Versão do gerador (GENERATOR_VERSION)
+        styles_digest: Digest da StyleSheet usada na renderização
+
+    Returns:
+        str: Digest SHA-256 em hexadecimal
+    """
+    canonical = json.dumps(
+        obj_map, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    digest = hashlib.sha256(f"{version}\0{styles_digest}\0".encode())
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class FragmentCache:
+    """
+    Cache LRU em disco de SheetParts, limitado pelo tamanho total.
+
+    A recência é registrada no mtime dos arquivos, então o cache pode ser
+    compartilhado entre execuções e processos que usem o mesmo diretório.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            directory: Diretório onde os fragmentos são gravados
+            max_bytes: Tamanho máximo somado dos fragmentos
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._size_bytes = sum(size for _, _, size in self._iter_fragments())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _FRAGMENT_SUFFIX)
+
+    def _iter_fragments(self):
+        """Percorre os fragmentos gravados como (caminho, mtime, tamanho)."""
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(_FRAGMENT_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def get(self, key):
+        """
+        Lê o fragmento de um ObjectMap.
+
+        Args:
+            key: Chave do fragmento (ver fingerprint_object_map)
+
+        Returns:
+            SheetPart sem título/posição, ou None se não estiver em cache
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                header_size = int.from_bytes(file.read(_HEADER_SIZE_BYTES), "big")
+                header = json.loads(file.read(header_size))
+                xml = file.read()
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return SheetPart(
+            None, None, xml, header["strings"], header["string_refs"], header["styles_digest"]
+        )
+
+    def put(self, key, part):
+        """
+        Grava o fragmento de um ObjectMap, removendo os menos usados se necessário.
+
+        Args:
+            key: Chave do fragmento (ver fingerprint_object_map)
+            part: SheetPart renderizada
+        """
+        header = json.dumps({
+            "strings": part.strings,
+            "string_refs": part.string_refs,
+            "styles_digest": part.styles_digest,
+        }).encode("utf-8")
+
+        def write(file):
+            file.write(len(header).to_bytes(_HEADER_SIZE_BYTES, "big"))
+            file.write(header)
+            file.write(part.xml)
+
+        path = self._path(key)
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = 0
+        size = write_atomic(path, write)
+
+        with self._lock:
+            self._size_bytes += size - previous_size
+            if self._size_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Remove os fragmentos menos usados até caber no limite."""
+        fragments = sorted(self._iter_fragments(), key=lambda fragment: fragment[1])
+        self._size_bytes = sum(size for _, _, size in fragments)
+
+        for path, _, size in fragments:
+            if self._size_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size_bytes -= size
+            self.evictions += 1
+
+    def get_statistics(self):
+        """
+        Retorna os contadores do cache.
+
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        with self._lock:
+            return {
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -5,34 +5,164 @@ Contém a classe MappingSpreadsheetGenerator responsável por toda a lógica
 de conversão de dados JSON em planilhas Excel formatadas.
 """
 
-import io
-from openpyxl import Workbook
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
 from openpyxl.styles import Font, PatternFill, Alignment
 
+from columnar import PropertyTable
+from engines import SheetBuffer, create_engine
+from field_index import FIELD_INDEX_COLUMNS, FieldIndex
+from fragment_cache import fingerprint_object_map
+from instrumentation import NULL_PROFILER, InstrumentedStyles
+from manual_fields import (
+    API_SOURCE_ROW,
+    API_TARGET_ROW,
+    MERGE_ROW,
+    NO_FILTER_ROW,
+    MovementKeys,
+    field_row_key,
+    filter_row_key,
+)
+from models import parse_object_maps
+from preview import PreviewIndex
+from reader import MultiExportReader, VertifyExportReader
 from styles import ExcelStyles
+from templates import SectionTemplate
+from validation import ERROR, LENIENT, STRICT, WARNING, ExportValidator, compile_schema
+from xlsx_writer import render_sheet_part
+
+# Versão da saída gerada. Deve ser incrementada sempre que o layout da
+# planilha mudar, pois compõe as chaves dos caches de resultado.
+GENERATOR_VERSION = "2.1.0"
+
+# Abas em andamento por worker na renderização paralela; limita a memória
+# ocupada por ObjectMaps e abas ainda não incorporadas ao workbook
+PARALLEL_PENDING_PER_WORKER = 4
+
+# Linhas fixas da aba de resumo antes dos movimentos (título a cabeçalhos)
+SUMMARY_HEADER_ROWS = 6
+
+# Blocos estáticos das seções, gravados uma vez por processo
+_SECTION_TEMPLATES = {}
+
+# Gerador reutilizado pelas abas renderizadas em cada processo worker
+_worker_generator = None
+
+
+class GenerationCancelled(Exception):
+    """A geração foi interrompida pelo cancel_event."""
+
+
+def _render_object_map_part(idx, obj_map, manual_values=None):
+    """
+    Renderiza a aba de um ObjectMap como SheetPart em um processo worker.
+    
+    Args:
+        idx: Índice do ObjectMap
+        obj_map: Dicionário com dados do ObjectMap
+        manual_values: Valores manuais da aba (ver ManualFields.detail_values)
+        
+    Returns:
+        SheetPart com o XML da aba e suas shared strings locais
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = MappingSpreadsheetGenerator({}, engine="native")
+    
+    buffer = _worker_generator.build_object_map_sheet(idx, obj_map, manual_values)
+    return render_sheet_part(buffer, _worker_generator.engine.writer.style_sheet)
 
 
 class MappingSpreadsheetGenerator:
     """Gerador de planilha Excel a partir de JSON de mapeamentos."""
     
-    def __init__(self, json_data):
+    def __init__(self, json_data, engine="openpyxl", workers=None, fragment_cache=None,
+                 profiler=None, compression_level=None, progress=None, cancel_event=None,
+                 field_index_sheet=False, manual_fields=None, validation=None, deterministic=False):
         """
         Inicializa o gerador.
         
         Args:
-            json_data: Dicionário com dados do JSON
+            json_data: Dicionário com dados do JSON, VertifyExportReader
+                para consumir o export em streaming ou MultiExportReader para
+                unir vários exports em uma planilha (ObjectMaps repetidos
+                entre eles geram uma única aba)
+            engine: Motor de escrita ("openpyxl", "write-only" ou "native").
+                O "write-only" descarrega cada aba assim que ela termina,
+                mantendo a memória constante no número de abas; o "native"
+                escreve o SpreadsheetML diretamente, sem o openpyxl.
+            workers: Número de processos para renderizar as abas de detalhe em
+                paralelo (apenas com o motor "native"). None ou 1 = serial.
+            fragment_cache: FragmentCache opcional com as abas de ObjectMaps já
+                renderizadas (apenas com o motor "native"); só os ObjectMaps
+                alterados são renderizados novamente.
+            profiler: Profiler opcional; mede tempo, CPU, linhas e memória por
+                etapa e por ObjectMap, e o relatório volta em process()["profile"]
+            compression_level: Nível de compressão do XLSX: None para o padrão
+                do zipfile, 0 para gravar sem compressão (mais rápido, arquivo
+                maior) ou 1 a 9 para deflate (9 = menor arquivo, mais lento)
+            progress: Função opcional chamada a cada aba de ObjectMap gravada
+                com (abas gravadas, fração do export processada ou None)
+            cancel_event: threading.Event opcional; quando sinalizado, a
+                geração para antes da próxima aba com GenerationCancelled
+            field_index_sheet: Acrescenta ao final a aba "Field Index", com
+                os ObjectMaps que usam cada campo (ver FieldIndex)
+            manual_fields: ManualFields opcional com os valores preenchidos à
+                mão em uma planilha gerada anteriormente; eles substituem os
+                valores padrão das linhas correspondentes
+            validation: Valida o export inteiro antes de montar o workbook:
+                "lenient" recusa apenas o que interromperia a geração,
+                "strict" recusa também campos ausentes ou de tipo inesperado
+                (ver validation). None não valida.
+            deterministic: Grava datas fixas nos metadados e nas entradas do
+                ZIP: o mesmo export, com as mesmas opções e a mesma versão do
+                gerador, gera sempre os mesmos bytes
+        
+        Raises:
+            ValueError: Se workers > 1 ou fragment_cache forem usados com
+                outro motor, ou se o nível de compressão ou o modo de
+                validação forem inválidos
         """
+        if workers and workers > 1 and engine != "native":
+            raise ValueError("Parallel rendering requires the 'native' engine")
+        if fragment_cache is not None and engine != "native":
+            raise ValueError("Fragment caching requires the 'native' engine")
+        if validation is not None:
+            compile_schema(validation)
+        
         self.data = json_data
-        self.workbook = Workbook()
+        self.workers = workers
+        self.fragment_cache = fragment_cache
+        self.engine = create_engine(engine, compression_level, deterministic)
+        self.workbook = self.engine.workbook
+        self.profiler = profiler or NULL_PROFILER
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.field_index_sheet = field_index_sheet
+        self.manual_fields = manual_fields
+        self.validation = validation
+        self.merge_report = None
+        self._tabs_written = 0
         self.styles = ExcelStyles()
+        if self.profiler.enabled:
+            self.styles = InstrumentedStyles(self.styles, self.profiler)
         
-    def create_movements_summary_tab(self):
-        """Cria a aba 'Movements to migrate' com lista de todos os ObjectMaps."""
-        # Remove a planilha padrão e cria nova
-        if "Sheet" in self.workbook.sheetnames:
-            del self.workbook["Sheet"]
+    def create_movements_summary_tab(self, movements=None):
+        """
+        Cria a aba 'Movements to migrate' com lista de todos os ObjectMaps.
         
-        ws = self.workbook.create_sheet("Movements to migrate", 0)
+        Args:
+            movements: Linhas de resumo já coletadas (ver summarize_object_map).
+                Se omitido, os ObjectMaps são percorridos novamente.
+        """
+        if movements is None:
+            movements = [
+                self.summarize_object_map(idx, obj_map)
+                for idx, obj_map in enumerate(self.iter_object_maps(), 1)
+            ]
+        
+        ws = self.engine.create_sheet("Movements to migrate", 0)
         current_row = 1
         
         # ===== TÍTULO PRINCIPAL =====
@@ -101,18 +231,22 @@ class MappingSpreadsheetGenerator:
         current_row += 1
         
         # ===== ADICIONAR DADOS DOS OBJECTMAPS =====
-        objects_map = self.data.get("ObjectsMap", [])
-        for idx, obj_map in enumerate(objects_map, 1):
-            source_system = obj_map.get("SourceSystemName", "N/A")
-            target_system = obj_map.get("TargetSystemName", "N/A")
+        movement_keys = MovementKeys()
+        for movement in movements:
             trigger_type = "Collect & Move? / Collect?"
             
             row_data = [
-                idx, trigger_type, "at 00:00 AM", "every ?", obj_map.get("Name", "N/A"),
-                source_system, "TRUE/FALSE", "TRUE/FALSE", target_system, "TRUE/FALSE",
+                movement["ID"], trigger_type, "at 00:00 AM", "every ?", movement["Name"],
+                movement["Source"], "TRUE/FALSE", "TRUE/FALSE", movement["Target"], "TRUE/FALSE",
                 "TRUE/FALSE", "TRUE/FALSE", "", "", "", ""
             ]
             
+            # Valores preenchidos à mão na planilha anterior
+            if self.manual_fields is not None:
+                manual_values = self.manual_fields.summary_values(movement_keys.next(movement["Name"]))
+                for col_num, value in manual_values.items():
+                    row_data[col_num - 1] = value
+            
             for col_num, value in enumerate(row_data, 1):
                 ws.cell(row=current_row, column=col_num).value = value
             
@@ -124,40 +258,331 @@ class MappingSpreadsheetGenerator:
         # Congelar linhas de cabeçalho
         ws.freeze_panes = "A7"
         
-    def create_object_map_tab(self, idx, obj_map):
+        self.engine.close_sheet(ws)
+        
+    def create_field_index_tab(self, field_index):
+        """
+        Cria a aba 'Field Index', com os usos de cada campo nos ObjectMaps.
+        
+        Args:
+            field_index: FieldIndex do export
+        """
+        ws = self.engine.create_sheet("Field Index")
+        
+        ws.merge_cells('A1:E1')
+        self.styles.apply_header_style(
+            ws['A1'],
+            "Field Index - ObjectMaps reading or writing each field",
+            fill_color=self.styles.COLOR_HEADER_BLACK,
+            font=self.styles.FONT_HEADER_WHITE_LARGE,
+            alignment=self.styles.ALIGN_CENTER
+        )
+        
+        headers = list(FIELD_INDEX_COLUMNS)
+        headers[-1] = "Movement Name"
+        for col_num, header in enumerate(headers, 1):
+            self.styles.apply_header_style(
+                ws.cell(row=2, column=col_num),
+                header,
+                fill_color=self.styles.COLOR_SUBHEADER_GREEN,
+                font=self.styles.FONT_BOLD,
+                alignment=self.styles.ALIGN_CENTER
+            )
+        
+        for row_idx, row_data in enumerate(field_index.iter_rows(), 3):
+            for col_num, value in enumerate(row_data, 1):
+                ws.cell(row=row_idx, column=col_num).value = value
+        
+        self.styles.set_column_widths(ws, self.styles.COLUMN_WIDTHS_FIELD_INDEX)
+        ws.freeze_panes = "A3"
+        
+        self.engine.close_sheet(ws)
+        
+    def summarize_object_map(self, idx, obj_map):
+        """
+        Monta a linha de resumo de um ObjectMap.
+        
+        A mesma linha alimenta a aba de resumo, o preview e as estatísticas.
+        
+        Args:
+            idx: Índice do ObjectMap
+            obj_map: ObjectMap
+            
+        Returns:
+            dict: ID, Name, Source, Target, Properties e Filters
+        """
+        return {
+            "ID": idx,
+            "Name": "N/A" if obj_map.name is None else obj_map.name,
+            "Source": "N/A" if obj_map.source_system_name is None else obj_map.source_system_name,
+            "Target": "N/A" if obj_map.target_system_name is None else obj_map.target_system_name,
+            "Properties": len(obj_map.properties),
+            "Filters": len(obj_map.filters),
+        }
+        
+    def iter_object_maps(self):
+        """
+        Percorre os ObjectMaps do export.
+        
+        Com um VertifyExportReader cada chamada relê a fonte em streaming,
+        sem manter o documento inteiro em memória. Cada item é convertido em
+        um registro compacto (ver models.ObjectMap) ao ser lido.
+        
+        Com um MultiExportReader, os ObjectMaps repetidos entre os exports
+        são entregues uma única vez (ver _iter_unique_object_maps).
+        
+        Returns:
+            Iterável de ObjectMap
+        """
+        if isinstance(self.data, MultiExportReader):
+            return self._iter_unique_object_maps(parse_object_maps(self.data))
+        if isinstance(self.data, VertifyExportReader):
+            return parse_object_maps(self.data)
+        return parse_object_maps(self.data.get("ObjectsMap", []))
+        
+    def _iter_unique_object_maps(self, object_maps):
+        """
+        Descarta os ObjectMaps repetidos dos exports de um MultiExportReader.
+        
+        Um ObjectMap cuja impressão digital (ver ObjectMap.fingerprint) já
+        apareceu, no mesmo export ou em outro, não gera linha de resumo nem
+        aba. As contagens da última iteração ficam em merge_report.
+        
+        Args:
+            object_maps: ObjectMaps de todos os exports, em ordem
+        
+        Yields:
+            ObjectMap
+        """
+        exports = [{"object_maps": 0, "duplicates": 0} for _ in range(len(self.data))]
+        self.merge_report = {"exports": exports, "duplicates": 0}
+        seen = set()
+        for obj_map in object_maps:
+            counts = exports[self.data.export_index]
+            counts["object_maps"] += 1
+            fingerprint = obj_map.fingerprint()
+            if fingerprint in seen:
+                counts["duplicates"] += 1
+                self.merge_report["duplicates"] += 1
+                continue
+            seen.add(fingerprint)
+            yield obj_map
+        
+    def _iter_raw_object_maps(self, validator):
+        """
+        Percorre os ObjectMaps como lidos do JSON, com o caminho de cada um.
+        
+        Yields:
+            tuple: (dicionário do ObjectMap, caminho JSON, posição do export
+                em um MultiExportReader ou None)
+        """
+        if isinstance(self.data, MultiExportReader):
+            positions = [0] * len(self.data)
+            for data in self.data:
+                export = self.data.export_index
+                yield data, f"$.ObjectsMap[{positions[export]}]", export
+                positions[export] += 1
+            return
+        
+        if isinstance(self.data, VertifyExportReader):
+            object_maps = self.data
+        else:
+            object_maps = self.data.get("ObjectsMap", [])
+            if not isinstance(object_maps, list):
+                validator.add_root_issue(ERROR, "$.ObjectsMap", "expected array")
+                return
+        for position, data in enumerate(object_maps):
+            yield data, f"$.ObjectsMap[{position}]", None
+        
+    def validate(self, mode=None):
+        """
+        Valida o export inteiro contra o schema compilado, sem gerar a planilha.
+        
+        É uma passada apenas de leitura pelos ObjectMaps (sem converter em
+        registros nem montar abas), que reporta todos os problemas.
+        
+        Args:
+            mode: "strict" ou "lenient" (padrão: o modo do gerador, ou lenient)
+        
+        Returns:
+            ValidationReport
+        
+        Raises:
+            GenerationCancelled: Se o cancel_event for sinalizado
+        """
+        validator = ExportValidator(mode or self.validation or LENIENT)
+        for data, path, export in self._iter_raw_object_maps(validator):
+            self._check_cancelled()
+            validator.validate_object_map(data, path, export)
+        
+        report = validator.report()
+        if report.object_maps == 0 and report.valid:
+            # Um export vazio gera só a aba de resumo
+            severity = ERROR if validator.mode == STRICT else WARNING
+            validator.add_root_issue(severity, "$.ObjectsMap", "export has no ObjectMaps")
+            report = validator.report()
+        return report
+        
+    def _check_cancelled(self):
+        """Interrompe a geração se o cancel_event foi sinalizado."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise GenerationCancelled("Spreadsheet generation was cancelled")
+        
+    def _tab_written(self):
+        """Conta uma aba de ObjectMap gravada e informa o progresso."""
+        self._tabs_written += 1
+        if self.progress is None:
+            return
+        
+        if isinstance(self.data, (VertifyExportReader, MultiExportReader)):
+            fraction = self.data.fraction_read
+        else:
+            total = len(self.data.get("ObjectsMap", []))
+            fraction = self._tabs_written / total if total else None
+        self.progress(self._tabs_written, fraction)
+        
+    def create_object_map_tab(self, idx, obj_map, manual_values=None):
         """
         Cria uma aba detalhada para um ObjectMap específico.
         
         Args:
             idx: Índice do ObjectMap
-            obj_map: Dicionário com dados do ObjectMap
+            obj_map: ObjectMap
+            manual_values: Valores manuais da aba (ver ManualFields.detail_values)
         """
-        # Nome da aba (limitado a 31 caracteres do Excel e sem caracteres inválidos)
-        name = obj_map.get('Name', 'Unknown')
-        name = self._sanitize_sheet_name(name)
-        tab_name = f"{idx} - {name}"
-        if len(tab_name) > 31:
-            tab_name = f"{idx} - {name[:22]}..."
+        ws = self.build_object_map_sheet(idx, obj_map, manual_values)
+        with self.profiler.stage("write_sheet"):
+            self.engine.close_sheet(ws)
         
-        ws = self.workbook.create_sheet(tab_name)
+    def build_object_map_sheet(self, idx, obj_map, manual_values=None):
+        """
+        Monta a aba detalhada de um ObjectMap sem fechá-la no motor.
+        
+        Args:
+            idx: Índice do ObjectMap
+            obj_map: ObjectMap
+            manual_values: Valores manuais da aba (ver ManualFields.detail_values)
+            
+        Returns:
+            Aba montada (Worksheet ou SheetBuffer, conforme o motor)
+        """
+        ws = self.engine.create_sheet(self._object_map_tab_name(idx, obj_map))
         
         current_row = 1
         
         # ===== SEÇÕES =====
-        current_row = self._add_api_request_section(ws, obj_map, current_row)
+        current_row = self._add_section(
+            "section:api_request", self._add_api_request_section, ws, obj_map, current_row
+        )
         current_row += 2
         
-        current_row = self._add_merge_section(ws, obj_map, current_row)
+        merge_row = current_row
+        current_row = self._add_section(
+            "section:merge", self._add_merge_section, ws, obj_map, current_row
+        )
         current_row += 2
         
-        current_row = self._add_filter_section(ws, obj_map, current_row)
+        filter_row = current_row
+        current_row = self._add_section(
+            "section:filter", self._add_filter_section, ws, obj_map, current_row
+        )
         current_row += 2
         
-        current_row = self._add_field_mapping_section(ws, obj_map, current_row)
+        field_mapping_row = current_row
+        current_row = self._add_section(
+            "section:field_mapping", self._add_field_mapping_section, ws, obj_map, current_row
+        )
+        
+        if manual_values:
+            self._apply_manual_values(
+                ws, obj_map, manual_values, (merge_row, filter_row, field_mapping_row)
+            )
         
         # Ajustar larguras
         self.styles.set_column_widths(ws, self.styles.COLUMN_WIDTHS_DETAIL)
         
+        return ws
+        
+    def _apply_manual_values(self, ws, obj_map, manual_values, section_rows):
+        """
+        Reaplica os valores preenchidos à mão em uma aba de detalhe.
+        
+        Args:
+            ws: Aba montada por build_object_map_sheet
+            obj_map: ObjectMap
+            manual_values: {chave da linha: {coluna: valor}}
+            section_rows: Primeira linha das seções Merge, Filter e Field Mapping
+        """
+        merge_row, filter_row, field_mapping_row = section_rows
+        
+        # Linhas de sistema da API Request, logo após o bloco fixo da seção
+        api_row = 1 + self._section_template("api_request", self._build_api_request_template).height
+        self._write_values(ws, api_row, manual_values.get(API_SOURCE_ROW))
+        self._write_values(ws, api_row + 1, manual_values.get(API_TARGET_ROW))
+        
+        # Linha de regras da Merge: a última do bloco fixo
+        merge_row += self._section_template("merge", self._build_merge_template).height
+        self._write_values(ws, merge_row, manual_values.get(MERGE_ROW))
+        
+        filter_row += self._section_template("filter", self._build_filter_template).height
+        if obj_map.filters:
+            for row_idx, filter_item in enumerate(obj_map.filters, filter_row):
+                self._write_values(ws, row_idx, manual_values.get(
+                    filter_row_key(filter_item.source_property_name, filter_item.filter_operator)
+                ))
+        else:
+            self._write_values(ws, filter_row, manual_values.get(NO_FILTER_ROW))
+        
+        field_row = field_mapping_row + self._section_template(
+            "field_mapping", self._build_field_mapping_template
+        ).height
+        for row_idx, prop in enumerate(obj_map.properties, field_row):
+            source_prop = "" if prop.transformation is None else prop.transformation.source_property_name
+            self._write_values(
+                ws, row_idx, manual_values.get(field_row_key(prop.target_property_name, source_prop))
+            )
+        
+    @staticmethod
+    def _write_values(ws, row, values):
+        """Grava {coluna: valor} em uma linha, sem alterar as células dos templates."""
+        if not values:
+            return
+        for col_num, value in values.items():
+            if isinstance(ws, SheetBuffer):
+                ws.detach(row, col_num)
+            ws.cell(row=row, column=col_num).value = value
+        
+    def _add_section(self, stage_name, add_section, ws, obj_map, start_row):
+        """
+        Executa um método _add_*_section medindo-o no profiler.
+        
+        Returns:
+            Próxima linha livre, como o método da seção
+        """
+        with self.profiler.stage(stage_name) as stage:
+            end_row = add_section(ws, obj_map, start_row)
+            stage.rows = end_row - start_row
+        return end_row
+        
+    def _object_map_tab_name(self, idx, obj_map):
+        """
+        Monta o nome da aba de um ObjectMap.
+        
+        Args:
+            idx: Índice do ObjectMap
+            obj_map: ObjectMap
+            
+        Returns:
+            Nome da aba
+        """
+        # Nome da aba (limitado a 31 caracteres do Excel e sem caracteres inválidos)
+        name = 'Unknown' if obj_map.name is None else obj_map.name
+        name = self._sanitize_sheet_name(name)
+        tab_name = f"{idx} - {name}"
+        if len(tab_name) > 31:
+            tab_name = f"{idx} - {name[:22]}..."
+        return tab_name
+        
     def _sanitize_sheet_name(self, name):
         """
         Remove caracteres inválidos de nomes de abas do Excel.
@@ -184,8 +609,39 @@ class MappingSpreadsheetGenerator:
         
         return name
         
+    def _section_template(self, name, build):
+        """
+        Retorna o template do bloco estático de uma seção.
+        
+        O bloco é gravado na primeira vez em que a seção é usada no processo e
+        reaproveitado por todas as abas (e gerações) seguintes.
+        
+        Args:
+            name: Nome da seção
+            build: Método _build_*_template que monta o bloco
+            
+        Returns:
+            SectionTemplate
+        """
+        template = _SECTION_TEMPLATES.get(name)
+        if template is None:
+            template = _SECTION_TEMPLATES[name] = SectionTemplate.record(build)
+        return template
+        
     def _add_api_request_section(self, ws, obj_map, start_row):
         """Adiciona seção de API Request."""
+        template = self._section_template("api_request", self._build_api_request_template)
+        start_row = template.stamp(ws, start_row)
+        
+        ws.cell(row=start_row, column=1).value = obj_map.source_system_name
+        start_row += 1
+        
+        ws.cell(row=start_row, column=1).value = obj_map.target_system_name
+        
+        return start_row + 1
+        
+    def _build_api_request_template(self, ws, start_row):
+        """Monta o bloco fixo da seção de API Request (até as linhas de sistemas)."""
         ws.merge_cells(f'A{start_row}:F{start_row}')
         self.styles.apply_header_style(
             ws[f'A{start_row}'],
@@ -215,20 +671,36 @@ class MappingSpreadsheetGenerator:
             )
         start_row += 1
         
-        source_system = obj_map.get("SourceSystemName", "")
-        target_system = obj_map.get("TargetSystemName", "")
-        
-        ws.cell(row=start_row, column=1).value = source_system
+        # Tipo das linhas de origem e destino
         ws.cell(row=start_row, column=2).value = "REST"
-        start_row += 1
+        ws.cell(row=start_row + 1, column=2).value = "REST"
         
-        ws.cell(row=start_row, column=1).value = target_system
-        ws.cell(row=start_row, column=2).value = "REST"
-        
-        return start_row + 1
+        return start_row
         
     def _add_merge_section(self, ws, obj_map, start_row):
         """Adiciona seção de Merge."""
+        template = self._section_template("merge", self._build_merge_template)
+        start_row = template.stamp(ws, start_row)
+        
+        merge_record = obj_map.merge_record
+        merge_fields = obj_map.merge_fields
+        
+        if merge_record and merge_fields:
+            merge_info = []
+            for field in merge_fields:
+                merge_info.append(
+                    f"{field.merge_field}: "
+                    f"{field.source_property_name} -> "
+                    f"{field.target_property_name}"
+                )
+            ws.cell(row=start_row, column=1).value = "\n".join(merge_info)
+        else:
+            ws.cell(row=start_row, column=1).value = "No merge"
+        
+        return start_row + 1
+        
+    def _build_merge_template(self, ws, start_row):
+        """Monta o bloco fixo da seção de Merge (até a linha das regras)."""
         ws.merge_cells(f'A{start_row}:F{start_row}')
         self.styles.apply_header_style(
             ws[f'A{start_row}'],
@@ -248,8 +720,11 @@ class MappingSpreadsheetGenerator:
         )
         start_row += 1
         
-        ws.cell(row=start_row, column=1).value = "rules"
-        ws.cell(row=start_row, column=1).fill = self.styles.COLOR_SUBHEADER_GREEN
+        self.styles.apply_header_style(
+            ws.cell(row=start_row, column=1),
+            "rules",
+            fill_color=self.styles.COLOR_SUBHEADER_GREEN
+        )
         
         ws.merge_cells(f'D{start_row-1}:F{start_row-1}')
         self.styles.apply_header_style(
@@ -259,31 +734,37 @@ class MappingSpreadsheetGenerator:
             alignment=self.styles.ALIGN_CENTER_HORIZONTAL
         )
         
-        ws.cell(row=start_row, column=4).value = "rules"
-        ws.cell(row=start_row, column=4).fill = self.styles.COLOR_SUBHEADER_PURPLE
+        self.styles.apply_header_style(
+            ws.cell(row=start_row, column=4),
+            "rules",
+            fill_color=self.styles.COLOR_SUBHEADER_PURPLE
+        )
         start_row += 1
         
-        merge_record = obj_map.get("MergeRecord", False)
-        merge_fields = obj_map.get("ObjectsMapMergeField", [])
-        
-        if merge_record and merge_fields:
-            merge_info = []
-            for field in merge_fields:
-                merge_info.append(
-                    f"{field.get('MergeField', '')}: "
-                    f"{field.get('SourcePropertyName', '')} -> "
-                    f"{field.get('TargetPropertyName', '')}"
-                )
-            ws.cell(row=start_row, column=1).value = "\n".join(merge_info)
-        else:
-            ws.cell(row=start_row, column=1).value = "No merge"
-        
         ws.cell(row=start_row, column=4).value = "N/A"
         
-        return start_row + 1
+        return start_row
         
     def _add_filter_section(self, ws, obj_map, start_row):
         """Adiciona seção de Filter."""
+        template = self._section_template("filter", self._build_filter_template)
+        start_row = template.stamp(ws, start_row)
+        
+        filters = obj_map.filters
+        if filters:
+            for filter_item in filters:
+                ws.cell(row=start_row, column=1).value = filter_item.source_property_name
+                ws.cell(row=start_row, column=2).value = filter_item.filter_operator
+                ws.cell(row=start_row, column=3).value = filter_item.value
+                start_row += 1
+        else:
+            ws.cell(row=start_row, column=1).value = "No filter"
+            start_row += 1
+        
+        return start_row
+        
+    def _build_filter_template(self, ws, start_row):
+        """Monta o bloco fixo da seção de Filter (até os cabeçalhos das colunas)."""
         ws.merge_cells(f'A{start_row}:F{start_row}')
         self.styles.apply_header_style(
             ws[f'A{start_row}'],
@@ -311,14 +792,19 @@ class MappingSpreadsheetGenerator:
         )
         start_row += 1
         
-        ws.cell(row=start_row, column=1).value = "FILTER"
-        ws.cell(row=start_row, column=1).fill = self.styles.COLOR_SUBHEADER_GREEN
+        self.styles.apply_header_style(
+            ws.cell(row=start_row, column=1),
+            "FILTER",
+            fill_color=self.styles.COLOR_SUBHEADER_GREEN
+        )
         
         ws.merge_cells(f'D{start_row}:F{start_row}')
-        cell = ws[f'D{start_row}']
-        cell.value = ""
-        cell.fill = self.styles.COLOR_SUBHEADER_PURPLE
-        cell.alignment = self.styles.ALIGN_CENTER_HORIZONTAL
+        self.styles.apply_header_style(
+            ws[f'D{start_row}'],
+            "",
+            fill_color=self.styles.COLOR_SUBHEADER_PURPLE,
+            alignment=self.styles.ALIGN_CENTER_HORIZONTAL
+        )
         start_row += 1
         
         filter_headers_left = ["path.field", "condition", "value"]
@@ -339,21 +825,40 @@ class MappingSpreadsheetGenerator:
             )
         start_row += 1
         
-        filters = obj_map.get("ObjectsMapFilter", [])
-        if filters:
-            for filter_item in filters:
-                ws.cell(row=start_row, column=1).value = filter_item.get("SourcePropertyName", "")
-                ws.cell(row=start_row, column=2).value = filter_item.get("FilterOperator", "")
-                ws.cell(row=start_row, column=3).value = filter_item.get("Value", "")
-                start_row += 1
-        else:
-            ws.cell(row=start_row, column=1).value = "No filter"
-            start_row += 1
-        
         return start_row
         
     def _add_field_mapping_section(self, ws, obj_map, start_row):
         """Adiciona seção de Field Mapping."""
+        template = self._section_template("field_mapping", self._build_field_mapping_template)
+        start_row = template.stamp(ws, start_row)
+        
+        properties = obj_map.properties
+        for prop in properties:
+            move_action = prop.move_action or "OnAddUpdate"
+            prop_type = prop.type
+            target_prop = prop.target_property_name
+            
+            first_transform = prop.transformation
+            source_prop = ""
+            details = ""
+            
+            if first_transform is not None:
+                source_prop = first_transform.source_property_name
+                rule_type = first_transform.rule_type
+                
+                details = self._get_transformation_details(first_transform, rule_type)
+            
+            ws.cell(row=start_row, column=1).value = move_action
+            ws.cell(row=start_row, column=2).value = prop_type
+            ws.cell(row=start_row, column=3).value = details
+            ws.cell(row=start_row, column=4).value = source_prop
+            ws.cell(row=start_row, column=5).value = target_prop
+            start_row += 1
+        
+        return start_row
+        
+    def _build_field_mapping_template(self, ws, start_row):
+        """Monta o bloco fixo da seção de Field Mapping (até os cabeçalhos das colunas)."""
         ws.merge_cells(f'A{start_row}:F{start_row}')
         self.styles.apply_header_style(
             ws[f'A{start_row}'],
@@ -382,30 +887,6 @@ class MappingSpreadsheetGenerator:
             )
         start_row += 1
         
-        properties = obj_map.get("PropertiesMap", [])
-        for prop in properties:
-            move_action = prop.get("MoveAction", "") or "OnAddUpdate"
-            prop_type = prop.get("Type", "Map")
-            target_prop = prop.get("TargetPropertyName", "")
-            
-            transformations = prop.get("PropertiesMapTransformation", [])
-            source_prop = ""
-            details = ""
-            
-            if transformations:
-                first_transform = transformations[0]
-                source_prop = first_transform.get("SourcePropertyName", "")
-                rule_type = first_transform.get("RuleType", "")
-                
-                details = self._get_transformation_details(first_transform, rule_type)
-            
-            ws.cell(row=start_row, column=1).value = move_action
-            ws.cell(row=start_row, column=2).value = prop_type
-            ws.cell(row=start_row, column=3).value = details
-            ws.cell(row=start_row, column=4).value = source_prop
-            ws.cell(row=start_row, column=5).value = target_prop
-            start_row += 1
-        
         return start_row
     
     def _get_transformation_details(self, transform, rule_type):
@@ -413,43 +894,265 @@ class MappingSpreadsheetGenerator:
         Extrai detalhes da transformação baseado no tipo de regra.
         
         Args:
-            transform: Dicionário com dados da transformação
+            transform: Transformation
             rule_type: Tipo da regra
             
         Returns:
             String com detalhes formatados
         """
         if rule_type == "Value":
-            return f"Value: {transform.get('Value', '')}"
+            return f"Value: {transform.value}"
         elif rule_type == "Convert":
-            return f"Convert List: {transform.get('ProjectConvertListName', '')}"
+            return f"Convert List: {transform.convert_list_name}"
         elif rule_type == "Condition":
             return "Conditional Logic"
         elif rule_type == "Date":
-            return f"Date Format: {transform.get('DateFormat', '')}"
+            return f"Date Format: {transform.date_format}"
         return ""
         
-    def generate_to_bytes(self):
+    def process(self, output=None, spool=False):
         """
-        Gera a planilha e retorna como bytes.
+        Executa o pipeline completo em uma única passada pelos ObjectMaps.
+        
+        Cada ObjectMap é visitado uma vez: a aba de detalhe é criada e a linha
+        de resumo é coletada. A aba de resumo é inserida na primeira posição
+        ao final, a partir das linhas coletadas.
+        
+        Args:
+            output: Caminho ou arquivo binário onde salvar a planilha. Se
+                omitido, o conteúdo é retornado em excel_bytes (ou excel_file).
+            spool: Retorna a planilha em excel_file, um SpooledWorkbook que
+                passa para disco acima de SPOOL_MAX_SIZE, em vez de bytes
         
         Returns:
-            bytes: Conteúdo da planilha Excel
+            dict: statistics, preview (PreviewIndex das linhas de resumo), property_table
+                (PropertyTable com os PropertiesMap), field_index (FieldIndex
+                com os usos de cada campo), merge (merge_report: ObjectMaps
+                lidos e repetidos por export, ou None com um único export),
+                manual_fields (ObjectMaps com valores manuais reaplicados,
+                ver ManualFields.get_statistics, ou None sem manual_fields),
+                validation (ValidationReport, com os avisos, ou None sem validação),
+                excel_bytes, excel_file (None quando não solicitados) e
+                profile (relatório do profiler, ou None sem instrumentação)
+        
+        Raises:
+            GenerationCancelled: Se o cancel_event for sinalizado
+            ExportValidationError: Se a validação (ver validation) encontrar erros
         """
-        # Criar aba de resumo
-        self.create_movements_summary_tab()
+        profiler = self.profiler
+        movements = []
+        property_table = PropertyTable()
+        field_index = FieldIndex()
+        validation_report = None
+        try:
+            # Falha antes de qualquer aba, com todos os problemas do export
+            if self.validation is not None:
+                with profiler.stage("validation"):
+                    validation_report = self.validate()
+                validation_report.raise_for_errors()
+            
+            if self.workers and self.workers > 1:
+                self._create_object_map_tabs_parallel(movements, property_table, field_index)
+            else:
+                self._create_object_map_tabs(movements, property_table, field_index)
+        except Exception:
+            # Geração interrompida (validação, cancelamento, falta de memória...): o
+            # pacote incompleto e seu arquivo temporário são descartados
+            self.engine.discard()
+            raise
+        
+        # Criar aba de resumo (inserida como primeira aba)
+        with profiler.stage("summary_tab") as stage:
+            self.create_movements_summary_tab(movements)
+            stage.rows = SUMMARY_HEADER_ROWS + len(movements)
+        
+        if self.field_index_sheet:
+            with profiler.stage("field_index_tab"):
+                self.create_field_index_tab(field_index)
+        
+        with profiler.stage("statistics"):
+            statistics = self.build_statistics(movements, property_table)
+        
+        with profiler.stage("preview_index"):
+            preview = PreviewIndex(movements)
+        
+        result = {
+            "statistics": statistics,
+            "preview": preview,
+            "property_table": property_table,
+            "field_index": field_index,
+            "merge": self.merge_report,
+            "validation": validation_report,
+            "manual_fields": None if self.manual_fields is None else self.manual_fields.get_statistics(),
+            "excel_bytes": None,
+            "excel_file": None,
+            "profile": None,
+        }
+        
+        with profiler.stage("save"):
+            if output is not None:
+                self.engine.save(output)
+            elif spool:
+                result["excel_file"] = self.engine.save_spooled()
+            else:
+                # Uma única cópia em memória, lida do arquivo temporário
+                with self.engine.save_spooled() as excel_file:
+                    result["excel_bytes"] = excel_file.read()
+        
+        result["profile"] = profiler.report()
+        return result
+        
+    def _create_object_map_tabs(self, movements, property_table, field_index):
+        """
+        Cria as abas de detalhe em série, uma por ObjectMap.
+        
+        Args:
+            movements: Lista onde as linhas de resumo são acumuladas
+            property_table: PropertyTable onde os PropertiesMap são acumulados
+            field_index: FieldIndex onde os campos são acumulados
+        """
+        profiler = self.profiler
+        # O parse do export acontece sob demanda, durante a iteração
+        object_maps = profiler.iter_stage("parse", self.iter_object_maps())
+        movement_keys = MovementKeys()
+        for idx, obj_map in enumerate(object_maps, 1):
+            self._check_cancelled()
+            movement = self.summarize_object_map(idx, obj_map)
+            movements.append(movement)
+            property_table.add_object_map(idx, obj_map)
+            field_index.add_object_map(idx, obj_map)
+            manual_values = self._manual_detail_values(movement_keys, movement["Name"])
+            with profiler.stage("object_map", object_map=(idx, movement["Name"])):
+                if self.fragment_cache is None:
+                    self.create_object_map_tab(idx, obj_map, manual_values)
+                else:
+                    self._create_object_map_tab_cached(idx, obj_map, manual_values)
+            self._tab_written()
+        
+    def _create_object_map_tabs_parallel(self, movements, property_table, field_index):
+        """
+        Renderiza as abas de detalhe em um pool de processos.
         
-        # Criar abas para cada ObjectMap
-        objects_map = self.data.get("ObjectsMap", [])
-        for idx, obj_map in enumerate(objects_map, 1):
-            self.create_object_map_tab(idx, obj_map)
+        Cada ObjectMap vira um SheetPart em um worker; as partes são
+        incorporadas ao workbook na ordem original das abas. O número de
+        abas pendentes é limitado para manter a memória constante.
         
-        # Salvar em BytesIO
-        output = io.BytesIO()
-        self.workbook.save(output)
-        output.seek(0)
+        Args:
+            movements: Lista onde as linhas de resumo são acumuladas
+            property_table: PropertyTable onde os PropertiesMap são acumulados
+            field_index: FieldIndex onde os campos são acumulados
+        """
+        max_pending = self.workers * PARALLEL_PENDING_PER_WORKER
+        object_maps = self.profiler.iter_stage("parse", self.iter_object_maps())
+        
+        movement_keys = MovementKeys()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for idx, obj_map in enumerate(object_maps, 1):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    # Abas ainda não iniciadas nos workers são descartadas
+                    executor.shutdown(cancel_futures=True)
+                    self._check_cancelled()
+                movement = self.summarize_object_map(idx, obj_map)
+                movements.append(movement)
+                property_table.add_object_map(idx, obj_map)
+                field_index.add_object_map(idx, obj_map)
+                manual_values = self._manual_detail_values(movement_keys, movement["Name"])
+                
+                # Abas em cache entram na fila já resolvidas, preservando a ordem
+                key = None
+                part = None
+                if self.fragment_cache is not None:
+                    key = self._fragment_key(obj_map, manual_values)
+                    part = self._get_cached_part(key, idx, obj_map)
+                
+                if part is None:
+                    future = executor.submit(_render_object_map_part, idx, obj_map, manual_values)
+                else:
+                    future = Future()
+                    future.set_result(part)
+                    key = None
+                pending.append((key, future))
+                
+                if len(pending) >= max_pending:
+                    self._add_pending_part(*pending.popleft())
+            
+            while pending:
+                self._add_pending_part(*pending.popleft())
+        
+    def _add_pending_part(self, key, future):
+        """
+        Incorpora uma aba renderizada em paralelo, gravando-a no cache se for nova.
         
-        return output.getvalue()
+        As abas são medidas nos workers fora do profiler; aqui só entram a
+        espera pelo resultado e a incorporação ("parallel_merge").
+        """
+        with self.profiler.stage("parallel_merge"):
+            part = future.result()
+            if key is not None:
+                self.fragment_cache.put(key, part)
+            self.engine.add_sheet_part(part)
+        self._tab_written()
+        
+    def _manual_detail_values(self, movement_keys, name):
+        """Valores manuais da aba de detalhe do próximo ObjectMap (None sem manual_fields)."""
+        if self.manual_fields is None:
+            return None
+        return self.manual_fields.detail_values(movement_keys.next(name))
+        
+    def _fragment_key(self, obj_map, manual_values=None):
+        """Chave do fragmento de um ObjectMap (e dos seus valores manuais) no cache."""
+        content = obj_map.to_dict()
+        if manual_values:
+            content["ManualValues"] = [
+                [str(row_key), {str(col_num): value for col_num, value in values.items()}]
+                for row_key, values in manual_values.items()
+            ]
+        return fingerprint_object_map(
+            content, GENERATOR_VERSION, self.engine.writer.style_sheet.digest
+        )
+        
+    def _get_cached_part(self, key, idx, obj_map):
+        """
+        Busca a aba de um ObjectMap no cache de fragmentos.
+        
+        Returns:
+            SheetPart com o nome da aba atual, ou None
+        """
+        part = self.fragment_cache.get(key)
+        if part is not None:
+            part.title = self._object_map_tab_name(idx, obj_map)
+        return part
+        
+    def _create_object_map_tab_cached(self, idx, obj_map, manual_values=None):
+        """
+        Cria a aba de um ObjectMap reaproveitando o fragmento em cache.
+        
+        Args:
+            idx: Índice do ObjectMap
+            obj_map: ObjectMap
+            manual_values: Valores manuais da aba (ver ManualFields.detail_values)
+        """
+        with self.profiler.stage("fragment_cache"):
+            key = self._fragment_key(obj_map, manual_values)
+            part = self._get_cached_part(key, idx, obj_map)
+        if part is None:
+            buffer = self.build_object_map_sheet(idx, obj_map, manual_values)
+            with self.profiler.stage("write_sheet"):
+                part = render_sheet_part(buffer, self.engine.writer.style_sheet)
+            with self.profiler.stage("fragment_cache"):
+                self.fragment_cache.put(key, part)
+        with self.profiler.stage("write_sheet"):
+            self.engine.add_sheet_part(part)
+        
+    def generate_to_bytes(self):
+        """
+        Gera a planilha e retorna como bytes.
+        
+        Returns:
+            bytes: Conteúdo da planilha Excel
+        """
+        return self.process()["excel_bytes"]
     
     def get_statistics(self):
         """
@@ -458,20 +1161,49 @@ class MappingSpreadsheetGenerator:
         Returns:
             dict: Dicionário com estatísticas
         """
-        objects_map = self.data.get("ObjectsMap", [])
+        movements = []
+        property_table = PropertyTable()
+        for idx, obj_map in enumerate(self.iter_object_maps(), 1):
+            movements.append(self.summarize_object_map(idx, obj_map))
+            property_table.add_object_map(idx, obj_map)
+        return self.build_statistics(movements, property_table)
+    
+    def get_field_index(self):
+        """
+        Monta o índice de campos do export, sem gerar a planilha.
         
-        total_properties = sum(
-            len(obj.get("PropertiesMap", [])) 
-            for obj in objects_map
-        )
+        Returns:
+            FieldIndex: Usos de cada campo nos ObjectMaps
+        """
+        return FieldIndex.from_object_maps(self.iter_object_maps())
+    
+    @staticmethod
+    def build_statistics(movements, property_table=None):
+        """
+        Agrega as linhas de resumo em estatísticas.
         
-        total_filters = sum(
-            len(obj.get("ObjectsMapFilter", [])) 
-            for obj in objects_map
-        )
+        Args:
+            movements: Iterável de linhas de resumo (ver summarize_object_map)
+            property_table: PropertyTable opcional; acrescenta as estatísticas
+                detalhadas (ver PropertyTable.get_statistics)
+            
+        Returns:
+            dict: Dicionário com estatísticas
+        """
+        total_objectmaps = 0
+        total_properties = 0
+        total_filters = 0
         
-        return {
-            "total_objectmaps": len(objects_map),
+        for movement in movements:
+            total_objectmaps += 1
+            total_properties += movement["Properties"]
+            total_filters += movement["Filters"]
+        
+        statistics = {
+            "total_objectmaps": total_objectmaps,
             "total_properties": total_properties,
             "total_filters": total_filters
         }
+        if property_table is not None:
+            statistics.update(property_table.get_statistics())
+        return statistics
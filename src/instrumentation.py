@@ -0,0 +1,259 @@
+"""
+Instrumentação opcional das etapas de geração.
+
+Contém a classe Profiler, que registra tempo de parede, tempo de CPU, linhas
+escritas e variação de memória alocada por etapa e por ObjectMap, e o
+NULL_PROFILER, usado quando a instrumentação está desligada.
+"""
+
+import json
+import logging
+import time
+import tracemalloc
+
+logger = logging.getLogger("vertify.instrumentation")
+
+
+class _Stage:
+    """Medição de uma etapa em andamento (usada como context manager)."""
+
+    __slots__ = ("profiler", "name", "object_map", "rows", "_wall", "_cpu", "_memory")
+
+    def __init__(self, profiler, name, object_map):
+        self.profiler = profiler
+        self.name = name
+        self.object_map = object_map
+        self.rows = 0
+
+    def __enter__(self):
+        self.profiler._stack.append(self)
+        self._memory = self.profiler._traced_memory()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        allocated = self.profiler._traced_memory() - self._memory
+        self.profiler._stack.pop()
+        self.profiler._record(self, wall, cpu, allocated)
+
+
+class _NullStage:
+    """Etapa sem medição, compartilhada por todas as chamadas do NullProfiler."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self):
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return None
+
+
+class NullProfiler:
+    """Profiler desligado: as etapas não custam nada além da chamada."""
+
+    enabled = False
+
+    def __init__(self):
+        self._stage = _NullStage()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return None
+
+    def stage(self, name, object_map=None):
+        """Retorna uma etapa sem medição."""
+        return self._stage
+
+    def iter_stage(self, name, iterable):
+        """Retorna o iterável sem medição."""
+        return iterable
+
+    def report(self, limit=10):
+        """Sem instrumentação não há relatório."""
+        return None
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class Profiler:
+    """
+    Coleta métricas por etapa e por ObjectMap.
+
+    Etapas podem ser aninhadas (ex.: seções dentro de um ObjectMap); as linhas
+    de uma etapa são somadas à etapa que a contém. Os tempos das etapas
+    aninhadas também estão contidos no tempo da etapa externa.
+
+    Exemplo:
+        with Profiler(track_allocations=True) as profiler:
+            result = MappingSpreadsheetGenerator(data, profiler=profiler).process()
+        result["profile"]["stages"]["save"]["wall_seconds"]
+    """
+
+    enabled = True
+
+    def __init__(self, track_allocations=False):
+        """
+        Inicializa o profiler.
+
+        Args:
+            track_allocations: Mede a variação de memória com tracemalloc
+                (tem custo considerável; use apenas em diagnósticos)
+        """
+        self.track_allocations = track_allocations
+        self.stages = {}
+        self.object_maps = []
+        self._stack = []
+        self._started_tracing = False
+
+    def __enter__(self):
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _traced_memory(self):
+        if self.track_allocations and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def stage(self, name, object_map=None):
+        """
+        Cria a medição de uma etapa.
+
+        Args:
+            name: Nome da etapa (ex.: "save", "section:field_mapping")
+            object_map: (índice, nome) quando a etapa é a aba de um ObjectMap
+
+        Returns:
+            Context manager cujo atributo `rows` pode ser preenchido
+        """
+        return _Stage(self, name, object_map)
+
+    def iter_stage(self, name, iterable):
+        """
+        Mede o tempo gasto produzindo os itens de um iterável.
+
+        Usado para medir a leitura/parse do export, que acontece sob demanda
+        durante a iteração dos ObjectMaps.
+
+        Yields:
+            Os itens do iterável
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def _record(self, stage, wall, cpu, allocated):
+        """Agrega a medição de uma etapa encerrada."""
+        if self._stack:
+            self._stack[-1].rows += stage.rows
+
+        totals = self.stages.get(stage.name)
+        if totals is None:
+            totals = self.stages[stage.name] = {
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "rows": 0,
+                "allocated_bytes": 0,
+            }
+        totals["calls"] += 1
+        totals["wall_seconds"] += wall
+        totals["cpu_seconds"] += cpu
+        totals["rows"] += stage.rows
+        totals["allocated_bytes"] += allocated
+
+        record = {
+            "stage": stage.name,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "rows": stage.rows,
+            "allocated_bytes": allocated,
+        }
+        if stage.object_map is not None:
+            record["object_map_index"], record["object_map_name"] = stage.object_map
+            self.object_maps.append(record)
+
+        # Etapas internas são numerosas: só os ObjectMaps ficam em INFO
+        level = logging.INFO if stage.object_map is not None else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(level, json.dumps(record, default=str))
+
+    def slowest_object_maps(self, limit=10):
+        """
+        Retorna os ObjectMaps mais lentos.
+
+        Args:
+            limit: Quantidade máxima de ObjectMaps
+
+        Returns:
+            list: Registros ordenados pelo tempo de parede, do maior ao menor
+        """
+        return sorted(
+            self.object_maps, key=lambda record: record["wall_seconds"], reverse=True
+        )[:limit]
+
+    def report(self, limit=10):
+        """
+        Monta o relatório estruturado.
+
+        Args:
+            limit: Quantidade de ObjectMaps mais lentos incluídos
+
+        Returns:
+            dict: stages (totais por etapa), slowest_object_maps e object_maps
+                (quantidade de ObjectMaps medidos)
+        """
+        report = {
+            "stages": {name: dict(totals) for name, totals in self.stages.items()},
+            "slowest_object_maps": self.slowest_object_maps(limit),
+            "object_maps": len(self.object_maps),
+        }
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"profile": report["stages"]}))
+        return report
+
+
+class InstrumentedStyles:
+    """
+    Envolve ExcelStyles medindo a aplicação de estilos na etapa "styles".
+
+    Só é usado com o profiler ligado, para não pesar nas gerações normais.
+    """
+
+    def __init__(self, styles, profiler):
+        self._styles = styles
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._styles, name)
+
+    def apply_header_style(self, *args, **kwargs):
+        """Aplica o estilo de cabeçalho medindo o tempo gasto."""
+        with self._profiler.stage("styles"):
+            return self._styles.apply_header_style(*args, **kwargs)
+
+    def set_column_widths(self, *args, **kwargs):
+        """Ajusta as larguras medindo o tempo gasto."""
+        with self._profiler.stage("styles"):
+            return self._styles.set_column_widths(*args, **kwargs)
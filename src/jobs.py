@@ -0,0 +1,91 @@
+"""
+Geração de planilhas em segundo plano.
+
+Contém a classe GenerationJob: executa uma geração em uma thread, guarda o
+progresso informado a cada aba de ObjectMap e permite o cancelamento
+cooperativo (ver MappingSpreadsheetGenerator.cancel_event). A interface
+consulta o estado do job a cada atualização da página.
+"""
+
+import threading
+
+from generator import GenerationCancelled
+
+
+class GenerationJob:
+    """Geração executada em uma thread, com progresso e cancelamento."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, key, target):
+        """
+        Inicializa o job.
+
+        Args:
+            key: Identificação do trabalho (ex.: chave do upload no cache)
+            target: Função (progress, cancel_event, queued) -> resultado, que
+                repassa progress e cancel_event ao MappingSpreadsheetGenerator
+                e chama queued com a posição na fila, se houver uma (ver
+                scheduler.GenerationScheduler.run)
+        """
+        self.key = key
+        self.status = self.RUNNING
+        self.queue_position = None
+        self.tabs_written = 0
+        self.fraction = None
+        self.result = None
+        self.error = None
+        self._target = target
+        self._cancel_event = threading.Event()
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"generation-{key}", daemon=True)
+
+    @property
+    def finished(self):
+        """Indica se o job terminou (com sucesso, erro ou cancelamento)."""
+        return self._finished.is_set()
+
+    def start(self):
+        """Inicia a geração em segundo plano."""
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Pede a interrupção da geração antes da próxima aba."""
+        self._cancel_event.set()
+
+    def wait(self, timeout=None):
+        """
+        Aguarda o fim do job.
+
+        Returns:
+            bool: True se o job terminou dentro do prazo
+        """
+        return self._finished.wait(timeout)
+
+    def _queued(self, position):
+        """Registra a posição do job na fila (None ao sair dela)."""
+        self.queue_position = position
+        self.status = self.QUEUED if position is not None else self.RUNNING
+
+    def _progress(self, tabs_written, fraction):
+        """Registra o progresso informado pelo gerador."""
+        self.tabs_written = tabs_written
+        self.fraction = fraction
+
+    def _run(self):
+        """Executa a geração e registra o desfecho."""
+        try:
+            self.result = self._target(self._progress, self._cancel_event, self._queued)
+            self.status = self.DONE
+        except GenerationCancelled:
+            self.status = self.CANCELLED
+        except Exception as e:
+            self.error = e
+            self.status = self.FAILED
+        finally:
+            self._finished.set()
@@ -0,0 +1,282 @@
+"""
+Campos preenchidos manualmente em uma planilha gerada anteriormente.
+
+Contém a classe ManualFields: lê a planilha anterior no modo read-only do
+openpyxl, linha a linha e sem materializar o workbook, e guarda apenas os
+valores que diferem do que o gerador escreve (Trigger Type, Sandbox,
+Credentials, Notes, exemplos de request/response, colunas Digibee de Merge e
+Filter...). Os valores são indexados pelo nome do ObjectMap e pela chave da
+linha, e o MappingSpreadsheetGenerator os reaplica ao gerar a nova planilha.
+"""
+
+from openpyxl import load_workbook
+
+SUMMARY_SHEET = "Movements to migrate"
+
+# Primeira linha de movimentos na aba de resumo (ver SUMMARY_HEADER_ROWS)
+SUMMARY_FIRST_ROW = 7
+
+# Colunas da aba de resumo com o ID e o nome do movimento
+SUMMARY_ID_COLUMN = 1
+SUMMARY_NAME_COLUMN = 5
+
+# Colunas preenchidas à mão na aba de resumo, com o valor escrito pelo gerador
+SUMMARY_PLACEHOLDERS = {
+    2: "Collect & Move? / Collect?",   # Trigger Type
+    3: "at 00:00 AM",                  # Interval frequence
+    4: "every ?",                      # Interval days
+    7: "TRUE/FALSE",                   # Sandbox (origem)
+    8: "TRUE/FALSE",                   # Credentials (origem)
+    10: "TRUE/FALSE",                  # Sandbox (destino)
+    11: "TRUE/FALSE",                  # Credentials (destino)
+    12: "TRUE/FALSE",                  # Customization
+    13: "",                            # Notes
+    14: "",                            # No
+    15: "",                            # Email Alert
+    16: "",                            # Email Every
+}
+
+# Chaves das linhas de sistema da seção API Request
+API_SOURCE_ROW = "api:source"
+API_TARGET_ROW = "api:target"
+
+# Colunas preenchidas à mão nas linhas de sistema da seção API Request
+# (type, path/connection string, request example, response example, notes)
+API_PLACEHOLDERS = {2: "REST", 3: "", 4: "", 5: "", 6: ""}
+
+# Chave da linha de regras da seção Merge
+MERGE_ROW = "merge"
+
+# Colunas Digibee da linha de regras da seção Merge (D = rules)
+MERGE_PLACEHOLDERS = {4: "N/A", 5: "", 6: ""}
+
+# Chave da linha "No filter" da seção Filter (ObjectMap sem filtros)
+NO_FILTER_ROW = "filter:none"
+
+# Colunas Digibee das linhas da seção Filter (path/table/alias, field, query relation)
+FILTER_PLACEHOLDERS = {4: "", 5: "", 6: ""}
+FILTER_SOURCE_COLUMN = 1
+FILTER_OPERATOR_COLUMN = 2
+
+# Coluna "notes" da seção Field Mapping e colunas que identificam a linha
+FIELD_NOTES_COLUMN = 6
+FIELD_SOURCE_COLUMN = 4
+FIELD_TARGET_COLUMN = 5
+
+# Rótulos da coluna A que identificam as seções e seus cabeçalhos
+_API_REQUEST_TITLE = "API Request"
+_API_REQUEST_HEADER = "system"
+_MERGE_TITLE = "Merge"
+_MERGE_HEADER = "rules"
+_FILTER_TITLE = "Filter"
+_FILTER_HEADER = "path.field"
+_NO_FILTER = "No filter"
+_FIELD_MAPPING_TITLE = "Field Mapping"
+_FIELD_MAPPING_HEADER = "move"
+
+
+def field_row_key(target_property_name, source_property_name):
+    """Chave de uma linha da seção Field Mapping (campo de destino e de origem)."""
+    return ("field", target_property_name or "", source_property_name or "")
+
+
+def filter_row_key(source_property_name, filter_operator):
+    """Chave de uma linha da seção Filter (campo de origem e operador)."""
+    return ("filter", source_property_name or "", filter_operator or "")
+
+
+def _manual_values(row, placeholders):
+    """Valores de uma linha que diferem do que o gerador escreve."""
+    values = {}
+    for column, placeholder in placeholders.items():
+        value = row[column - 1] if column <= len(row) else None
+        if value is not None and value != placeholder:
+            values[column] = value
+    return values
+
+
+class MovementKeys:
+    """
+    Chaves dos ObjectMaps, na ordem em que aparecem.
+
+    A chave é (nome, ocorrência): ObjectMaps com o mesmo nome são
+    distinguidos pela ordem, tanto na planilha anterior quanto na nova.
+    """
+
+    def __init__(self):
+        self._seen = {}
+
+    def next(self, name):
+        """Retorna a chave da próxima ocorrência de um nome."""
+        occurrence = self._seen.get(name, 0)
+        self._seen[name] = occurrence + 1
+        return (name, occurrence)
+
+
+class ManualFields:
+    """
+    Valores preenchidos à mão, por ObjectMap e por linha.
+
+    summary guarda {chave do ObjectMap: {coluna: valor}} da aba de resumo e
+    details guarda {chave do ObjectMap: {chave da linha: {coluna: valor}}}
+    das abas de detalhe. ObjectMaps sem valores manuais não ocupam memória.
+    """
+
+    def __init__(self, summary=None, details=None):
+        self.summary = summary or {}
+        self.details = details or {}
+        self._used = set()
+
+    def __len__(self):
+        """Número de ObjectMaps com algum valor manual."""
+        return len(self.summary.keys() | self.details.keys())
+
+    @classmethod
+    def load(cls, source):
+        """
+        Lê os valores manuais de uma planilha gerada anteriormente.
+
+        A planilha é percorrida uma vez, em modo read-only: a aba de resumo
+        associa o ID de cada aba de detalhe ao nome do ObjectMap, e de cada
+        aba de detalhe só as linhas de sistema da API Request, as colunas
+        Digibee de Merge e Filter e a coluna notes da Field Mapping são
+        examinadas.
+
+        Args:
+            source: Caminho ou arquivo binário do XLSX
+
+        Returns:
+            ManualFields
+
+        Raises:
+            ValueError: Se a planilha não tiver a aba "Movements to migrate"
+        """
+        workbook = load_workbook(source, read_only=True, data_only=True)
+        try:
+            if SUMMARY_SHEET not in workbook.sheetnames:
+                raise ValueError(f"Previous spreadsheet has no '{SUMMARY_SHEET}' sheet")
+
+            summary = {}
+            keys_by_id = {}
+            movement_keys = MovementKeys()
+            rows = workbook[SUMMARY_SHEET].iter_rows(min_row=SUMMARY_FIRST_ROW, values_only=True)
+            for row in rows:
+                if len(row) < SUMMARY_NAME_COLUMN or row[SUMMARY_ID_COLUMN - 1] is None:
+                    continue
+                name = row[SUMMARY_NAME_COLUMN - 1]
+                key = movement_keys.next("N/A" if name is None else name)
+                keys_by_id[row[SUMMARY_ID_COLUMN - 1]] = key
+                values = _manual_values(row, SUMMARY_PLACEHOLDERS)
+                if values:
+                    summary[key] = values
+
+            details = {}
+            for title in workbook.sheetnames:
+                idx, separator, _ = title.partition(" - ")
+                if not separator or not idx.isdigit() or int(idx) not in keys_by_id:
+                    continue
+                rows = cls._load_detail(workbook[title])
+                if rows:
+                    details[keys_by_id[int(idx)]] = rows
+        finally:
+            workbook.close()
+
+        return cls(summary, details)
+
+    @staticmethod
+    def _load_detail(ws):
+        """
+        Lê os valores manuais de uma aba de detalhe.
+
+        Returns:
+            dict: {chave da linha: {coluna: valor}}
+        """
+        rows = {}
+        section = None
+        api_rows = iter((API_SOURCE_ROW, API_TARGET_ROW))
+        titles = (_API_REQUEST_TITLE, _MERGE_TITLE, _FILTER_TITLE, _FIELD_MAPPING_TITLE)
+        for row in ws.iter_rows(max_col=FIELD_NOTES_COLUMN, values_only=True):
+            label = row[0] if row else None
+            if label in titles:
+                section = label
+                continue
+
+            if section == _API_REQUEST_TITLE:
+                if label == _API_REQUEST_HEADER:
+                    section = "api_rows"
+            elif section == "api_rows":
+                row_key = next(api_rows, None)
+                if row_key is None:
+                    section = None
+                    continue
+                values = _manual_values(row, API_PLACEHOLDERS)
+                if values:
+                    rows[row_key] = values
+            elif section == _MERGE_TITLE:
+                if label == _MERGE_HEADER:
+                    section = "merge_row"
+            elif section == "merge_row":
+                section = None
+                values = _manual_values(row, MERGE_PLACEHOLDERS)
+                if values:
+                    rows[MERGE_ROW] = values
+            elif section == _FILTER_TITLE:
+                if label == _FILTER_HEADER:
+                    section = "filter_rows"
+            elif section == "filter_rows":
+                # Linhas em branco até a Field Mapping não têm valores
+                values = _manual_values(row, FILTER_PLACEHOLDERS)
+                if not values:
+                    continue
+                operator = row[FILTER_OPERATOR_COLUMN - 1] if len(row) >= FILTER_OPERATOR_COLUMN else None
+                if label == _NO_FILTER and operator is None:
+                    row_key = NO_FILTER_ROW
+                else:
+                    row_key = filter_row_key(row[FILTER_SOURCE_COLUMN - 1], operator)
+                rows.setdefault(row_key, values)
+            elif section == _FIELD_MAPPING_TITLE:
+                if label == _FIELD_MAPPING_HEADER:
+                    section = "field_rows"
+            elif section == "field_rows":
+                notes = row[FIELD_NOTES_COLUMN - 1] if len(row) >= FIELD_NOTES_COLUMN else None
+                if notes is None or notes == "":
+                    continue
+                row_key = field_row_key(row[FIELD_TARGET_COLUMN - 1], row[FIELD_SOURCE_COLUMN - 1])
+                rows.setdefault(row_key, {FIELD_NOTES_COLUMN: notes})
+        return rows
+
+    def summary_values(self, key):
+        """
+        Valores manuais da linha de resumo de um ObjectMap.
+
+        Returns:
+            dict: {coluna: valor} (vazio se não houver)
+        """
+        values = self.summary.get(key)
+        if values is None:
+            return {}
+        self._used.add(key)
+        return values
+
+    def detail_values(self, key):
+        """
+        Valores manuais da aba de detalhe de um ObjectMap.
+
+        Returns:
+            dict ou None: {chave da linha: {coluna: valor}}
+        """
+        values = self.details.get(key)
+        if values is not None:
+            self._used.add(key)
+        return values
+
+    def get_statistics(self):
+        """
+        Retorna quantos ObjectMaps tiveram os valores manuais reaplicados.
+
+        Returns:
+            dict: preserved (ObjectMaps encontrados na nova geração) e
+                unmatched (ObjectMaps da planilha anterior sem correspondente,
+                ex.: renomeados ou removidos do export)
+        """
+        return {"preserved": len(self._used), "unmatched": len(self) - len(self._used)}
@@ -0,0 +1,239 @@
+"""
+Modelo compacto dos ObjectMaps do export Vertify.
+
+Converte os dicionários do JSON em registros com __slots__ que guardam apenas
+os campos usados pelo gerador. Strings que se repetem em todo o export (nomes
+de sistemas, MoveAction, RuleType, operadores...) são internadas, então cada
+valor distinto existe uma única vez na memória.
+"""
+
+import hashlib
+import json
+import sys
+
+
+def _intern(value):
+    """Interna strings; outros valores são retornados sem alteração."""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class Transformation:
+    """Primeira PropertiesMapTransformation de um PropertiesMap."""
+
+    __slots__ = ("source_property_name", "rule_type", "value", "convert_list_name", "date_format")
+
+    def __init__(self, source_property_name="", rule_type="", value="",
+                 convert_list_name="", date_format=""):
+        self.source_property_name = source_property_name
+        self.rule_type = rule_type
+        self.value = value
+        self.convert_list_name = convert_list_name
+        self.date_format = date_format
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria o registro a partir do dicionário do JSON."""
+        return cls(
+            data.get("SourcePropertyName", ""),
+            _intern(data.get("RuleType", "")),
+            data.get("Value", ""),
+            _intern(data.get("ProjectConvertListName", "")),
+            _intern(data.get("DateFormat", "")),
+        )
+
+    def to_dict(self):
+        """Retorna os campos mantidos com os nomes do JSON."""
+        return {
+            "SourcePropertyName": self.source_property_name,
+            "RuleType": self.rule_type,
+            "Value": self.value,
+            "ProjectConvertListName": self.convert_list_name,
+            "DateFormat": self.date_format,
+        }
+
+
+class PropertyMapping:
+    """Entrada de PropertiesMap (um campo mapeado)."""
+
+    __slots__ = ("move_action", "type", "target_property_name", "transformation")
+
+    def __init__(self, move_action="", type="Map", target_property_name="", transformation=None):
+        self.move_action = move_action
+        self.type = type
+        self.target_property_name = target_property_name
+        self.transformation = transformation
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Cria o registro a partir do dicionário do JSON.
+
+        Só a primeira transformação é mantida: é a única exibida na planilha.
+        """
+        transformations = data.get("PropertiesMapTransformation", [])
+        return cls(
+            _intern(data.get("MoveAction", "")),
+            _intern(data.get("Type", "Map")),
+            data.get("TargetPropertyName", ""),
+            Transformation.from_dict(transformations[0]) if transformations else None,
+        )
+
+    def to_dict(self):
+        """Retorna os campos mantidos com os nomes do JSON."""
+        return {
+            "MoveAction": self.move_action,
+            "Type": self.type,
+            "TargetPropertyName": self.target_property_name,
+            "PropertiesMapTransformation": (
+                [self.transformation.to_dict()] if self.transformation is not None else []
+            ),
+        }
+
+
+class ObjectMapFilter:
+    """Entrada de ObjectsMapFilter."""
+
+    __slots__ = ("source_property_name", "filter_operator", "value")
+
+    def __init__(self, source_property_name="", filter_operator="", value=""):
+        self.source_property_name = source_property_name
+        self.filter_operator = filter_operator
+        self.value = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria o registro a partir do dicionário do JSON."""
+        return cls(
+            data.get("SourcePropertyName", ""),
+            _intern(data.get("FilterOperator", "")),
+            data.get("Value", ""),
+        )
+
+    def to_dict(self):
+        """Retorna os campos mantidos com os nomes do JSON."""
+        return {
+            "SourcePropertyName": self.source_property_name,
+            "FilterOperator": self.filter_operator,
+            "Value": self.value,
+        }
+
+
+class MergeField:
+    """Entrada de ObjectsMapMergeField."""
+
+    __slots__ = ("merge_field", "source_property_name", "target_property_name")
+
+    def __init__(self, merge_field="", source_property_name="", target_property_name=""):
+        self.merge_field = merge_field
+        self.source_property_name = source_property_name
+        self.target_property_name = target_property_name
+
+    @classmethod
+    def from_dict(cls, data):
+        """Cria o registro a partir do dicionário do JSON."""
+        return cls(
+            _intern(data.get("MergeField", "")),
+            data.get("SourcePropertyName", ""),
+            data.get("TargetPropertyName", ""),
+        )
+
+    def to_dict(self):
+        """Retorna os campos mantidos com os nomes do JSON."""
+        return {
+            "MergeField": self.merge_field,
+            "SourcePropertyName": self.source_property_name,
+            "TargetPropertyName": self.target_property_name,
+        }
+
+
+class ObjectMap:
+    """
+    ObjectMap do export (um movimento entre dois sistemas).
+
+    Name, SourceSystemName e TargetSystemName ausentes ficam como None; cada
+    uso aplica o seu valor padrão (ex.: "N/A" no resumo).
+    """
+
+    __slots__ = (
+        "name", "source_system_name", "target_system_name",
+        "merge_record", "merge_fields", "filters", "properties",
+    )
+
+    def __init__(self, name=None, source_system_name=None, target_system_name=None,
+                 merge_record=False, merge_fields=(), filters=(), properties=()):
+        self.name = name
+        self.source_system_name = source_system_name
+        self.target_system_name = target_system_name
+        self.merge_record = merge_record
+        self.merge_fields = merge_fields
+        self.filters = filters
+        self.properties = properties
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Cria o registro a partir do dicionário do JSON.
+
+        Args:
+            data: Dicionário de um item de ObjectsMap
+
+        Returns:
+            ObjectMap com os campos usados pelo gerador
+        """
+        return cls(
+            data.get("Name"),
+            _intern(data.get("SourceSystemName")),
+            _intern(data.get("TargetSystemName")),
+            data.get("MergeRecord", False),
+            # "or": listas null no JSON equivalem a listas vazias
+            tuple(MergeField.from_dict(item) for item in data.get("ObjectsMapMergeField") or ()),
+            tuple(ObjectMapFilter.from_dict(item) for item in data.get("ObjectsMapFilter") or ()),
+            tuple(PropertyMapping.from_dict(item) for item in data.get("PropertiesMap") or ()),
+        )
+
+    def to_dict(self):
+        """
+        Retorna os campos mantidos com os nomes do JSON.
+
+        É a forma canônica usada na impressão digital do cache de fragmentos:
+        campos ignorados pelo gerador não invalidam o cache.
+        """
+        return {
+            "Name": self.name,
+            "SourceSystemName": self.source_system_name,
+            "TargetSystemName": self.target_system_name,
+            "MergeRecord": self.merge_record,
+            "ObjectsMapMergeField": [item.to_dict() for item in self.merge_fields],
+            "ObjectsMapFilter": [item.to_dict() for item in self.filters],
+            "PropertiesMap": [item.to_dict() for item in self.properties],
+        }
+
+    def fingerprint(self):
+        """
+        Impressão digital do conteúdo usado pelo gerador.
+
+        ObjectMaps com a mesma impressão digital geram abas idênticas.
+
+        Returns:
+            bytes: Digest SHA-256 da forma canônica (ver to_dict)
+        """
+        canonical = json.dumps(
+            self.to_dict(), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+
+def parse_object_maps(object_maps):
+    """
+    Converte os itens de ObjectsMap em registros, sob demanda.
+
+    Args:
+        object_maps: Iterável de dicionários (lista do JSON ou VertifyExportReader)
+
+    Yields:
+        ObjectMap
+    """
+    for data in object_maps:
+        yield ObjectMap.from_dict(data)
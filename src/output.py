@@ -0,0 +1,122 @@
+"""
+Saída da planilha gerada em arquivo temporário.
+
+Contém a classe SpooledWorkbook: o XLSX fica em memória enquanto é pequeno e
+passa para um arquivo temporário em disco acima de um limite, evitando cópias
+inteiras do conteúdo em BytesIO. O conteúdo pode ser lido em blocos para
+envio em streaming.
+"""
+
+import shutil
+import tempfile
+import threading
+
+from xlsx_writer import SPOOL_MAX_SIZE
+
+# Tamanho dos blocos lidos no envio em streaming
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+class SpooledWorkbook:
+    """
+    Planilha gerada, guardada em um SpooledTemporaryFile.
+
+    É segura para leitura entre threads: cada leitura posiciona o arquivo
+    sob um lock, então várias sessões podem baixar o mesmo resultado. O
+    arquivo temporário é removido em close() ou quando o objeto é coletado.
+    """
+
+    def __init__(self, spool=None, max_size=SPOOL_MAX_SIZE):
+        """
+        Inicializa a saída.
+
+        Args:
+            spool: SpooledTemporaryFile já preenchido (None para criar um vazio)
+            max_size: Limite em bytes para manter o conteúdo em memória
+        """
+        self.max_size = max_size
+        self.file = spool if spool is not None else tempfile.SpooledTemporaryFile(max_size=max_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path, max_size=SPOOL_MAX_SIZE):
+        """
+        Copia uma planilha gravada em disco para um novo SpooledWorkbook.
+
+        Args:
+            path: Caminho do XLSX
+            max_size: Limite em bytes para manter o conteúdo em memória
+
+        Returns:
+            SpooledWorkbook
+        """
+        workbook = cls(max_size=max_size)
+        with open(path, "rb") as file:
+            shutil.copyfileobj(file, workbook.file)
+        return workbook
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @property
+    def size(self):
+        """Tamanho do conteúdo em bytes."""
+        with self._lock:
+            self.file.seek(0, 2)
+            return self.file.tell()
+
+    @property
+    def on_disk(self):
+        """Indica se o conteúdo já passou para o disco."""
+        return self.size > self.max_size
+
+    def iter_chunks(self, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Lê o conteúdo em blocos, para envio em streaming.
+
+        Yields:
+            bytes: Blocos de até chunk_size bytes
+        """
+        offset = 0
+        while True:
+            with self._lock:
+                self.file.seek(offset)
+                chunk = self.file.read(chunk_size)
+            if not chunk:
+                return
+            offset += len(chunk)
+            yield chunk
+
+    def read(self):
+        """
+        Retorna o conteúdo inteiro.
+
+        Returns:
+            bytes: Conteúdo da planilha
+        """
+        with self._lock:
+            self.file.seek(0)
+            return self.file.read()
+
+    def save(self, fileobj):
+        """
+        Copia o conteúdo para um caminho ou arquivo binário.
+
+        Args:
+            fileobj: Caminho ou arquivo binário de destino
+        """
+        if isinstance(fileobj, (str, bytes)) or hasattr(fileobj, "__fspath__"):
+            with open(fileobj, "wb") as output:
+                self.save(output)
+            return
+
+        with self._lock:
+            self.file.seek(0)
+            shutil.copyfileobj(self.file, fileobj)
+
+    def close(self):
+        """Descarta o conteúdo (remove o arquivo temporário, se houver)."""
+        self.file.close()
@@ -0,0 +1,177 @@
+"""
+Índice do preview de ObjectMaps.
+
+Contém a classe PreviewIndex: as linhas de resumo ficam em colunas, com um
+índice de trigramas sobre Name, Source e Target montado uma vez na geração.
+Busca, ordenação e paginação acontecem no servidor, e só as linhas da página
+visível são materializadas como dicionários.
+"""
+
+from array import array
+
+import numpy as np
+
+# Colunas do preview, na ordem exibida
+PREVIEW_COLUMNS = ("ID", "Name", "Source", "Target", "Properties", "Filters")
+
+# Colunas cobertas pela busca
+SEARCH_COLUMNS = ("Name", "Source", "Target")
+
+# Colunas numéricas, guardadas em arrays de inteiros
+_NUMERIC_COLUMNS = ("ID", "Properties", "Filters")
+
+# Tamanho dos n-gramas do índice; termos menores são buscados por varredura
+NGRAM_SIZE = 3
+
+# Separa as colunas no texto de busca; nenhum termo digitado o contém
+_FIELD_SEPARATOR = "\0"
+
+
+def _ngrams(text):
+    """Retorna os n-gramas distintos de um texto."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class PreviewIndex:
+    """
+    Linhas de resumo dos ObjectMaps, indexadas para busca e ordenação.
+
+    As posições usadas em search, sort e rows são as das linhas na ordem do
+    export (posição = ID - 1).
+    """
+
+    def __init__(self, rows):
+        """
+        Monta as colunas e o índice de busca.
+
+        Args:
+            rows: Linhas de resumo (ver MappingSpreadsheetGenerator.summarize_object_map)
+        """
+        self.columns = {
+            column: array("i", (row[column] for row in rows)) if column in _NUMERIC_COLUMNS
+            else [row[column] for row in rows]
+            for column in PREVIEW_COLUMNS
+        }
+        self._search_text = [
+            _FIELD_SEPARATOR.join(str(row[column]).casefold() for column in SEARCH_COLUMNS)
+            for row in rows
+        ]
+
+        postings = {}
+        for position, text in enumerate(self._search_text):
+            for ngram in _ngrams(text):
+                posting = postings.get(ngram)
+                if posting is None:
+                    posting = postings[ngram] = array("i")
+                posting.append(position)
+        self._postings = {
+            ngram: np.array(posting, dtype=np.int32) for ngram, posting in postings.items()
+        }
+        self._orders = {}
+
+    def __len__(self):
+        return len(self._search_text)
+
+    def search(self, query):
+        """
+        Busca as linhas que contêm todos os termos da consulta.
+
+        Cada termo (separado por espaços, sem diferenciar maiúsculas) deve
+        aparecer em Name, Source ou Target. Os candidatos vêm da interseção
+        das listas de n-gramas e são confirmados no texto da linha.
+
+        Args:
+            query: Texto da busca (vazio retorna todas as linhas)
+
+        Returns:
+            np.ndarray: Posições das linhas encontradas, em ordem crescente
+        """
+        terms = query.casefold().split()
+        if not terms:
+            return np.arange(len(self), dtype=np.int32)
+
+        candidates = None
+        for term in terms:
+            for ngram in _ngrams(term):
+                posting = self._postings.get(ngram)
+                if posting is None:
+                    return np.empty(0, dtype=np.int32)
+                candidates = posting if candidates is None else np.intersect1d(
+                    candidates, posting, assume_unique=True
+                )
+        if candidates is None:
+            candidates = np.arange(len(self), dtype=np.int32)
+
+        search_text = self._search_text
+        return np.array(
+            [
+                position for position in candidates.tolist()
+                if all(term in search_text[position] for term in terms)
+            ],
+            dtype=np.int32,
+        )
+
+    def _order(self, column):
+        """Posições de todas as linhas ordenadas por uma coluna (calculado uma vez)."""
+        order = self._orders.get(column)
+        if order is None:
+            values = self.columns[column]
+            if column in _NUMERIC_COLUMNS:
+                order = np.argsort(np.array(values, dtype=np.int64), kind="stable")
+            else:
+                order = np.array(
+                    sorted(range(len(values)), key=lambda position: str(values[position]).casefold()),
+                    dtype=np.int64,
+                )
+            self._orders[column] = order
+        return order
+
+    def sort(self, positions, column, descending=False):
+        """
+        Ordena posições por uma coluna.
+
+        Args:
+            positions: Posições retornadas por search
+            column: Coluna de PREVIEW_COLUMNS
+            descending: Ordem decrescente
+
+        Returns:
+            np.ndarray: As posições na ordem pedida
+        """
+        order = self._order(column)
+        if len(positions) < len(self):
+            selected = np.zeros(len(self), dtype=bool)
+            selected[positions] = True
+            order = order[selected[order]]
+        return order[::-1] if descending else order
+
+    def rows(self, positions):
+        """
+        Materializa as linhas de resumo de algumas posições.
+
+        Returns:
+            list: Dicionários com as colunas de PREVIEW_COLUMNS
+        """
+        columns = self.columns
+        return [
+            {column: columns[column][position] for column in PREVIEW_COLUMNS}
+            for position in positions
+        ]
+
+    def page(self, query="", sort_by="ID", descending=False, page=1, page_size=50):
+        """
+        Busca, ordena e retorna uma página de linhas.
+
+        Args:
+            query: Texto da busca (ver search)
+            sort_by: Coluna de ordenação
+            descending: Ordem decrescente
+            page: Número da página (a partir de 1)
+            page_size: Linhas por página
+
+        Returns:
+            tuple: (linhas da página, total de linhas encontradas)
+        """
+        positions = self.sort(self.search(query), sort_by, descending)
+        start = (page - 1) * page_size
+        return self.rows(positions[start:start + page_size].tolist()), len(positions)
@@ -0,0 +1,350 @@
+"""
+Leitura incremental de JSONs de exportação Vertify.
+
+Contém a classe VertifyExportReader, que percorre o documento em blocos e
+entrega um ObjectMap por vez, sem nunca materializar o JSON inteiro (nem o
+texto bruto nem a árvore de dicionários) em memória, e a classe
+MultiExportReader, que encadeia vários exports em uma única sequência.
+"""
+
+import codecs
+import json
+import mmap
+import os
+
+OBJECTS_MAP_KEY = "ObjectsMap"
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+class ExportDecodeError(json.JSONDecodeError):
+    """
+    JSONDecodeError com a posição no documento inteiro.
+
+    O leitor só mantém em memória o trecho pendente do documento; a linha,
+    a coluna e o deslocamento são calculados pelo _ChunkScanner, e o erro
+    atravessa processos (pool do agendador) sem carregar o trecho.
+    """
+
+    def __init__(self, msg, pos, lineno, colno):
+        ValueError.__init__(self, f"{msg}: line {lineno} column {colno} (char {pos})")
+        self.msg = msg
+        self.doc = ""
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+    def __reduce__(self):
+        return (type(self), (self.msg, self.pos, self.lineno, self.colno))
+
+
+class _ChunkScanner:
+    """Cursor sobre um fluxo de blocos de texto JSON."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._decoder = json.JSONDecoder()
+        self._eof = False
+        self.buffer = ""
+        self.pos = 0
+        # Texto já descartado do buffer: caracteres, quebras de linha e
+        # caracteres após a última quebra (para as posições dos erros)
+        self._consumed = 0
+        self._consumed_lines = 0
+        self._consumed_column = 0
+
+    def error(self, msg, pos):
+        """
+        Cria o erro de uma posição do buffer, com a posição no documento.
+
+        Returns:
+            ExportDecodeError
+        """
+        before = self.buffer[:pos]
+        newlines = before.count("\n")
+        if newlines:
+            colno = pos - before.rfind("\n")
+        else:
+            colno = self._consumed_column + pos + 1
+        return ExportDecodeError(msg, self._consumed + pos, self._consumed_lines + newlines + 1, colno)
+
+    def _fill(self, min_chars=1):
+        """
+        Lê blocos até acrescentar pelo menos `min_chars` caracteres.
+
+        Returns:
+            bool: False se o fluxo terminou sem novos dados
+        """
+        consumed = self.buffer[:self.pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._consumed_column = len(consumed) - consumed.rfind("\n") - 1
+        else:
+            self._consumed_column += len(consumed)
+        self._consumed += len(consumed)
+        self._consumed_lines += newlines
+
+        parts = [self.buffer[self.pos:]]
+        added = 0
+        while added < min_chars:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            parts.append(chunk)
+            added += len(chunk)
+
+        self.buffer = "".join(parts)
+        self.pos = 0
+        return added > 0
+
+    def peek(self):
+        """Pula espaços em branco e retorna o próximo caractere (None no fim)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, chars):
+        """Consome um dos caracteres esperados e o retorna."""
+        char = self.peek()
+        if char is None or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise self.error(f"Expecting {expected}", self.pos)
+        self.pos += 1
+        return char
+
+    def expect_end(self):
+        """Confere que só restam espaços em branco após o valor raiz (como o json.load)."""
+        if self.peek() is not None:
+            raise self.error("Extra data", self.pos)
+
+    def decode_value(self):
+        """
+        Decodifica o próximo valor JSON completo.
+
+        Um valor que termina exatamente no fim do buffer (ex.: um número) pode
+        continuar no próximo bloco, então só é aceito após o fim do fluxo.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # A posição é convertida antes de o _fill deslocar o buffer
+                error = self.error(e.msg, e.pos)
+                # Dobra o buffer pendente para evitar reprocessamento quadrático
+                if self._fill(max(len(self.buffer) - self.pos, DEFAULT_CHUNK_SIZE)):
+                    continue
+                raise error from None
+            if end < len(self.buffer) or self._eof or not self._fill():
+                self.pos = end
+                return value
+
+
+class VertifyExportReader:
+    """
+    Leitor incremental de exports Vertify.
+
+    Aceita um caminho em disco (lido via mmap) ou um arquivo já aberto, em
+    modo binário ou texto, como o UploadedFile do Streamlit. Cada iteração
+    relê a fonte desde o início, portanto arquivos precisam suportar `seek`
+    para serem percorridos mais de uma vez.
+    """
+
+    def __init__(self, source, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Inicializa o leitor.
+
+        Args:
+            source: Caminho do arquivo (str/PathLike) ou objeto arquivo
+            chunk_size: Tamanho dos blocos lidos da fonte
+        """
+        self.source = source
+        self.chunk_size = chunk_size
+        self.size = None
+        self.bytes_read = 0
+
+    @property
+    def fraction_read(self):
+        """
+        Fração da fonte já lida na iteração em andamento.
+
+        Returns:
+            float ou None: Entre 0.0 e 1.0 (None se o tamanho é desconhecido)
+        """
+        if not self.size:
+            return None
+        return min(self.bytes_read / self.size, 1.0)
+
+    def __iter__(self):
+        """
+        Percorre os ObjectMaps do export, um de cada vez.
+
+        Yields:
+            dict: ObjectMap
+
+        Raises:
+            json.JSONDecodeError: Se o documento for inválido
+        """
+        self.bytes_read = 0
+        if isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, "rb") as file:
+                self.size = os.fstat(file.fileno()).st_size
+                if self.size == 0:
+                    yield from self._iter_object_maps(iter(()))
+                    return
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    yield from self._iter_object_maps(self._iter_mmap_chunks(mapped))
+        else:
+            if hasattr(self.source, "seek"):
+                self.size = self.source.seek(0, os.SEEK_END)
+                self.source.seek(0)
+            yield from self._iter_object_maps(self._iter_file_chunks(self.source))
+
+    def _iter_mmap_chunks(self, mapped):
+        """Decodifica um arquivo mapeado em memória em blocos de texto."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        for offset in range(0, len(mapped), self.chunk_size):
+            chunk = mapped[offset:offset + self.chunk_size]
+            self.bytes_read += len(chunk)
+            yield decoder.decode(chunk)
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def _iter_file_chunks(self, file):
+        """Lê um arquivo (binário ou texto) em blocos de texto."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        while True:
+            chunk = file.read(self.chunk_size)
+            if not chunk:
+                break
+            self.bytes_read += len(chunk)
+            yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def _iter_object_maps(self, chunks):
+        """Percorre o objeto raiz e entrega os itens da chave ObjectsMap."""
+        scanner = _ChunkScanner(chunks)
+
+        scanner.expect("{")
+        if scanner.peek() == "}":
+            scanner.pos += 1
+            scanner.expect_end()
+            return
+
+        while True:
+            key = scanner.decode_value()
+            scanner.expect(":")
+
+            if key == OBJECTS_MAP_KEY and scanner.peek() == "[":
+                yield from self._iter_array(scanner)
+            else:
+                # Demais chaves do export não são usadas pelo gerador
+                scanner.decode_value()
+
+            if scanner.expect(",}") == "}":
+                # Um arquivo truncado e outro concatenado não passam despercebidos
+                scanner.expect_end()
+                return
+
+    @staticmethod
+    def _iter_array(scanner):
+        """Entrega os elementos de um array JSON, um de cada vez."""
+        scanner.expect("[")
+        if scanner.peek() == "]":
+            scanner.pos += 1
+            return
+
+        while True:
+            yield scanner.decode_value()
+            if scanner.expect(",]") == "]":
+                return
+
+
+class MultiExportReader:
+    """
+    Leitor de vários exports Vertify, percorridos em sequência.
+
+    Entrega os ObjectMaps de todos os exports, na ordem das fontes, como se
+    fossem um único ObjectsMap. A remoção de ObjectMaps repetidos entre os
+    exports fica com o gerador (ver MappingSpreadsheetGenerator.iter_object_maps).
+    """
+
+    def __init__(self, sources, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Inicializa o leitor.
+
+        Args:
+            sources: Caminhos, arquivos ou VertifyExportReaders dos exports
+            chunk_size: Tamanho dos blocos lidos de cada fonte
+        """
+        self.readers = [
+            source if isinstance(source, VertifyExportReader)
+            else VertifyExportReader(source, chunk_size)
+            for source in sources
+        ]
+        self.export_index = None
+
+    def __len__(self):
+        return len(self.readers)
+
+    @property
+    def size(self):
+        """Tamanho somado das fontes (None se algum é desconhecido)."""
+        sizes = [reader.size for reader in self.readers]
+        if None in sizes:
+            return None
+        return sum(sizes)
+
+    @property
+    def bytes_read(self):
+        """Bytes lidos de todas as fontes na iteração em andamento."""
+        return sum(reader.bytes_read for reader in self.readers)
+
+    @property
+    def fraction_read(self):
+        """
+        Fração das fontes já lida na iteração em andamento.
+
+        Returns:
+            float ou None: Entre 0.0 e 1.0 (None se algum tamanho é desconhecido)
+        """
+        size = self.size
+        if not size:
+            return None
+        return min(self.bytes_read / size, 1.0)
+
+    def __iter__(self):
+        """
+        Percorre os ObjectMaps de todos os exports.
+
+        Durante a iteração, export_index é a posição (a partir de 0) do
+        export do último ObjectMap entregue.
+
+        Yields:
+            dict: ObjectMap
+
+        Raises:
+            json.JSONDecodeError: Se algum documento for inválido
+        """
+        for reader in self.readers:
+            # O tamanho de cada fonte é conhecido já no início da iteração
+            if isinstance(reader.source, (str, os.PathLike)):
+                reader.size = os.path.getsize(reader.source)
+            elif hasattr(reader.source, "seek"):
+                reader.size = reader.source.seek(0, os.SEEK_END)
+                reader.source.seek(0)
+            reader.bytes_read = 0
+
+        for export_index, reader in enumerate(self.readers):
+            for obj_map in reader:
+                self.export_index = export_index
+                yield obj_map
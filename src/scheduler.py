@@ -0,0 +1,383 @@
+"""
+Agendador de gerações compartilhado por todas as sessões.
+
+Contém a classe GenerationScheduler: as gerações rodam em um pool de
+processos limitado, fora do GIL do servidor, com no máximo `max_jobs` em
+andamento. As demais esperam em uma fila FIFO e conhecem a sua posição. Cada
+processo worker tem um limite de memória (RLIMIT_AS), então um export grande
+falha sozinho em vez de derrubar o servidor. Tempo de espera, tempo de
+execução e tamanho da fila são registrados como métricas.
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from fragment_cache import FragmentCache
+from generator import GenerationCancelled, MappingSpreadsheetGenerator
+from instrumentation import NULL_PROFILER, Profiler
+from manual_fields import ManualFields
+from output import SpooledWorkbook
+from reader import MultiExportReader, VertifyExportReader
+
+logger = logging.getLogger("vertify.scheduler")
+
+DEFAULT_MAX_JOBS = 2
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+# Intervalo de sincronização do progresso e do cancelamento com os workers
+SYNC_INTERVAL_SECONDS = 0.2
+
+# Cache de fragmentos de cada processo worker, por diretório
+_worker_fragment_caches = {}
+
+# Limite de memória aplicado ao processo worker (None = sem limite)
+_worker_memory_budget = None
+
+
+def _init_worker(memory_budget):
+    """Aplica o limite de memória ao processo worker."""
+    global _worker_memory_budget
+    if memory_budget and resource is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_budget = min(memory_budget, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_budget, hard))
+        _worker_memory_budget = memory_budget
+
+
+class _WorkerLink:
+    """
+    Canal do worker com o job no servidor: publica o progresso e consulta
+    o cancelamento, no máximo uma vez por SYNC_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, cancel_event, state):
+        self._cancel_event = cancel_event
+        self._state = state
+        self._cancelled = False
+        self._last_check = 0.0
+        self._last_progress = 0.0
+
+    def is_set(self):
+        """Interface de threading.Event usada pelo gerador."""
+        now = time.monotonic()
+        if not self._cancelled and now - self._last_check >= SYNC_INTERVAL_SECONDS:
+            self._last_check = now
+            self._cancelled = self._cancel_event.is_set()
+        return self._cancelled
+
+    def progress(self, tabs_written, fraction):
+        """Publica o progresso do gerador."""
+        now = time.monotonic()
+        if now - self._last_progress >= SYNC_INTERVAL_SECONDS:
+            self._last_progress = now
+            self._state.update(tabs_written=tabs_written, fraction=fraction)
+
+
+def _generate_in_worker(source_path, output_path, options, fragment_cache_dir, cancel_event, state,
+                        previous_path=None):
+    """
+    Gera a planilha em um processo worker.
+
+    Args:
+        source_path: Caminho do JSON exportado, ou lista de caminhos para
+            unir vários exports em uma planilha
+        output_path: Caminho onde a planilha é gravada
+        options: compression_level, field_index_sheet, validation, deterministic,
+            profiling e track_allocations
+        fragment_cache_dir: Diretório do cache de fragmentos (None = sem cache)
+        cancel_event: Event do Manager sinalizado pelo servidor
+        state: Dicionário do Manager que recebe o progresso
+        previous_path: Planilha gerada anteriormente, com valores preenchidos
+            à mão a preservar (ver ManualFields)
+
+    Returns:
+        dict: Resultado de process() sem a planilha (gravada em output_path)
+    """
+    fragment_cache = None
+    if fragment_cache_dir is not None:
+        fragment_cache = _worker_fragment_caches.get(fragment_cache_dir)
+        if fragment_cache is None:
+            fragment_cache = _worker_fragment_caches[fragment_cache_dir] = FragmentCache(fragment_cache_dir)
+
+    if isinstance(source_path, list):
+        reader = MultiExportReader(source_path)
+    else:
+        reader = VertifyExportReader(source_path)
+    link = _WorkerLink(cancel_event, state)
+    profiler = Profiler(options["track_allocations"]) if options["profiling"] else NULL_PROFILER
+    try:
+        with profiler:
+            manual_fields = None
+            if previous_path is not None:
+                with profiler.stage("manual_fields"):
+                    manual_fields = ManualFields.load(previous_path)
+            generator = MappingSpreadsheetGenerator(
+                reader, engine="native", fragment_cache=fragment_cache,
+                profiler=profiler, compression_level=options["compression_level"],
+                progress=link.progress, cancel_event=link,
+                field_index_sheet=options.get("field_index_sheet", False),
+                manual_fields=manual_fields, validation=options.get("validation"),
+                deterministic=options.get("deterministic", False),
+            )
+            return generator.process(output_path)
+    except MemoryError:
+        budget_mb = (_worker_memory_budget or 0) // (1024 * 1024)
+        raise MemoryError(f"Generation exceeded the per-job memory budget of {budget_mb} MB") from None
+
+
+class _Ticket:
+    """Lugar de um job na fila de admissão."""
+
+    __slots__ = ("queued", "submitted")
+
+    def __init__(self, queued):
+        self.queued = queued
+        self.submitted = time.monotonic()
+
+
+class GenerationScheduler:
+    """
+    Fila de admissão e pool de processos para as gerações do servidor.
+
+    Cada chamada de run() bloqueia a thread que a fez (a thread de um
+    GenerationJob) até a geração terminar no pool.
+    """
+
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS, memory_budget=DEFAULT_MEMORY_BUDGET,
+                 fragment_cache_dir=None):
+        """
+        Inicializa o agendador.
+
+        Args:
+            max_jobs: Gerações simultâneas (processos no pool)
+            memory_budget: Limite de memória em bytes de cada processo worker
+                (espaço de endereçamento; None para não limitar)
+            fragment_cache_dir: Diretório do cache de fragmentos compartilhado
+                pelos workers (None para não usar o cache)
+        """
+        self.max_jobs = max_jobs
+        self.memory_budget = memory_budget
+        self.fragment_cache_dir = os.fspath(fragment_cache_dir) if fragment_cache_dir else None
+        self._waiting = deque()
+        self._running = 0
+        self._condition = threading.Condition()
+        self._executor = None
+        self._manager = None
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "max_queue_depth": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+            "run_seconds_max": 0.0,
+        }
+
+    def _start_pool(self):
+        """Cria o pool e o Manager na primeira geração (ou após o pool quebrar)."""
+        # spawn: o servidor tem muitas threads, que um fork copiaria em estado inconsistente
+        context = multiprocessing.get_context("spawn")
+        if self._manager is None:
+            self._manager = context.Manager()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_jobs, mp_context=context,
+                initializer=_init_worker, initargs=(self.memory_budget,),
+            )
+
+    def _notify_positions(self):
+        """Informa a posição (1 = próximo) de cada job na fila."""
+        for position, ticket in enumerate(self._waiting, 1):
+            ticket.queued(position)
+
+    def _admit(self, ticket, cancel_event):
+        """
+        Espera a vez do job na fila.
+
+        Raises:
+            GenerationCancelled: Se o job for cancelado enquanto espera
+        """
+        with self._condition:
+            self._waiting.append(ticket)
+            self._metrics["submitted"] += 1
+
+            while self._waiting[0] is not ticket or self._running >= self.max_jobs:
+                if cancel_event.is_set():
+                    self._waiting.remove(ticket)
+                    self._metrics["cancelled"] += 1
+                    self._notify_positions()
+                    self._condition.notify_all()
+                    raise GenerationCancelled("Spreadsheet generation was cancelled")
+                self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], len(self._waiting))
+                self._notify_positions()
+                self._condition.wait(SYNC_INTERVAL_SECONDS)
+
+            self._waiting.popleft()
+            self._running += 1
+            self._start_pool()
+            self._notify_positions()
+            self._condition.notify_all()
+
+    def _release(self):
+        """Libera a vaga de um job encerrado."""
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+    def run(self, source, options, progress, cancel_event, queued, previous_workbook=None):
+        """
+        Executa uma geração no pool, esperando na fila se necessário.
+
+        Args:
+            source: Caminho ou arquivo binário do JSON exportado, ou lista
+                deles para unir vários exports (ver MultiExportReader)
+            options: compression_level, field_index_sheet, validation, deterministic,
+                profiling e track_allocations
+            progress: Função (abas gravadas, fração processada ou None)
+            cancel_event: threading.Event que cancela o job (na fila ou em execução)
+            queued: Função chamada com a posição na fila (None ao sair dela)
+            previous_workbook: Caminho ou arquivo binário opcional de uma
+                planilha gerada anteriormente; os valores preenchidos à mão
+                nela são preservados
+
+        Returns:
+            dict: Resultado de process(), com a planilha em excel_file
+
+        Raises:
+            GenerationCancelled: Se o job for cancelado
+            ExportValidationError: Se o export não passar na validação
+            MemoryError: Se o worker exceder o limite de memória
+        """
+        with tempfile.TemporaryDirectory(prefix="vertify-job-") as job_dir:
+            if isinstance(source, (list, tuple)):
+                source_path = [
+                    self._source_path(item, job_dir, f"export-{position}.json")
+                    for position, item in enumerate(source)
+                ]
+            else:
+                source_path = self._source_path(source, job_dir, "export.json")
+            previous_path = None
+            if previous_workbook is not None:
+                previous_path = self._source_path(previous_workbook, job_dir, "previous.xlsx")
+            output_path = os.path.join(job_dir, "output.xlsx")
+
+            ticket = _Ticket(queued)
+            self._admit(ticket, cancel_event)
+            queued(None)
+            started = time.monotonic()
+            status = "failed"
+            try:
+                result = self._execute(
+                    source_path, output_path, options, progress, cancel_event, previous_path
+                )
+                status = "completed"
+            except GenerationCancelled:
+                status = "cancelled"
+                raise
+            finally:
+                self._release()
+                self._record(status, started - ticket.submitted, time.monotonic() - started)
+
+            result["excel_file"] = SpooledWorkbook.load(output_path)
+            return result
+
+    @staticmethod
+    def _source_path(source, job_dir, name):
+        """Caminho de um arquivo lido pelo worker, copiando para job_dir um upload em memória."""
+        if isinstance(source, (str, os.PathLike)):
+            return source
+        # O worker lê os arquivos do disco; o upload fica só no servidor
+        source_path = os.path.join(job_dir, name)
+        source.seek(0)
+        with open(source_path, "wb") as file:
+            shutil.copyfileobj(source, file)
+        return source_path
+
+    def _execute(self, source_path, output_path, options, progress, cancel_event, previous_path=None):
+        """Submete o job ao pool e repassa progresso e cancelamento."""
+        executor = self._executor
+        remote_cancel = self._manager.Event()
+        state = self._manager.dict()
+        future = executor.submit(
+            _generate_in_worker, source_path, output_path, options,
+            self.fragment_cache_dir, remote_cancel, state, previous_path,
+        )
+        while True:
+            try:
+                return future.result(timeout=SYNC_INTERVAL_SECONDS)
+            except TimeoutError:
+                pass
+            except BrokenProcessPool:
+                # Um worker morreu (ex.: OOM killer); o próximo job cria um novo pool
+                with self._condition:
+                    if self._executor is executor:
+                        self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            if cancel_event.is_set():
+                remote_cancel.set()
+            snapshot = state.copy()
+            if snapshot:
+                progress(snapshot["tabs_written"], snapshot["fraction"])
+
+    def _record(self, status, wait_seconds, run_seconds):
+        """Atualiza as métricas com um job encerrado e o registra no log."""
+        with self._condition:
+            metrics = self._metrics
+            metrics[status] += 1
+            metrics["wait_seconds_total"] += wait_seconds
+            metrics["wait_seconds_max"] = max(metrics["wait_seconds_max"], wait_seconds)
+            metrics["run_seconds_total"] += run_seconds
+            metrics["run_seconds_max"] = max(metrics["run_seconds_max"], run_seconds)
+            queue_depth = len(self._waiting)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"job": {
+                "status": status,
+                "wait_seconds": wait_seconds,
+                "run_seconds": run_seconds,
+                "queue_depth": queue_depth,
+            }}))
+
+    def get_statistics(self):
+        """
+        Retorna as métricas do agendador.
+
+        Returns:
+            dict: queue_depth e running (atuais), max_jobs, contadores de jobs
+                (submitted, completed, failed, cancelled), max_queue_depth e
+                tempos de espera e de execução (total e máximo, em segundos)
+        """
+        with self._condition:
+            return {
+                "queue_depth": len(self._waiting),
+                "running": self._running,
+                "max_jobs": self.max_jobs,
+                **self._metrics,
+            }
+
+    def shutdown(self):
+        """Encerra o pool e o Manager."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
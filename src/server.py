@@ -0,0 +1,617 @@
+"""
+HTTP service - Headless conversion of Vertify mapping exports.
+
+A standard-library HTTP server around MappingSpreadsheetGenerator for
+pipelines that convert exports without the Streamlit UI. Request bodies are
+spooled to disk as they arrive, conversions run in the bounded process pool
+of a GenerationScheduler, and the workbook is streamed back in chunks.
+Requests beyond the pool and its queue are rejected with 503 and Retry-After.
+
+Workbooks are generated in deterministic mode, so the same export, options
+and generator version always produce the same bytes. Their content key (see
+artifact_store.artifact_key) is sent as the ETag: a request whose
+If-None-Match matches gets 304 without a conversion, and with
+--artifact-store a repeated conversion is served from disk.
+
+Endpoints:
+    POST /convert      Export JSON in the body; responds with the XLSX, its ETag,
+                       X-ObjectMaps and X-Validation-Warnings.
+                       Query: compression_level (0-9), field_index (0/1),
+                       validation (strict, lenient or off), filename
+    POST /statistics   Export JSON in the body; responds with get_statistics()
+                       as JSON, without generating the workbook
+    GET  /health       Admission and scheduler counters as JSON
+
+Usage:
+    python src/server.py --port 8080 --max-jobs 2 --max-queue 8
+    python src/server.py --artifact-store artifacts/
+    curl --data-binary @export.json http://localhost:8080/convert -o export_MAPPINGS.xlsx
+    curl --data-binary @export.json -H 'If-None-Match: "<etag>"' http://localhost:8080/convert
+    curl -X POST -T export.json -H "Transfer-Encoding: chunked" http://localhost:8080/statistics
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+import sys
+import tempfile
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, quote, urlsplit
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from artifact_store import ArtifactStore, artifact_key
+from generator import GENERATOR_VERSION, MappingSpreadsheetGenerator
+from reader import VertifyExportReader
+from scheduler import DEFAULT_MAX_JOBS, DEFAULT_MEMORY_BUDGET, GenerationScheduler
+from validation import LENIENT, VALIDATION_MODES, ExportValidationError
+from xlsx_writer import COMPRESSION_LEVELS
+
+logger = logging.getLogger("vertify.server")
+
+DEFAULT_PORT = 8080
+
+# Requests waiting for a pool slot before new ones are rejected with 503
+DEFAULT_MAX_QUEUE = 8
+
+DEFAULT_MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+
+# Request bodies above this size are spooled to disk while they are received
+BODY_SPOOL_SIZE = 8 * 1024 * 1024
+
+BODY_CHUNK_SIZE = 64 * 1024
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+DEFAULT_FILENAME = "export_MAPPINGS.xlsx"
+
+# Characters that could end the header or the quoted filename
+_UNSAFE_FILENAME_RE = re.compile(r'[\x00-\x1f\x7f"\\]')
+
+# Validation issues included in an error response
+MAX_ISSUES_IN_RESPONSE = 100
+
+
+class HTTPError(Exception):
+    """A request that ends with an error status and a JSON body."""
+
+    def __init__(self, status, message, headers=None, **details):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+        self.details = details
+
+
+class ConversionService:
+    """
+    Admission control and execution shared by all request threads.
+
+    At most max_jobs conversions run at once in the scheduler's process pool
+    and at most max_queue more wait for a slot; any request beyond that is
+    rejected right away instead of piling up threads and spooled bodies.
+    """
+
+    def __init__(self, max_jobs=DEFAULT_MAX_JOBS, max_queue=DEFAULT_MAX_QUEUE,
+                 memory_budget=DEFAULT_MEMORY_BUDGET, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES,
+                 fragment_cache_dir=None, artifact_store_dir=None):
+        """
+        Initializes the service.
+
+        Args:
+            max_jobs: Concurrent conversions (processes in the pool)
+            max_queue: Requests allowed to wait for a free process
+            memory_budget: Memory limit in bytes of each worker process
+            max_upload_bytes: Largest accepted request body
+            fragment_cache_dir: Optional rendered-tab cache shared by the workers
+            artifact_store_dir: Optional directory of generated workbooks,
+                keyed by content, served again without a conversion
+        """
+        self.max_jobs = max_jobs
+        self.max_queue = max_queue
+        self.max_upload_bytes = max_upload_bytes
+        self.scheduler = GenerationScheduler(max_jobs, memory_budget, fragment_cache_dir)
+        self.artifact_store = ArtifactStore(artifact_store_dir) if artifact_store_dir else None
+        self._slots = threading.BoundedSemaphore(max_jobs + max_queue)
+        self._lock = threading.Lock()
+        self._metrics = {"accepted": 0, "rejected": 0, "in_flight": 0}
+
+    def retry_after(self):
+        """
+        Estimates when a slot frees up, from the average conversion time.
+
+        Returns:
+            int: Seconds for the Retry-After header (at least 1)
+        """
+        stats = self.scheduler.get_statistics()
+        finished = stats["completed"] + stats["failed"]
+        average = stats["run_seconds_total"] / finished if finished else 1.0
+        waves = (stats["queue_depth"] + stats["running"]) / self.max_jobs
+        return max(1, math.ceil(average * waves))
+
+    def admit(self):
+        """
+        Reserves a slot for a request.
+
+        Raises:
+            HTTPError: 503 with Retry-After when every slot is taken
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._metrics["rejected"] += 1
+            raise HTTPError(
+                HTTPStatus.SERVICE_UNAVAILABLE, "Server is at capacity, retry later",
+                headers={"Retry-After": str(self.retry_after())}
+            )
+        with self._lock:
+            self._metrics["accepted"] += 1
+            self._metrics["in_flight"] += 1
+
+    def release(self):
+        """Frees the slot of a finished request."""
+        with self._lock:
+            self._metrics["in_flight"] -= 1
+        self._slots.release()
+
+    @staticmethod
+    def artifact_key(body, options):
+        """
+        Returns the content key of the workbook a /convert request produces.
+
+        Args:
+            body: Binary file with the export JSON
+            options: compression_level, field_index_sheet and validation
+
+        Returns:
+            str: SHA-256 of the export, the generator version and the options
+        """
+        return artifact_key([body], GENERATOR_VERSION, {"engine": "native", **options})
+
+    def convert(self, body, options, key):
+        """
+        Returns the workbook of an export, from the artifact store or
+        generated in the process pool.
+
+        Args:
+            body: Binary file with the export JSON
+            options: compression_level, field_index_sheet and validation
+            key: Content key of the workbook (see artifact_key)
+
+        Returns:
+            tuple: (SpooledWorkbook, to be closed by the caller, and its
+                metadata, see workbook_metadata; None if it was stored without)
+        """
+        if self.artifact_store is not None:
+            excel_file = self.artifact_store.get(key)
+            if excel_file is not None:
+                return excel_file, self.artifact_store.get_metadata(key)
+
+        options = {**options, "deterministic": True, "profiling": False, "track_allocations": False}
+        result = self.scheduler.run(
+            body, options, progress=lambda *args: None, cancel_event=threading.Event(),
+            queued=lambda position: None
+        )
+        metadata = workbook_metadata(result)
+        if self.artifact_store is not None:
+            self.artifact_store.put(key, result["excel_file"], metadata)
+        return result["excel_file"], metadata
+
+    def stored_metadata(self, key):
+        """
+        Returns the metadata of a stored workbook, for a 304 response.
+
+        Returns:
+            dict or None: See workbook_metadata (None without an artifact store)
+        """
+        if self.artifact_store is None:
+            return None
+        return self.artifact_store.get_metadata(key)
+
+    @staticmethod
+    def statistics(body, validation):
+        """
+        Computes the statistics of an export without generating the workbook.
+
+        Args:
+            body: Binary file with the export JSON
+            validation: Validation mode, or None to skip it
+
+        Returns:
+            dict: Statistics (see MappingSpreadsheetGenerator.get_statistics)
+        """
+        generator = MappingSpreadsheetGenerator(VertifyExportReader(body), engine="native")
+        try:
+            if validation is not None:
+                generator.validate(validation).raise_for_errors()
+            return generator.get_statistics()
+        finally:
+            generator.engine.discard()
+
+    def get_statistics(self):
+        """
+        Returns the admission and scheduler counters.
+
+        Returns:
+            dict: accepted, rejected and in_flight requests, max_queue, the
+                scheduler metrics (see GenerationScheduler.get_statistics) and
+                the artifact store counters, if any
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+        statistics = {**metrics, "max_queue": self.max_queue, "scheduler": self.scheduler.get_statistics()}
+        if self.artifact_store is not None:
+            statistics["artifact_store"] = self.artifact_store.get_statistics()
+        return statistics
+
+    def shutdown(self):
+        """Stops the process pool."""
+        self.scheduler.shutdown()
+
+
+def parse_convert_options(query):
+    """
+    Reads the workbook options of a /convert request.
+
+    Args:
+        query: Parsed query string (parse_qs)
+
+    Returns:
+        dict: compression_level, field_index_sheet and validation
+
+    Raises:
+        HTTPError: 400 on an invalid value
+    """
+    options = {"compression_level": None, "field_index_sheet": False,
+               "validation": parse_validation(query)}
+
+    level = query.get("compression_level", [None])[0]
+    if level is not None:
+        if not level.isdigit() or int(level) not in COMPRESSION_LEVELS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "compression_level must be an integer from 0 to 9")
+        options["compression_level"] = int(level)
+
+    field_index = query.get("field_index", ["0"])[0]
+    if field_index not in ("0", "1"):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "field_index must be 0 or 1")
+    options["field_index_sheet"] = field_index == "1"
+    return options
+
+
+def content_disposition(filename):
+    """
+    Builds the Content-Disposition header of a download (RFC 6266).
+
+    Control characters (CR, LF...), quotes and backslashes are removed, so
+    the filename cannot end the header or add new ones. Non-ASCII names go
+    in filename*, with an ASCII fallback in filename.
+
+    Args:
+        filename: Requested filename
+
+    Returns:
+        str: Header value
+    """
+    filename = _UNSAFE_FILENAME_RE.sub("", filename).strip() or DEFAULT_FILENAME
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def parse_validation(query):
+    """
+    Reads the validation mode of a request (lenient by default).
+
+    Returns:
+        str or None: Validation mode (None for "off")
+
+    Raises:
+        HTTPError: 400 on an unknown mode
+    """
+    validation = query.get("validation", [LENIENT])[0]
+    if validation == "off":
+        return None
+    if validation not in VALIDATION_MODES:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "validation must be strict, lenient or off")
+    return validation
+
+
+def workbook_metadata(result):
+    """
+    Extracts the response metadata of a generation result.
+
+    Args:
+        result: Result of process() (see GenerationScheduler.run)
+
+    Returns:
+        dict: object_maps and validation_warnings (None without validation)
+    """
+    validation = result["validation"]
+    return {
+        "object_maps": result["statistics"]["total_objectmaps"],
+        "validation_warnings": None if validation is None else validation.warning_count,
+    }
+
+
+def etag_matches(if_none_match, etag):
+    """
+    Checks an If-None-Match header against the ETag of a response.
+
+    Args:
+        if_none_match: Header value (None when absent)
+        etag: Quoted strong ETag of the response
+
+    Returns:
+        bool: True if the client already has this representation
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # Weak comparison, as RFC 9110 requires for If-None-Match
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Handles one HTTP request (one thread per connection)."""
+
+    server_version = f"VertifyMappingGenerator/{GENERATOR_VERSION}"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        """Serves GET /health."""
+        if urlsplit(self.path).path != "/health":
+            self._send_error(HTTPError(HTTPStatus.NOT_FOUND, "Not found"))
+            return
+        self._send_json(HTTPStatus.OK, {"status": "ok", **self.service.get_statistics()})
+
+    def do_POST(self):
+        """Serves POST /convert and POST /statistics."""
+        url = urlsplit(self.path)
+        routes = {"/convert": self._convert, "/statistics": self._statistics}
+        route = routes.get(url.path)
+        try:
+            if route is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "Not found")
+            route(parse_qs(url.query))
+        except HTTPError as e:
+            self._send_error(e)
+        except ExportValidationError as e:
+            report = e.report
+            self._send_error(HTTPError(
+                HTTPStatus.UNPROCESSABLE_ENTITY, str(e),
+                issues=[issue._asdict() for issue in report.issues[:MAX_ISSUES_IN_RESPONSE]],
+                error_count=report.error_count, warning_count=report.warning_count,
+            ))
+        except json.JSONDecodeError as e:
+            self._send_error(HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid JSON: {e}"))
+        except MemoryError as e:
+            self._send_error(HTTPError(HTTPStatus.INSUFFICIENT_STORAGE, str(e)))
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away while the workbook was being sent
+            self.close_connection = True
+        except Exception as e:
+            logger.exception("Request failed")
+            self._send_error(HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR, f"Unexpected error: {e}"))
+
+    def _convert(self, query):
+        """Converts the export in the body and streams the workbook back."""
+        options = parse_convert_options(query)
+        filename = query.get("filename", [DEFAULT_FILENAME])[0]
+
+        self.service.admit()
+        try:
+            with self._read_body() as body:
+                key = self.service.artifact_key(body, options)
+                etag = f'"{key}"'
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header("ETag", etag)
+                    self._send_metadata_headers(self.service.stored_metadata(key))
+                    self.end_headers()
+                    return
+                excel_file, metadata = self.service.convert(body, options, key)
+        finally:
+            self.service.release()
+
+        with excel_file:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", XLSX_CONTENT_TYPE)
+            self.send_header("Content-Length", str(excel_file.size))
+            self.send_header("Content-Disposition", content_disposition(filename))
+            self.send_header("ETag", etag)
+            self._send_metadata_headers(metadata)
+            self.end_headers()
+            for chunk in excel_file.iter_chunks():
+                self.wfile.write(chunk)
+
+    def _send_metadata_headers(self, metadata):
+        """Sends the X-ObjectMaps and X-Validation-Warnings headers, when known."""
+        if metadata is None:
+            return
+        self.send_header("X-ObjectMaps", str(metadata["object_maps"]))
+        if metadata["validation_warnings"] is not None:
+            self.send_header("X-Validation-Warnings", str(metadata["validation_warnings"]))
+
+    def _statistics(self, query):
+        """Returns the statistics of the export in the body."""
+        validation = parse_validation(query)
+
+        self.service.admit()
+        try:
+            with self._read_body() as body:
+                statistics = self.service.statistics(body, validation)
+        finally:
+            self.service.release()
+        self._send_json(HTTPStatus.OK, statistics)
+
+    def _read_body(self):
+        """
+        Receives the request body, in chunks, into a spooled temporary file.
+
+        Accepts a Content-Length body or a chunked (streamed) upload.
+
+        Returns:
+            SpooledTemporaryFile: Body, positioned at the start
+
+        Raises:
+            HTTPError: 411 without a length, 413 above max_upload_bytes
+        """
+        limit = self.service.max_upload_bytes
+        body = tempfile.SpooledTemporaryFile(max_size=BODY_SPOOL_SIZE)
+        try:
+            if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+                size = 0
+                for chunk in self._iter_chunked_body():
+                    size += len(chunk)
+                    if size > limit:
+                        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body exceeds {limit} bytes")
+                    body.write(chunk)
+            else:
+                length = self.headers.get("Content-Length")
+                if length is None or not length.isdigit():
+                    raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Content-Length or chunked body required")
+                remaining = int(length)
+                if remaining > limit:
+                    raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Body exceeds {limit} bytes")
+                while remaining:
+                    chunk = self.rfile.read(min(BODY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise HTTPError(HTTPStatus.BAD_REQUEST, "Body ended before Content-Length")
+                    body.write(chunk)
+                    remaining -= len(chunk)
+        except BaseException:
+            # The rest of an unread body would be parsed as the next request
+            self.close_connection = True
+            body.close()
+            raise
+        body.seek(0)
+        return body
+
+    def _iter_chunked_body(self):
+        """Decodes a Transfer-Encoding: chunked body."""
+        while True:
+            line = self.rfile.readline(1024)
+            try:
+                size = int(line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed chunked body") from None
+            if size == 0:
+                # Trailer headers, up to the blank line
+                while self.rfile.readline(1024) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            while size:
+                chunk = self.rfile.read(min(BODY_CHUNK_SIZE, size))
+                if not chunk:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Chunked body ended early")
+                size -= len(chunk)
+                yield chunk
+            self.rfile.readline(1024)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, error):
+        # The body may be unread (e.g. a 503 before receiving it): end the connection
+        self.close_connection = True
+        payload = {"error": str(error), **error.details}
+        self._send_json(error.status, payload, {"Connection": "close", **error.headers})
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """Threading HTTP server carrying the shared ConversionService."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service):
+        super().__init__(address, ConversionRequestHandler)
+        self.service = service
+
+
+def parse_args(argv=None):
+    """
+    Parses command-line arguments.
+
+    Args:
+        argv: Argument list (defaults to sys.argv)
+
+    Returns:
+        argparse.Namespace: Parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Serve Vertify export conversions over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--max-jobs", type=int, default=DEFAULT_MAX_JOBS,
+        help=f"Concurrent conversions in the process pool (default: {DEFAULT_MAX_JOBS})"
+    )
+    parser.add_argument(
+        "--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+        help=f"Requests waiting for a free process before 503 (default: {DEFAULT_MAX_QUEUE})"
+    )
+    parser.add_argument(
+        "--job-memory-mb", type=int, default=DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+        help="Memory budget of each conversion process in MB (0 for no limit)"
+    )
+    parser.add_argument(
+        "--max-upload-mb", type=int, default=DEFAULT_MAX_UPLOAD_BYTES // (1024 * 1024),
+        help="Largest accepted request body in MB"
+    )
+    parser.add_argument(
+        "--fragment-cache", metavar="DIR",
+        help="Directory of the rendered ObjectMap tab cache shared by the workers"
+    )
+    parser.add_argument(
+        "--artifact-store", metavar="DIR",
+        help="Directory where generated workbooks are kept, keyed by content, and served again"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Runs the HTTP service until interrupted."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    service = ConversionService(
+        max_jobs=args.max_jobs,
+        max_queue=args.max_queue,
+        memory_budget=args.job_memory_mb * 1024 * 1024 or None,
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+        fragment_cache_dir=args.fragment_cache,
+        artifact_store_dir=args.artifact_store,
+    )
+    server = ConversionServer((args.host, args.port), service)
+    logger.info("Listening on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,39 @@ Contém definições de cores, fontes e configurações de layout
 utilizadas na geração das planilhas de mapeamento.
 """
 
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+
+class CellStyle:
+    """Combinação de preenchimento, fonte e alinhamento com um nome."""
+    
+    __slots__ = ("name", "fill", "font", "alignment")
+    
+    def __init__(self, name, fill=None, font=None, alignment=None):
+        self.name = name
+        self.fill = fill
+        self.font = font
+        self.alignment = alignment
+    
+    @property
+    def key(self):
+        """Chave da combinação (identidade das constantes de ExcelStyles)."""
+        return (id(self.fill), id(self.font), id(self.alignment))
+    
+    def to_named_style(self):
+        """
+        Cria o NamedStyle do openpyxl equivalente.
+        
+        Partes ausentes ficam com os valores padrão do openpyxl, como em uma
+        célula sem formatação.
+        """
+        return NamedStyle(
+            name=self.name,
+            fill=self.fill or PatternFill(),
+            font=self.font or DEFAULT_FONT,
+            alignment=self.alignment or Alignment()
+        )
 
 
 class ExcelStyles:
@@ -52,6 +84,22 @@ class ExcelStyles:
     ALIGN_CENTER = Alignment(horizontal="center", vertical="center")
     ALIGN_CENTER_HORIZONTAL = Alignment(horizontal="center")
     
+    # ===== ESTILOS NOMEADOS =====
+    # Combinações usadas pelos cabeçalhos, registradas uma vez por workbook:
+    # cada célula recebe o estilo com uma única atribuição
+    CELL_STYLES = {style.name: style for style in (
+        CellStyle("Vertify Title", COLOR_HEADER_BLACK, FONT_HEADER_WHITE_LARGE, ALIGN_CENTER),
+        CellStyle("Vertify Section Black", COLOR_HEADER_BLACK, FONT_HEADER_WHITE, ALIGN_CENTER),
+        CellStyle("Vertify Section Red", COLOR_RED, FONT_HEADER_WHITE, ALIGN_CENTER),
+        CellStyle("Vertify Section Green", COLOR_SUBHEADER_GREEN, FONT_HEADER_WHITE, ALIGN_CENTER),
+        CellStyle("Vertify Green Bold", COLOR_SUBHEADER_GREEN, FONT_BOLD, ALIGN_CENTER),
+        CellStyle("Vertify Green Centered", COLOR_SUBHEADER_GREEN, None, ALIGN_CENTER),
+        CellStyle("Vertify Green Horizontal", COLOR_SUBHEADER_GREEN, None, ALIGN_CENTER_HORIZONTAL),
+        CellStyle("Vertify Green", COLOR_SUBHEADER_GREEN),
+        CellStyle("Vertify Purple Horizontal", COLOR_SUBHEADER_PURPLE, None, ALIGN_CENTER_HORIZONTAL),
+        CellStyle("Vertify Purple", COLOR_SUBHEADER_PURPLE),
+    )}
+    
     # ===== LARGURAS DE COLUNAS =====
     COLUMN_WIDTHS_SUMMARY = {
         'A': 5,   # ID
@@ -72,6 +120,14 @@ class ExcelStyles:
         'P': 15   # Email Every
     }
     
+    COLUMN_WIDTHS_FIELD_INDEX = {
+        'A': 35,  # Field
+        'B': 10,  # Role
+        'C': 15,  # Section
+        'D': 6,   # ID
+        'E': 45,  # Movement Name
+    }
+    
     COLUMN_WIDTHS_DETAIL = {
         'A': 15,
         'B': 15,
@@ -81,11 +137,26 @@ class ExcelStyles:
         'F': 15
     }
     
+    @staticmethod
+    def register_named_styles(workbook):
+        """
+        Registra os estilos de CELL_STYLES em um workbook do openpyxl.
+        
+        Args:
+            workbook: Workbook (normal ou write-only)
+        """
+        for style in ExcelStyles.CELL_STYLES.values():
+            workbook.add_named_style(style.to_named_style())
+    
     @staticmethod
     def apply_header_style(cell, text, fill_color=None, font=None, alignment=None):
         """
         Aplica estilo a uma célula de cabeçalho.
         
+        Combinações de CELL_STYLES são aplicadas como estilo nomeado, com uma
+        única atribuição (o workbook precisa tê-las registrado, ver
+        register_named_styles); as demais, parte a parte.
+        
         Args:
             cell: Célula do Excel
             text: Texto a ser inserido
@@ -95,6 +166,11 @@ class ExcelStyles:
         """
         cell.value = text
         
+        style = _CELL_STYLES_BY_KEY.get((id(fill_color), id(font), id(alignment)))
+        if style is not None:
+            cell.style = style.name
+            return
+        
         if fill_color:
             cell.fill = fill_color
         if font:
@@ -113,3 +189,7 @@ class ExcelStyles:
         """
         for col_letter, width in width_dict.items():
             worksheet.column_dimensions[col_letter].width = width
+
+
+# Estilos nomeados indexados pela combinação de constantes
+_CELL_STYLES_BY_KEY = {style.key: style for style in ExcelStyles.CELL_STYLES.values()}
@@ -0,0 +1,100 @@
+"""
+Templates pré-compilados dos blocos estáticos das abas de detalhe.
+
+Contém a classe SectionTemplate: o bloco fixo de uma seção (cabeçalhos,
+mesclagens e rótulos) é renderizado uma única vez em um SheetBuffer e depois
+carimbado em cada aba na linha desejada. Só as linhas de dados são montadas
+por ObjectMap.
+"""
+
+from openpyxl.utils.cell import get_column_letter, range_boundaries
+
+from engines import SheetBuffer
+
+
+class SectionTemplate:
+    """Bloco estático de uma seção, gravado uma vez e carimbado em cada aba."""
+
+    __slots__ = ("cells", "merges", "height")
+
+    def __init__(self, cells, merges, height):
+        """
+        Inicializa o template.
+
+        Args:
+            cells: Lista de (deslocamento da linha, coluna, BufferedCell)
+            merges: Lista de (coluna inicial, deslocamento inicial,
+                coluna final, deslocamento final), colunas em letras
+            height: Linhas ocupadas pelo bloco (próxima linha livre - início)
+        """
+        self.cells = cells
+        self.merges = merges
+        self.height = height
+
+    @classmethod
+    def record(cls, build):
+        """
+        Grava o bloco produzido por uma função de montagem.
+
+        Args:
+            build: Função (ws, start_row) -> próxima linha livre, que escreve
+                apenas conteúdo fixo
+
+        Returns:
+            SectionTemplate
+        """
+        buffer = SheetBuffer("template")
+        height = build(buffer, 1) - 1
+
+        cells = [
+            (row_idx - 1, col_idx, cell)
+            for row_idx, row in enumerate(buffer.iter_rows(), 1)
+            for col_idx, cell in enumerate(row, 1)
+            if cell is not None
+        ]
+
+        merges = []
+        for range_string in buffer.merged_ranges:
+            min_col, min_row, max_col, max_row = range_boundaries(range_string)
+            merges.append((
+                get_column_letter(min_col), min_row - 1,
+                get_column_letter(max_col), max_row - 1,
+            ))
+
+        return cls(cells, merges, height)
+
+    def stamp(self, ws, start_row):
+        """
+        Carimba o bloco em uma aba.
+
+        Em um SheetBuffer as células do template são compartilhadas (ver
+        SheetBuffer.stamp); em uma worksheet do openpyxl são copiadas.
+
+        Args:
+            ws: Worksheet ou SheetBuffer
+            start_row: Linha inicial do bloco
+
+        Returns:
+            Próxima linha livre depois do bloco
+        """
+        if isinstance(ws, SheetBuffer):
+            ws.stamp(self, start_row)
+            return start_row + self.height
+
+        for first_col, first_row, last_col, last_row in self.merges:
+            ws.merge_cells(f"{first_col}{start_row + first_row}:{last_col}{start_row + last_row}")
+
+        for row_offset, column, cell in self.cells:
+            target = ws.cell(row=start_row + row_offset, column=column)
+            target.value = cell.value
+            if cell.style is not None:
+                target.style = cell.style
+                continue
+            if cell.fill is not None:
+                target.fill = cell.fill
+            if cell.font is not None:
+                target.font = cell.font
+            if cell.alignment is not None:
+                target.alignment = cell.alignment
+
+        return start_row + self.height
@@ -0,0 +1,338 @@
+"""
+Validação do export Vertify antes da geração.
+
+Contém o schema dos campos lidos pelo gerador (ver models), compilado uma
+vez em funções de verificação, e a classe ExportValidator, que percorre os
+ObjectMaps em uma única passada e reporta cada problema com o caminho JSON e
+o nome do ObjectMap. No modo "lenient" só são erros os problemas que
+interromperiam a geração (ex.: PropertiesMap que não é uma lista); os campos
+que seriam gravados com valor padrão ("N/A", vazio) viram avisos. No modo
+"strict" todos os problemas são erros.
+"""
+
+from collections import namedtuple
+
+STRICT = "strict"
+LENIENT = "lenient"
+VALIDATION_MODES = (STRICT, LENIENT)
+
+ERROR = "error"
+WARNING = "warning"
+
+# Problemas guardados no relatório; os demais só são contados
+DEFAULT_MAX_ISSUES = 1000
+
+_MISSING = object()
+
+SchemaIssue = namedtuple("SchemaIssue", ("severity", "path", "object_map", "message", "export"))
+SchemaIssue.__doc__ = """
+Problema encontrado no export.
+
+severity é ERROR ou WARNING; path é o caminho JSON (ex.:
+$.ObjectsMap[3].PropertiesMap[0]); object_map é o nome do ObjectMap (None
+se não for possível obtê-lo); export é a posição do export em um
+MultiExportReader (None com um único export).
+"""
+
+
+class String:
+    """Campo texto; valores de outro tipo são gravados como estão."""
+
+    def __init__(self, required=False):
+        self.required = required
+
+
+class Scalar:
+    """Valor escalar (texto, número, booleano ou null), gravado como está."""
+
+    def __init__(self, required=False):
+        self.required = required
+
+
+class Boolean:
+    """Campo booleano."""
+
+    def __init__(self, required=False):
+        self.required = required
+
+
+class Array:
+    """Lista de itens com o mesmo schema."""
+
+    def __init__(self, items, required=False):
+        self.items = items
+        self.required = required
+
+
+class Object:
+    """Objeto com campos conhecidos; campos não listados são ignorados."""
+
+    def __init__(self, fields, required=False):
+        self.fields = fields
+        self.required = required
+
+
+# Campos lidos pelo gerador (ver models.*.from_dict). "required" marca os
+# campos cuja ausência faria a planilha exibir um valor padrão.
+TRANSFORMATION_SCHEMA = Object({
+    "SourcePropertyName": String(required=True),
+    "RuleType": String(required=True),
+    "Value": Scalar(),
+    "ProjectConvertListName": String(),
+    "DateFormat": String(),
+})
+
+PROPERTY_MAPPING_SCHEMA = Object({
+    "MoveAction": String(),
+    "Type": String(),
+    "TargetPropertyName": String(required=True),
+    # Lista vazia é um campo de destino sem origem (ver unmapped_targets)
+    "PropertiesMapTransformation": Array(TRANSFORMATION_SCHEMA, required=True),
+})
+
+FILTER_SCHEMA = Object({
+    "SourcePropertyName": String(required=True),
+    "FilterOperator": String(required=True),
+    "Value": Scalar(),
+})
+
+MERGE_FIELD_SCHEMA = Object({
+    "MergeField": String(required=True),
+    "SourcePropertyName": String(required=True),
+    "TargetPropertyName": String(required=True),
+})
+
+OBJECT_MAP_SCHEMA = Object({
+    "Name": String(required=True),
+    "SourceSystemName": String(required=True),
+    "TargetSystemName": String(required=True),
+    "MergeRecord": Boolean(),
+    "ObjectsMapMergeField": Array(MERGE_FIELD_SCHEMA),
+    "ObjectsMapFilter": Array(FILTER_SCHEMA),
+    "PropertiesMap": Array(PROPERTY_MAPPING_SCHEMA, required=True),
+})
+
+# O nome do ObjectMap compõe o nome da aba: outro tipo interromperia a geração
+_FATAL_FIELDS = {"Name"}
+
+
+def _json_type(value):
+    """Nome do tipo JSON de um valor."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, dict):
+        return "object"
+    return type(value).__name__
+
+
+def _compile(node, mode, fatal=False):
+    """
+    Compila um nó do schema em uma função check(value, path, issues).
+
+    As severidades são resolvidas aqui, para o modo dado: a verificação de
+    cada valor é uma chamada sem consultas ao schema. Os problemas são
+    acrescentados a issues como (severidade, caminho, mensagem).
+    """
+    # Tipos que a geração tolera (valor gravado como está) são avisos no modo lenient
+    soft = ERROR if mode == STRICT or fatal else WARNING
+
+    if isinstance(node, String):
+        def check(value, path, issues):
+            if isinstance(value, (dict, list)):
+                # Objetos e listas não cabem em uma célula nem em chaves de agrupamento
+                issues.append((ERROR, path, f"expected string, got {_json_type(value)}"))
+            elif not isinstance(value, str):
+                issues.append((soft, path, f"expected string, got {_json_type(value)}"))
+        return check
+
+    if isinstance(node, Scalar):
+        def check(value, path, issues):
+            if isinstance(value, (dict, list)):
+                issues.append((ERROR, path, f"expected scalar, got {_json_type(value)}"))
+        return check
+
+    if isinstance(node, Boolean):
+        def check(value, path, issues):
+            if not isinstance(value, bool):
+                issues.append((soft, path, f"expected boolean, got {_json_type(value)}"))
+        return check
+
+    if isinstance(node, Array):
+        check_item = _compile(node.items, mode)
+
+        def check(value, path, issues):
+            # Uma lista inválida interromperia a geração nos dois modos
+            if not isinstance(value, list):
+                issues.append((ERROR, path, f"expected array, got {_json_type(value)}"))
+                return
+            for position, item in enumerate(value):
+                check_item(item, f"{path}[{position}]", issues)
+        return check
+
+    if isinstance(node, Object):
+        # Um campo obrigatório ausente é gravado com o valor padrão (ex.: "N/A")
+        missing = ERROR if mode == STRICT else WARNING
+        fields = [
+            (key, _compile(field, mode, key in _FATAL_FIELDS), missing if field.required else None)
+            for key, field in node.fields.items()
+        ]
+
+        def check(value, path, issues):
+            if not isinstance(value, dict):
+                issues.append((ERROR, path, f"expected object, got {_json_type(value)}"))
+                return
+            for key, check_field, required in fields:
+                field_value = value.get(key, _MISSING)
+                if field_value is _MISSING or field_value is None:
+                    if required is not None:
+                        state = "missing" if field_value is _MISSING else "null"
+                        issues.append((required, f"{path}.{key}", f"required field is {state}"))
+                    continue
+                check_field(field_value, f"{path}.{key}", issues)
+        return check
+
+    raise TypeError(f"Unknown schema node: {node!r}")
+
+
+# Schema compilado por modo, na primeira validação
+_COMPILED = {}
+
+
+def compile_schema(mode):
+    """
+    Retorna a verificação compilada de um ObjectMap no modo dado.
+
+    Raises:
+        ValueError: Se o modo não for "strict" nem "lenient"
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Validation mode must be one of {', '.join(VALIDATION_MODES)}, got {mode!r}")
+    check = _COMPILED.get(mode)
+    if check is None:
+        check = _COMPILED[mode] = _compile(OBJECT_MAP_SCHEMA, mode)
+    return check
+
+
+class ExportValidationError(ValueError):
+    """O export tem problemas que impedem a geração no modo de validação escolhido."""
+
+    def __init__(self, report):
+        self.report = report
+        errors = report.errors
+        summary = "; ".join(
+            f"{issue.path} ({issue.object_map or 'N/A'}): {issue.message}" for issue in errors[:3]
+        )
+        more = report.error_count - min(len(errors), 3)
+        if more > 0:
+            summary += f"; and {more} more"
+        super().__init__(f"Export failed {report.mode} validation with {report.error_count} error(s): {summary}")
+
+    def __reduce__(self):
+        # Atravessa processos (pool do agendador) com o relatório completo
+        return (type(self), (self.report,))
+
+
+class ValidationReport:
+    """Resultado da validação de um export."""
+
+    def __init__(self, mode, issues, error_count, warning_count, object_maps):
+        self.mode = mode
+        self.issues = issues
+        self.error_count = error_count
+        self.warning_count = warning_count
+        self.object_maps = object_maps
+
+    @property
+    def errors(self):
+        """Erros guardados (até max_issues problemas no total)."""
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    @property
+    def warnings(self):
+        """Avisos guardados (até max_issues problemas no total)."""
+        return [issue for issue in self.issues if issue.severity == WARNING]
+
+    @property
+    def valid(self):
+        """Indica se não há erros (avisos não impedem a geração)."""
+        return self.error_count == 0
+
+    def raise_for_errors(self):
+        """
+        Raises:
+            ExportValidationError: Se houver algum erro
+        """
+        if not self.valid:
+            raise ExportValidationError(self)
+
+
+class ExportValidator:
+    """Valida ObjectMaps, um a um, contra o schema compilado."""
+
+    def __init__(self, mode=LENIENT, max_issues=DEFAULT_MAX_ISSUES):
+        """
+        Inicializa o validador.
+
+        Args:
+            mode: "strict" ou "lenient"
+            max_issues: Problemas guardados no relatório (os demais só são contados)
+
+        Raises:
+            ValueError: Se o modo for inválido
+        """
+        self.mode = mode
+        self.max_issues = max_issues
+        self._check = compile_schema(mode)
+        self._issues = []
+        self._error_count = 0
+        self._warning_count = 0
+        self._object_maps = 0
+
+    def _add(self, severity, path, object_map, message, export):
+        """Conta um problema e o guarda enquanto houver espaço."""
+        if severity == ERROR:
+            self._error_count += 1
+        else:
+            self._warning_count += 1
+        if len(self._issues) < self.max_issues:
+            self._issues.append(SchemaIssue(severity, path, object_map, message, export))
+
+    def add_root_issue(self, severity, path, message, export=None):
+        """Registra um problema fora dos ObjectMaps (ex.: ObjectsMap ausente)."""
+        self._add(severity, path, None, message, export)
+
+    def validate_object_map(self, data, path, export=None):
+        """
+        Valida um ObjectMap do JSON.
+
+        Args:
+            data: Item de ObjectsMap, como lido do JSON
+            path: Caminho JSON do item (ex.: "$.ObjectsMap[3]")
+            export: Posição do export em um MultiExportReader
+        """
+        self._object_maps += 1
+        issues = []
+        self._check(data, path, issues)
+        if not issues:
+            return
+
+        name = data.get("Name") if isinstance(data, dict) else None
+        for severity, issue_path, message in issues:
+            self._add(severity, issue_path, name, message, export)
+
+    def report(self):
+        """
+        Returns:
+            ValidationReport: Problemas encontrados até aqui
+        """
+        return ValidationReport(
+            self.mode, list(self._issues), self._error_count, self._warning_count, self._object_maps
+        )
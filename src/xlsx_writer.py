@@ -0,0 +1,661 @@
+"""
+Escritor nativo de XLSX (SpreadsheetML) sem o modelo de objetos do openpyxl.
+
+O layout gerado é fixo e conhecido, então as partes do pacote são escritas
+diretamente com zipfile: um styles.xml pré-montado a partir de ExcelStyles,
+uma tabela de shared strings e o XML de cada aba a partir de um SheetBuffer.
+"""
+
+import hashlib
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils.cell import (
+    column_index_from_string,
+    coordinate_from_string,
+    get_column_letter,
+)
+
+from styles import ExcelStyles
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+CT_WORKSHEET = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Acima deste tamanho a planilha passa da memória para o disco (também
+# usado pelo SpooledWorkbook)
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Níveis de compressão aceitos: 0 = sem compressão (store), 1 a 9 = deflate
+COMPRESSION_LEVELS = range(10)
+
+# Data gravada nos metadados e nas entradas do ZIP no modo determinístico
+# (a menor data representável no ZIP)
+DETERMINISTIC_TIMESTAMP = datetime(1980, 1, 1)
+
+# Caracteres de controle não permitidos em XML (mesma regra do openpyxl)
+_ILLEGAL_CHARACTERS_RE = re.compile(r"[\000-\010]|[\013-\014]|[\016-\037]")
+
+# Índice de shared string dentro do XML de uma aba
+_SHARED_STRING_REF_RE = re.compile(rb'(?<= t="s"><v>)(\d+)(?=</v>)')
+
+
+def _collect_styles(style_type):
+    """Retorna os estilos de ExcelStyles de um tipo, ordenados pelo nome."""
+    return [
+        value for name, value in sorted(vars(ExcelStyles).items())
+        if isinstance(value, style_type)
+    ]
+
+
+class StyleSheet:
+    """
+    Tabela de estilos pré-montada a partir das constantes de ExcelStyles.
+
+    Todas as combinações de preenchimento, fonte e alinhamento recebem um
+    índice de `cellXfs` determinístico, de modo que abas renderizadas em
+    processos diferentes usam os mesmos índices de estilo.
+    """
+
+    def __init__(self):
+        self.fills = _collect_styles(PatternFill)
+        self.fonts = _collect_styles(Font)
+        self.alignments = _collect_styles(Alignment)
+        self._xf_cache = {}
+        self._digest = None
+
+    @property
+    def digest(self):
+        """Hash do styles.xml, usado para conferir abas vindas de outros processos."""
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.to_xml().encode("utf-8")).hexdigest()
+        return self._digest
+
+    @staticmethod
+    def _position(options, style):
+        """Posição do estilo na lista (0 = sem estilo)."""
+        if style is None:
+            return 0
+        for position, option in enumerate(options, 1):
+            if option is style or option == style:
+                return position
+        raise ValueError(f"Style not defined in ExcelStyles: {style!r}")
+
+    def xf_index(self, fill, font, alignment):
+        """
+        Retorna o índice de `cellXfs` para uma combinação de estilos.
+
+        Args:
+            fill: PatternFill de ExcelStyles ou None
+            font: Font de ExcelStyles ou None
+            alignment: Alignment de ExcelStyles ou None
+
+        Returns:
+            int: Índice do estilo (0 = estilo padrão)
+        """
+        key = (id(fill), id(font), id(alignment))
+        index = self._xf_cache.get(key)
+        if index is None:
+            fill_pos = self._position(self.fills, fill)
+            font_pos = self._position(self.fonts, font)
+            align_pos = self._position(self.alignments, alignment)
+            index = (
+                (fill_pos * (len(self.fonts) + 1) + font_pos)
+                * (len(self.alignments) + 1)
+                + align_pos
+            )
+            self._xf_cache[key] = index
+        return index
+
+    @staticmethod
+    def _color_xml(tag, color):
+        return f'<{tag} rgb="{color.rgb}"/>' if color is not None and color.rgb else ""
+
+    def _font_xml(self, font):
+        parts = ["<font>"]
+        if font.b:
+            parts.append('<b val="1"/>')
+        if font.i:
+            parts.append('<i val="1"/>')
+        parts.append(self._color_xml("color", font.color))
+        if font.sz:
+            parts.append(f'<sz val="{font.sz:g}"/>')
+        if font.name:
+            parts.append(f"<name val={quoteattr(font.name)}/>")
+        parts.append("</font>")
+        return "".join(parts)
+
+    def _fill_xml(self, fill):
+        return (
+            f'<fill><patternFill patternType="{fill.fill_type}">'
+            f'{self._color_xml("fgColor", fill.fgColor)}'
+            f'{self._color_xml("bgColor", fill.bgColor)}'
+            "</patternFill></fill>"
+        )
+
+    @staticmethod
+    def _alignment_xml(alignment):
+        attrs = ""
+        if alignment.horizontal:
+            attrs += f' horizontal="{alignment.horizontal}"'
+        if alignment.vertical:
+            attrs += f' vertical="{alignment.vertical}"'
+        if alignment.wrap_text:
+            attrs += ' wrapText="1"'
+        return f"<alignment{attrs}/>"
+
+    def to_xml(self):
+        """Serializa o styles.xml completo."""
+        fonts = ['<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>']
+        fonts += [self._font_xml(font) for font in self.fonts]
+
+        # Os dois primeiros preenchimentos são reservados pela especificação
+        fills = [
+            '<fill><patternFill patternType="none"/></fill>',
+            '<fill><patternFill patternType="gray125"/></fill>',
+        ]
+        fills += [self._fill_xml(fill) for fill in self.fills]
+
+        xfs = []
+        for fill_pos in range(len(self.fills) + 1):
+            fill_id = fill_pos + 1 if fill_pos else 0
+            for font_id in range(len(self.fonts) + 1):
+                for align_pos in range(len(self.alignments) + 1):
+                    attrs = (
+                        f'numFmtId="0" fontId="{font_id}" fillId="{fill_id}" '
+                        'borderId="0" xfId="0"'
+                    )
+                    if font_id:
+                        attrs += ' applyFont="1"'
+                    if fill_id:
+                        attrs += ' applyFill="1"'
+                    if align_pos:
+                        alignment = self._alignment_xml(self.alignments[align_pos - 1])
+                        xfs.append(f'<xf {attrs} applyAlignment="1">{alignment}</xf>')
+                    else:
+                        xfs.append(f"<xf {attrs}/>")
+
+        return (
+            f'{XML_HEADER}<styleSheet xmlns="{NS_MAIN}">'
+            f'<fonts count="{len(fonts)}">{"".join(fonts)}</fonts>'
+            f'<fills count="{len(fills)}">{"".join(fills)}</fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            f'<cellXfs count="{len(xfs)}">{"".join(xfs)}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            "</styleSheet>"
+        )
+
+
+class SharedStrings:
+    """Tabela de shared strings do workbook."""
+
+    def __init__(self):
+        self.strings = []
+        self._index = {}
+
+    def add(self, text):
+        """
+        Registra um texto e retorna seu índice.
+
+        Args:
+            text: Texto da célula
+
+        Returns:
+            int: Índice na tabela
+        """
+        index = self._index.get(text)
+        if index is None:
+            index = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def iter_xml(self, references):
+        """
+        Serializa o sharedStrings.xml em blocos.
+
+        Args:
+            references: Total de células que referenciam a tabela
+        """
+        yield (
+            f'{XML_HEADER}<sst xmlns="{NS_MAIN}" count="{references}" '
+            f'uniqueCount="{len(self.strings)}">'
+        )
+        for text in self.strings:
+            yield f'<si><t xml:space="preserve">{escape(text)}</t></si>'
+        yield "</sst>"
+
+
+def _cell_xml(coordinate, value, style_index, shared_strings):
+    """
+    Serializa uma célula.
+
+    Returns:
+        tuple: (xml, usa_shared_string)
+    """
+    style = f' s="{style_index}"' if style_index else ""
+
+    # Texto vazio é gravado como célula vazia, como no openpyxl
+    if value is None or value == "":
+        return f'<c r="{coordinate}"{style}/>', False
+    if isinstance(value, bool):
+        return f'<c r="{coordinate}"{style} t="b"><v>{int(value)}</v></c>', False
+    if isinstance(value, (int, float)):
+        return f'<c r="{coordinate}"{style}><v>{value!r}</v></c>', False
+    if isinstance(value, str):
+        if _ILLEGAL_CHARACTERS_RE.search(value):
+            raise ValueError(f"Cannot write {value!r} to Excel: illegal character")
+        if len(value) > 1 and value.startswith("="):
+            return f'<c r="{coordinate}"{style}><f>{escape(value[1:])}</f><v></v></c>', False
+        index = shared_strings.add(value)
+        return f'<c r="{coordinate}"{style} t="s"><v>{index}</v></c>', True
+    raise ValueError(f"Cannot convert {value!r} to Excel")
+
+
+def _sheet_views_xml(freeze_panes):
+    """Serializa o sheetViews, incluindo painéis congelados."""
+    if not freeze_panes or freeze_panes == "A1":
+        return '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+
+    column_letter, row = coordinate_from_string(freeze_panes)
+    column = column_index_from_string(column_letter)
+
+    attrs = ""
+    if column > 1:
+        attrs += f' xSplit="{column - 1}"'
+    if row > 1:
+        attrs += f' ySplit="{row - 1}"'
+    if column > 1 and row > 1:
+        pane = "bottomRight"
+    elif row > 1:
+        pane = "bottomLeft"
+    else:
+        pane = "topRight"
+
+    return (
+        '<sheetViews><sheetView workbookViewId="0">'
+        f'<pane{attrs} topLeftCell="{freeze_panes}" activePane="{pane}" state="frozen"/>'
+        f'<selection pane="{pane}" activeCell="A1" sqref="A1"/>'
+        "</sheetView></sheetViews>"
+    )
+
+
+def iter_sheet_xml(buffer, shared_strings, style_sheet, stats=None):
+    """
+    Serializa um SheetBuffer como parte XML de worksheet, em blocos.
+
+    Args:
+        buffer: SheetBuffer com o conteúdo da aba
+        shared_strings: SharedStrings do workbook
+        style_sheet: StyleSheet do workbook
+        stats: Dicionário opcional onde é acumulado 'string_refs'
+
+    Yields:
+        str: Blocos do XML
+    """
+    rows = list(buffer.iter_rows())
+    max_column = max((len(row) for row in rows), default=0)
+    if rows and max_column:
+        dimension = f"A1:{get_column_letter(max_column)}{len(rows)}"
+    else:
+        dimension = "A1"
+
+    yield (
+        f'{XML_HEADER}<worksheet xmlns="{NS_MAIN}" xmlns:r="{NS_REL}">'
+        f'<dimension ref="{dimension}"/>'
+        f"{_sheet_views_xml(buffer.freeze_panes)}"
+        '<sheetFormatPr baseColWidth="8" defaultRowHeight="15"/>'
+    )
+
+    widths = [
+        (column_letter, dimension.width)
+        for column_letter, dimension in buffer.column_dimensions.items()
+        if dimension.width is not None
+    ]
+    if widths:
+        cols = []
+        for column_letter, width in sorted(widths, key=lambda item: (len(item[0]), item[0])):
+            column = column_index_from_string(column_letter)
+            cols.append(f'<col min="{column}" max="{column}" width="{width}" customWidth="1"/>')
+        yield f'<cols>{"".join(cols)}</cols>'
+
+    string_refs = 0
+    yield "<sheetData>"
+    for row_idx, row in enumerate(rows, 1):
+        cells = []
+        for column, cell in enumerate(row, 1):
+            if cell is None or (cell.value in (None, "") and not cell.has_style):
+                continue
+            style_index = style_sheet.xf_index(cell.fill, cell.font, cell.alignment)
+            xml, is_shared = _cell_xml(
+                f"{get_column_letter(column)}{row_idx}", cell.value, style_index, shared_strings
+            )
+            string_refs += is_shared
+            cells.append(xml)
+        yield f'<row r="{row_idx}">{"".join(cells)}</row>'
+    yield "</sheetData>"
+
+    if buffer.merged_ranges:
+        merges = "".join(f'<mergeCell ref="{ref}"/>' for ref in buffer.merged_ranges)
+        yield f'<mergeCells count="{len(buffer.merged_ranges)}">{merges}</mergeCells>'
+
+    yield (
+        '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+        "</worksheet>"
+    )
+
+    if stats is not None:
+        stats["string_refs"] = stats.get("string_refs", 0) + string_refs
+
+
+class SheetPart:
+    """
+    Aba já serializada, com sua própria tabela local de shared strings.
+
+    Produzida por render_sheet_part (por exemplo em outro processo) e
+    incorporada ao pacote por XlsxPackageWriter.add_sheet_part.
+    """
+
+    __slots__ = ("title", "index", "xml", "strings", "string_refs", "styles_digest")
+
+    def __init__(self, title, index, xml, strings, string_refs, styles_digest):
+        self.title = title
+        self.index = index
+        self.xml = xml
+        self.strings = strings
+        self.string_refs = string_refs
+        self.styles_digest = styles_digest
+
+
+def render_sheet_part(buffer, style_sheet):
+    """
+    Serializa um SheetBuffer de forma independente do workbook.
+
+    Args:
+        buffer: SheetBuffer com o conteúdo da aba
+        style_sheet: StyleSheet (determinística) usada na renderização
+
+    Returns:
+        SheetPart
+    """
+    shared_strings = SharedStrings()
+    stats = {}
+    xml = "".join(iter_sheet_xml(buffer, shared_strings, style_sheet, stats))
+    return SheetPart(
+        buffer.title,
+        buffer.index,
+        xml.encode("utf-8"),
+        shared_strings.strings,
+        stats.get("string_refs", 0),
+        style_sheet.digest,
+    )
+
+
+def zip_compression(compression_level=None):
+    """
+    Converte um nível de compressão nos parâmetros do zipfile.
+
+    Args:
+        compression_level: None (deflate no nível padrão), 0 (store) ou 1 a 9
+
+    Returns:
+        tuple: (compression, compresslevel) para zipfile.ZipFile
+
+    Raises:
+        ValueError: Se o nível for inválido
+    """
+    if compression_level is None:
+        return zipfile.ZIP_DEFLATED, None
+    if compression_level not in COMPRESSION_LEVELS:
+        raise ValueError(f"Invalid compression level: {compression_level!r} (expected 0-9)")
+    if compression_level == 0:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, compression_level
+
+
+class DeterministicZipFile(zipfile.ZipFile):
+    """
+    ZipFile que grava todas as entradas com data e permissões fixas.
+
+    writestr, write e open(..., "w") passam por _open_to_write, então o
+    mesmo conteúdo, escrito na mesma ordem, gera sempre os mesmos bytes.
+    """
+
+    def _open_to_write(self, zinfo, force_zip64=False):
+        zinfo.date_time = DETERMINISTIC_TIMESTAMP.timetuple()[:6]
+        zinfo.external_attr = 0o600 << 16
+        return super()._open_to_write(zinfo, force_zip64)
+
+
+def open_zip(fileobj, compression_level=None, deterministic=False):
+    """
+    Abre o ZIP de um pacote XLSX para escrita.
+
+    Args:
+        fileobj: Caminho ou arquivo binário de destino
+        compression_level: Nível de compressão (ver zip_compression)
+        deterministic: Grava as entradas com data fixa (ver DeterministicZipFile)
+
+    Returns:
+        zipfile.ZipFile
+    """
+    compression, compresslevel = zip_compression(compression_level)
+    zip_class = DeterministicZipFile if deterministic else zipfile.ZipFile
+    return zip_class(fileobj, "w", compression, compresslevel=compresslevel, allowZip64=True)
+
+
+class XlsxPackageWriter:
+    """
+    Monta um pacote XLSX parte por parte.
+
+    As abas são escritas no ZIP assim que ficam prontas, em um arquivo
+    temporário que só passa para disco acima de SPOOL_MAX_SIZE; as partes
+    globais (workbook, estilos e shared strings) são escritas no `save`.
+    """
+
+    def __init__(self, compression_level=None, deterministic=False):
+        """
+        Inicializa o escritor.
+
+        Args:
+            compression_level: Nível de compressão das partes (ver zip_compression)
+            deterministic: Grava datas fixas nos metadados e no ZIP, de modo
+                que o mesmo conteúdo gere sempre os mesmos bytes
+        """
+        self.deterministic = deterministic
+        self.style_sheet = StyleSheet()
+        self.shared_strings = SharedStrings()
+        self._string_refs = {"string_refs": 0}
+        self._sheets = []
+        self._spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self._archive = open_zip(self._spool, compression_level, deterministic)
+
+    def add_sheet(self, buffer):
+        """
+        Serializa um SheetBuffer e o grava no pacote.
+
+        Args:
+            buffer: SheetBuffer com o conteúdo da aba
+        """
+        part_name = f"xl/worksheets/sheet{len(self._sheets) + 1}.xml"
+        with self._archive.open(part_name, "w") as part:
+            for chunk in iter_sheet_xml(
+                buffer, self.shared_strings, self.style_sheet, self._string_refs
+            ):
+                part.write(chunk.encode("utf-8"))
+
+        self._register_sheet(buffer.title, buffer.index, part_name)
+
+    def add_sheet_part(self, part):
+        """
+        Incorpora ao pacote uma aba serializada separadamente.
+
+        As shared strings locais da aba são mescladas na tabela global e as
+        referências no XML são renumeradas. Os estilos não precisam de
+        renumeração, pois a StyleSheet é determinística; apenas é conferido
+        que a aba foi renderizada com a mesma tabela.
+
+        Args:
+            part: SheetPart produzida por render_sheet_part
+
+        Raises:
+            ValueError: Se a aba usar uma tabela de estilos diferente
+        """
+        if part.styles_digest != self.style_sheet.digest:
+            raise ValueError(f"Sheet '{part.title}' was rendered with a different style table")
+
+        mapping = [self.shared_strings.add(text) for text in part.strings]
+
+        # split alterna trechos de XML e índices locais (posições ímpares)
+        segments = _SHARED_STRING_REF_RE.split(part.xml)
+        segments[1::2] = [b"%d" % mapping[int(index)] for index in segments[1::2]]
+        xml = b"".join(segments)
+        self._string_refs["string_refs"] += part.string_refs
+
+        part_name = f"xl/worksheets/sheet{len(self._sheets) + 1}.xml"
+        self._archive.writestr(part_name, xml)
+        self._register_sheet(part.title, part.index, part_name)
+
+    def _register_sheet(self, title, index, part_name):
+        """Registra a aba na ordem do workbook."""
+        entry = (title, part_name)
+        if index is None:
+            self._sheets.append(entry)
+        else:
+            self._sheets.insert(index, entry)
+
+    def _write_text(self, name, text):
+        self._archive.writestr(name, text.encode("utf-8"))
+
+    def _write_package_parts(self):
+        """Grava as partes globais do pacote."""
+        overrides = [
+            ("/xl/workbook.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"),
+            ("/xl/styles.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"),
+            ("/xl/sharedStrings.xml", "application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"),
+            ("/docProps/core.xml", "application/vnd.openxmlformats-package.core-properties+xml"),
+            ("/docProps/app.xml", "application/vnd.openxmlformats-officedocument.extended-properties+xml"),
+        ]
+        overrides += [(f"/{part_name}", CT_WORKSHEET) for _, part_name in self._sheets]
+        self._write_text("[Content_Types].xml", (
+            f'{XML_HEADER}<Types xmlns="{NS_CONTENT_TYPES}">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            + "".join(
+                f'<Override PartName="{part}" ContentType="{content_type}"/>'
+                for part, content_type in overrides
+            )
+            + "</Types>"
+        ))
+
+        self._write_text("_rels/.rels", (
+            f'{XML_HEADER}<Relationships xmlns="{NS_PKG_REL}">'
+            f'<Relationship Id="rId1" Type="{NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+            '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/'
+            'metadata/core-properties" Target="docProps/core.xml"/>'
+            f'<Relationship Id="rId3" Type="{NS_REL}/extended-properties" Target="docProps/app.xml"/>'
+            "</Relationships>"
+        ))
+
+        created = DETERMINISTIC_TIMESTAMP if self.deterministic else datetime.now(timezone.utc)
+        timestamp = created.strftime("%Y-%m-%dT%H:%M:%SZ")
+        self._write_text("docProps/core.xml", (
+            f"{XML_HEADER}<cp:coreProperties "
+            'xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" '
+            'xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            "<dc:creator>Vertify Mapping Generator</dc:creator>"
+            f'<dcterms:created xsi:type="dcterms:W3CDTF">{timestamp}</dcterms:created>'
+            f'<dcterms:modified xsi:type="dcterms:W3CDTF">{timestamp}</dcterms:modified>'
+            "</cp:coreProperties>"
+        ))
+        self._write_text("docProps/app.xml", (
+            f"{XML_HEADER}<Properties "
+            'xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+            "<Application>Microsoft Excel</Application></Properties>"
+        ))
+
+        sheets = "".join(
+            f'<sheet name={quoteattr(title)} sheetId="{position}" r:id="rId{position}"/>'
+            for position, (title, _) in enumerate(self._sheets, 1)
+        )
+        self._write_text("xl/workbook.xml", (
+            f'{XML_HEADER}<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}">'
+            '<bookViews><workbookView activeTab="0"/></bookViews>'
+            f"<sheets>{sheets}</sheets>"
+            '<calcPr calcId="124519" fullCalcOnLoad="1"/>'
+            "</workbook>"
+        ))
+
+        relationships = [
+            f'<Relationship Id="rId{position}" Type="{NS_REL}/worksheet" Target="/{part_name}"/>'
+            for position, (_, part_name) in enumerate(self._sheets, 1)
+        ]
+        next_id = len(self._sheets) + 1
+        relationships.append(
+            f'<Relationship Id="rId{next_id}" Type="{NS_REL}/styles" Target="styles.xml"/>'
+        )
+        relationships.append(
+            f'<Relationship Id="rId{next_id + 1}" Type="{NS_REL}/sharedStrings" '
+            'Target="sharedStrings.xml"/>'
+        )
+        self._write_text("xl/_rels/workbook.xml.rels", (
+            f'{XML_HEADER}<Relationships xmlns="{NS_PKG_REL}">'
+            + "".join(relationships)
+            + "</Relationships>"
+        ))
+
+        self._write_text("xl/styles.xml", self.style_sheet.to_xml())
+
+        with self._archive.open("xl/sharedStrings.xml", "w") as part:
+            for chunk in self.shared_strings.iter_xml(self._string_refs["string_refs"]):
+                part.write(chunk.encode("utf-8"))
+
+    def _finish(self):
+        """Escreve as partes globais e fecha o ZIP."""
+        self._write_package_parts()
+        self._archive.close()
+        self._spool.seek(0)
+
+    def detach(self):
+        """
+        Finaliza o pacote e entrega o arquivo temporário, sem copiá-lo.
+
+        Returns:
+            SpooledTemporaryFile com o XLSX, posicionado no início
+        """
+        self._finish()
+        spool, self._spool = self._spool, None
+        return spool
+
+    def save(self, fileobj):
+        """
+        Finaliza o pacote e o copia para o arquivo ou stream informado.
+
+        Args:
+            fileobj: Caminho ou arquivo binário de destino
+        """
+        self._finish()
+        if isinstance(fileobj, (str, bytes)) or hasattr(fileobj, "__fspath__"):
+            with open(fileobj, "wb") as output:
+                shutil.copyfileobj(self._spool, output)
+        else:
+            shutil.copyfileobj(self._spool, fileobj)
+        self._spool.close()
+
+    def discard(self):
+        """Descarta o pacote incompleto (ex.: geração cancelada)."""
+        try:
+            self._archive.close()
+        finally:
+            self._spool.close()